@@ -0,0 +1,180 @@
+#!/usr/bin/python
+""" Population scaling benchmark module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import List
+
+from spacy import load as spacy_load
+
+from patternomatic.ge.decoder import compile_grammar
+from patternomatic.ge.population import Population
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.settings.config import Config
+from patternomatic.settings.log import LOG
+
+SAMPLES = [
+    "Hello Mr. Puffin",
+    "Goodbye Mrs. Muffin",
+    "I am a raccoon!",
+    "You are a cat!",
+    "Is she a rabbit?",
+    "This is a test",
+]
+
+
+def benchmark(
+    population_sizes: List[int], generations: int, samples: List[str], language: str
+) -> List[dict]:
+    """
+    Measures genesis and generation time and peak memory for every population size
+    Args:
+        population_sizes: List of population sizes to measure
+        generations: Number of generations evolved per population size
+        samples: List of strings
+        language: Spacy language model name
+
+    Returns: List of dicts, one per population size
+
+    """
+    config = Config()
+    nlp = spacy_load(language)
+    docs = [nlp(sample) for sample in samples]
+    grammar = compile_grammar(dgg(docs))
+
+    results = list()
+    for population_size in population_sizes:
+        config.population_size = population_size
+
+        tracemalloc.start()
+        start = perf_counter()
+        population = Population(docs, grammar, Stats())
+        genesis_time = perf_counter() - start
+        _, genesis_peak = tracemalloc.get_traced_memory()
+
+        generation_times = list()
+        generation_peaks = list()
+        for _ in range(generations):
+            tracemalloc.reset_peak()
+            start = perf_counter()
+            population.step()
+            generation_times.append(perf_counter() - start)
+            generation_peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        result = {
+            "population_size": population_size,
+            "genesis_s": genesis_time,
+            "genesis_peak_mib": genesis_peak / 2**20,
+            "generation_s": Stats.avg(generation_times),
+            "generation_peak_mib": max(generation_peaks, default=0) / 2**20,
+        }
+        LOG.info(
+            " ".join(
+                f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}"
+                for k, v in result.items()
+            )
+        )
+        results.append(result)
+
+    return results
+
+
+def main(args: List) -> None:
+    """
+    patternomatic's benchmark script main function wrapper
+    Args:
+        args: Command Line Input Arguments
+
+    Returns: None
+
+    """
+    cli = ArgumentParser(
+        description="Measures time and peak memory per generation as the population "
+        "size grows (memory tracing slows everything down, compare sizes, not runs)"
+    )
+
+    cli.add_argument(
+        "-p",
+        "--population-size",
+        nargs="+",
+        type=int,
+        default=[10, 100, 1000, 10000],
+        help="Population sizes to measure",
+    )
+
+    cli.add_argument(
+        "-g",
+        "--generations",
+        type=int,
+        default=3,
+        help="Generations evolved per population size",
+    )
+
+    cli.add_argument(
+        "-s",
+        "--sample",
+        action="append",
+        nargs="+",
+        type=str,
+        help="A sample phrase (defaults to a few built in samples)",
+    )
+
+    cli.add_argument(
+        "-l",
+        "--language",
+        type=str,
+        default="en_core_web_sm",
+        help="Spacy language model to be used",
+    )
+
+    cli.add_argument(
+        "-c",
+        "--config",
+        type=str,
+        default=None,
+        help="Configuration file path to be used",
+    )
+
+    parsed_args = cli.parse_args(args)
+
+    if parsed_args.config is not None:
+        Config(config_file_path=parsed_args.config)
+
+    samples = (
+        [" ".join(sample) for sample in parsed_args.sample]
+        if parsed_args.sample is not None
+        else SAMPLES
+    )
+
+    benchmark(
+        parsed_args.population_size,
+        parsed_args.generations,
+        samples,
+        parsed_args.language,
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -74,6 +74,24 @@ def main(args: List) -> None:
             default=None,
         )
 
+        # Time budget
+        cli.add_argument(
+            "-t",
+            "--time-budget",
+            nargs="?",
+            type=float,
+            help="Wall-clock seconds the search may take (overrides TIME_BUDGET)",
+            default=None,
+        )
+
+        # Resume
+        cli.add_argument(
+            "-r",
+            "--resume",
+            action="store_true",
+            help="Resume an interrupted execution from its checkpoint (CHECKPOINT_PATH)",
+        )
+
         # Parse command line input arguments/options
         parsed_args = cli.parse_args(args)
 
@@ -84,11 +102,14 @@ def main(args: List) -> None:
         #
         # Find patterns
         #
-        patterns_found, _ = find_patterns(
+        records = find_patterns(
             parsed_args.sample,
             configuration=parsed_args.config,
             spacy_language_model_name=parsed_args.language,
+            time_budget=parsed_args.time_budget,
+            resume=parsed_args.resume,
         )
+        patterns_found = [record.fenotype for record in records]
 
         LOG.info(f"Patterns found: {patterns_found}")
 
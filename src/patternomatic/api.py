@@ -18,17 +18,41 @@ You should have received a copy of the GNU Lesser General Public License
 along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
+import os
+import random
 import time
-from typing import Any, List, Tuple, Union
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import ContextManager, Iterable, List, Optional, Tuple, Union
 
+import numpy as np
 import pkg_resources
+from numpy.random import SeedSequence
 from spacy import load as spacy_load
 from spacy.cli import download as spacy_download
+from spacy.language import Language
+from spacy.tokens import Doc
 
-from patternomatic.ge.population import Population
+from patternomatic.ge.cache import DecodeCache, FitnessCache
+from patternomatic.ge.checkpoint import Checkpoint, Checkpointer, fingerprint
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.decoder import CompiledGrammar, compile_grammar
+from patternomatic.ge.executor import FitnessExecutor
+from patternomatic.ge.library import PatternLibrary, grammar_fingerprint
+from patternomatic.ge.population import IslandModel, Population
+from patternomatic.ge.records import PatternRecord
 from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import (
+    FeatureAccumulator,
+    accumulated_generator,
+    chunked,
+)
 from patternomatic.nlp.bnf import dynamic_generator as dgg
-from patternomatic.settings.config import Config
+from patternomatic.nlp.bnf import extend_grammar, stream_generator
+from patternomatic.nlp.dedup import deduplicate, sample_weights
+from patternomatic.nlp.matrix import SampleIndex, SampleMatrix, encode_samples
+from patternomatic.settings.config import Config, restore_config
 from patternomatic.settings.log import LOG
 
 
@@ -36,7 +60,9 @@ def find_patterns(
     samples: List[str],
     configuration: Union[str, None] = None,
     spacy_language_model_name: Union[str, None] = None,
-) -> List[Tuple[Any, ...]]:
+    time_budget: Union[float, None] = None,
+    resume: bool = False,
+) -> List[PatternRecord]:
     """
     Given some samples, this function finds optimized patterns to be used by the
     Spacy's Rule Based Matcher.
@@ -47,10 +73,388 @@ def find_patterns(
             (Fallbacks to default configuration)
         spacy_language_model_name: (str) Optional valid Spacy Language Model
             (Fallbacks to Spacy's en_core_web_sm)
+        time_budget: (float) Optional wall-clock seconds the search may take, once
+            expired the best patterns found so far are returned (Fallbacks to the
+            configured TIME_BUDGET)
+        resume: (bool) Optional, when True the execution resumes from the
+            checkpoint at CHECKPOINT_PATH, skipping the runs and generations it
+            already completed
 
     Returns:
-        List of patterns found and list of each pattern matching score against
-            the samples.
+        List of PatternRecord instances, the best pattern of each run (at most
+            HALL_OF_FAME_SIZE of them) with its matching score against the samples,
+            from the most to the least fitted.
+
+    """
+    started = time.time()
+
+    nlp, model_name = _load_language_model(spacy_language_model_name)
+    config = _load_config(configuration)
+
+    # The per call budget is left out of the process wide configuration
+    budget = float(time_budget) if time_budget is not None else config.time_budget
+    deadline = started + budget if budget > 0 else None
+
+    checkpointer = (
+        Checkpointer(
+            config.checkpoint_path,
+            fingerprint(samples, model_name),
+            config.checkpoint_interval,
+        )
+        if config.checkpoint_path
+        else None
+    )
+    checkpoint = _load_checkpoint(checkpointer) if resume is True else None
+    first_run = checkpoint.run if checkpoint is not None else 0
+
+    stats = checkpoint.stats if checkpoint is not None else Stats()
+    # Phase times account this very call, the one its time budget applies to
+    stats.phase_times = dict()
+    stats.add_phase_time("model", time.time() - started)
+
+    LOG.info("Building Doc instances...")
+    phase_start = time.time()
+    unique_samples, sample_ids = _build_docs(nlp, samples)
+    weights = sample_weights(sample_ids)
+    stats.add_phase_time("docs", time.time() - phase_start)
+    LOG.info(
+        f"Deduplicated samples: {len(unique_samples)} unique out of {len(samples)} "
+        f"(dedup ratio {1 - len(unique_samples) / max(len(samples), 1):.2%})"
+    )
+
+    LOG.info("Generating grammar...")
+    phase_start = time.time()
+    grammar = compile_grammar(_build_grammar(unique_samples, sample_ids))
+    stats.add_phase_time("grammar", time.time() - phase_start)
+
+    library = (
+        PatternLibrary(config.library_path, config.library_size)
+        if config.library_path
+        else None
+    )
+    warm_start = _warm_start(library, grammar, config)
+
+    num_workers = config.num_workers if config.num_workers > 0 else os.cpu_count()
+    num_workers = min(num_workers, config.max_runs)
+    seeds = _run_seeds(config, num_workers)
+
+    LOG.info("Starting Execution...")
+    phase_start = time.time()
+    if num_workers > 1:
+        LOG.info(f"Running {config.max_runs} runs across {num_workers} workers...")
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(samples, model_name, config.__dict__, warm_start),
+        ) as executor, checkpointer or nullcontext():
+            runs = [
+                executor.submit(_worker_run, seed, deadline)
+                for seed in seeds[first_run:]
+            ]
+            for finished, run in enumerate(runs, first_run + 1):
+                if run.cancelled():
+                    continue
+                stats.merge(run.result())
+                if checkpointer is not None:
+                    checkpointer.save(stats, run=finished)
+                if _expired(deadline):
+                    _cancel(runs)
+    else:
+        fitness_cache = FitnessCache(stats, config.fitness_cache_size)
+        decode_cache = DecodeCache(stats, config.decode_cache_size)
+        sample_matrix, sample_index = encode_samples(unique_samples)
+
+        with _fitness_executor(
+            unique_samples, weights, config
+        ) as fitness_executor, checkpointer or nullcontext():
+            for run, seed in enumerate(seeds[first_run:], first_run):
+                # The first run always takes place, so there are patterns to return
+                if run > first_run and _expired(deadline):
+                    LOG.warning(
+                        f"Time budget expired after {run} out of {config.max_runs} runs"
+                    )
+                    break
+                if checkpointer is not None:
+                    checkpointer.run = run
+                _run(
+                    unique_samples,
+                    grammar,
+                    stats,
+                    seed,
+                    fitness_cache,
+                    sample_matrix,
+                    sample_index,
+                    weights,
+                    decode_cache,
+                    fitness_executor,
+                    deadline,
+                    checkpointer,
+                    checkpoint if run == first_run else None,
+                    warm_start,
+                )
+                if checkpointer is not None:
+                    checkpointer.save(stats, run=run + 1)
+    stats.add_phase_time("evolution", time.time() - phase_start)
+
+    LOG.info(f"Execution report {stats}")
+    LOG.info(
+        f"Fitness cache: {stats.cache_hits} hits, {stats.cache_misses} misses, "
+        f"{stats.cache_evictions} evictions"
+    )
+    LOG.info(f"Decode cache: {stats.short_circuits} short-circuits")
+    LOG.info(
+        "Time per phase: "
+        + ", ".join(
+            f"{phase} {spent:.3f}s" for phase, spent in stats.phase_times.items()
+        )
+        + (
+            f" (time budget {budget}s, "
+            f"{sum(stats.phase_times.values()) / budget:.2%} used)"
+            if budget > 0
+            else ""
+        )
+    )
+    stats.persist()
+
+    LOG.info("Best individuals for this execution:")
+    records = stats.hall_of_fame.records()
+    for record in records:
+        LOG.info(f"{record}")
+
+    if library is not None:
+        library.add(grammar_fingerprint(grammar), records)
+        library.persist()
+
+    return records
+
+
+class PatternSearch(object):
+    """
+    Incremental search for interactive pattern authoring loops. Keeps the language
+    model, the samples, their grammar and encodings along with the last population of
+    every run, so samples added later on just extend them and the evolution goes on
+    from those populations rather than from a new generation. Runs take place
+    sequentially, each one evolving a single population
+    """
+
+    __slots__ = (
+        "config",
+        "nlp",
+        "samples",
+        "weights",
+        "grammar",
+        "sample_matrix",
+        "sample_index",
+        "populations",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        samples: List[str],
+        configuration: Union[str, None] = None,
+        spacy_language_model_name: Union[str, None] = None,
+    ):
+        """
+        PatternSearch constructor, parses the samples and generates their grammar
+        Args:
+            samples: List of strings from where to find common linguistic patterns
+            configuration: (str) Optional configuration file path to to be loaded
+                (Fallbacks to default configuration)
+            spacy_language_model_name: (str) Optional valid Spacy Language Model
+                (Fallbacks to Spacy's en_core_web_sm)
+        """
+        self.nlp, _ = _load_language_model(spacy_language_model_name)
+        self.config = _load_config(configuration)
+
+        self.samples, sample_ids = _build_docs(self.nlp, samples)
+        self.weights = sample_weights(sample_ids)
+        self.grammar = compile_grammar(_build_grammar(self.samples, sample_ids))
+        self.sample_matrix, self.sample_index = encode_samples(self.samples)
+        self.populations = list()
+        self.stats = Stats()
+
+    def evolve(self) -> List[PatternRecord]:
+        """
+        Evolves the population of every run, new ones the first time
+        Returns: List of PatternRecord instances, the best pattern of each run (at
+            most HALL_OF_FAME_SIZE of them) from the most to the least fitted
+
+        """
+        if len(self.populations) == 0:
+            context = self._context()
+            for seed in _run_seeds(self.config, 1):
+                _seed_run(seed)
+                population = Population(
+                    self.samples,
+                    self.grammar,
+                    self.stats,
+                    context.fitness_cache,
+                    self.sample_matrix,
+                    self.sample_index,
+                    self.weights,
+                    context.decode_cache,
+                )
+                self._evolve(population)
+                self.populations.append(population)
+        else:
+            for population in self.populations:
+                self._evolve(population)
+
+        LOG.info(f"Execution report {self.stats}")
+        return self.stats.hall_of_fame.records()
+
+    def add_samples(self, samples: List[str]) -> List[PatternRecord]:
+        """
+        Extends the grammar and the sample encodings with some new samples and evolves
+        the populations further. Patterns already scored are scored against the new
+        samples alone
+        Args:
+            samples: List of strings
+
+        Returns: List of PatternRecord instances, as returned by PatternSearch.evolve
+
+        """
+        new_samples, new_sample_ids = _build_docs(self.nlp, samples)
+        new_weights = sample_weights(new_sample_ids)
+
+        self.grammar = compile_grammar(
+            _build_grammar(new_samples, new_sample_ids, self.grammar.grammar)
+        )
+
+        # Samples already seen just weigh more
+        unique_samples, sample_ids = deduplicate(self.samples + new_samples)
+        added_samples = unique_samples[len(self.samples) :]
+        weights = self.weights + [0] * len(added_samples)
+        for sample_id, weight in zip(sample_ids[len(self.samples) :], new_weights):
+            weights[sample_id] += weight
+        LOG.info(
+            f"Added {len(samples)} samples, {len(added_samples)} of them unseen so far"
+        )
+
+        if self.sample_matrix is not None:
+            self.sample_matrix.extend(added_samples)
+        if self.sample_index is not None:
+            self.sample_index.extend(added_samples)
+        self.samples = unique_samples
+        self.weights = weights
+
+        self.stats = Stats()
+        if len(self.populations) > 0:
+            new_sample_matrix, new_sample_index = encode_samples(new_samples)
+            delta = EvaluationContext(
+                new_samples,
+                sample_matrix=new_sample_matrix,
+                sample_index=new_sample_index,
+                weights=new_weights,
+            )
+            context = self._context()
+            for population in self.populations:
+                population.carry_over(context, delta)
+
+        return self.evolve()
+
+    def _context(self) -> EvaluationContext:
+        """
+        Evaluation context of every sample, along with empty caches
+        Returns: EvaluationContext instance
+
+        """
+        return EvaluationContext(
+            self.samples,
+            self.grammar,
+            self.stats,
+            FitnessCache(self.stats, self.config.fitness_cache_size),
+            self.sample_matrix,
+            self.sample_index,
+            self.weights,
+            DecodeCache(self.stats, self.config.decode_cache_size),
+        )
+
+    def _evolve(self, population: Population) -> None:
+        """
+        Evolves a population, accounting the run at the stats instance
+        Args:
+            population: Population instance
+
+        Returns: None
+
+        """
+        start = time.monotonic()
+        population.evolve()
+        self.stats.add_time(time.monotonic() - start)
+        self.stats.calculate_metrics()
+
+
+def generate_grammar(
+    samples: Iterable[str],
+    configuration: Union[str, None] = None,
+    spacy_language_model_name: Union[str, None] = None,
+    chunk_size: int = 1000,
+) -> dict:
+    """
+    Generates the grammar find_patterns would out of a stream of samples too large to
+    be held in memory at once, say the lines of a corpus file. Samples are parsed and
+    their feature values accumulated chunk by chunk, across NUM_WORKERS worker
+    processes when more than one, whose partial feature sets are merged in the order
+    of the samples
+
+    Args:
+        samples: Iterable of strings
+        configuration: (str) Optional configuration file path to to be loaded
+            (Fallbacks to default configuration)
+        spacy_language_model_name: (str) Optional valid Spacy Language Model
+            (Fallbacks to Spacy's en_core_web_sm)
+        chunk_size: (int) Optional number of samples parsed at once
+
+    Returns:
+        Backus Naur Form grammar dict
+
+    """
+    nlp, model_name = _load_language_model(spacy_language_model_name)
+    config = _load_config(configuration)
+
+    num_workers = config.num_workers if config.num_workers > 0 else os.cpu_count()
+    if num_workers <= 1:
+        return stream_generator(nlp.pipe(samples, batch_size=chunk_size), chunk_size)
+
+    LOG.info(f"Accumulating grammar features across {num_workers} workers...")
+    accumulator = FeatureAccumulator()
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        initializer=_init_grammar_worker,
+        initargs=(model_name, config.__dict__),
+    ) as executor:
+        # Just a few chunks in flight, so the samples are never held at once
+        pending = deque()
+        for chunk in chunked(samples, chunk_size):
+            pending.append(executor.submit(_grammar_worker_run, chunk))
+            if len(pending) >= 2 * num_workers:
+                accumulator.merge(pending.popleft().result())
+        while len(pending) > 0:
+            accumulator.merge(pending.popleft().result())
+
+    LOG.info(f"Generating BNF based on a stream of {accumulator.num_samples} samples")
+    return accumulated_generator(accumulator)
+
+
+#
+# Runs
+#
+# Execution state of a worker process, loaded just once by _init_worker
+_worker = dict()
+
+
+def _load_language_model(
+    spacy_language_model_name: Union[str, None]
+) -> Tuple[Language, str]:
+    """
+    Loads the language model, installing patternomatic's default one if missing
+    Args:
+        spacy_language_model_name: Spacy Language Model name
+
+    Returns: Spacy Language Model and its name, en_core_web_sm if the given one is
+        not found
 
     """
     LOG.info(f"Loading language model {spacy_language_model_name}...")
@@ -61,49 +465,374 @@ def find_patterns(
         )
         spacy_download("en_core_web_sm")
 
+    model_name = spacy_language_model_name
     try:
-        nlp = spacy_load(spacy_language_model_name)
+        nlp = spacy_load(model_name)
     except OSError:
         LOG.warning(
             f"Model {spacy_language_model_name} not found, "
             "falling back to patternomatic's default language model: en_core_web_sm"
         )
+        model_name = "en_core_web_sm"
 
         nlp = spacy_load("en_core_web_sm")
 
-    LOG.info("Building Doc instances...")
-    samples = [nlp(sample) for sample in samples]
+    return nlp, model_name
+
 
+def _load_config(configuration: Union[str, None]) -> Config:
+    """
+    Sets up the configuration
+    Args:
+        configuration: Configuration file path, if any
+
+    Returns: Config instance
+
+    """
     if isinstance(configuration, str):
         LOG.info(
             f"Setting up configuration from the following path: {configuration}..."
         )
-        config = Config(config_file_path=configuration)
+        return Config(config_file_path=configuration)
+
+    config = Config()
+    LOG.info(f"Existing Config instance found: {config}")
+    return config
+
+
+def _build_docs(nlp: Language, samples: List[str]) -> Tuple[List[Doc], List[int]]:
+    """
+    Parses the distinct samples and collapses the duplicated ones
+    Args:
+        nlp: Spacy Language Model
+        samples: List of strings
+
+    Returns: List of unique Spacy Doc objects and, for each sample, the position of
+        its unique sample
+
+    """
+    text_ids = dict()
+    for sample in samples:
+        text_ids.setdefault(sample, len(text_ids))
+    docs = [nlp(text) for text in text_ids]
+
+    unique_samples, doc_ids = deduplicate(docs)
+    sample_ids = [doc_ids[text_ids[sample]] for sample in samples]
+
+    return unique_samples, sample_ids
+
+
+def _build_grammar(
+    unique_samples: List[Doc], sample_ids: List[int], grammar: dict = None
+) -> dict:
+    """
+    Generates the grammar out of the samples
+    Args:
+        unique_samples: List of unique Spacy Doc objects
+        sample_ids: For each sample, the position of its unique sample
+        grammar: Optional, grammar of some other samples to extend instead
+
+    Returns: Backus Naur Form grammar dict
+
+    """
+    # Grammar features keep their frequencies when repetitions are allowed
+    samples = (
+        unique_samples
+        if Config().use_uniques is True
+        else [unique_samples[sample_id] for sample_id in sample_ids]
+    )
+    return dgg(samples) if grammar is None else extend_grammar(grammar, samples)
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    """
+    Checks whether the time budget is over
+    Args:
+        deadline: Time (seconds since the epoch) the execution must stop at, if any
+
+    Returns: True if there is a deadline and it has passed, False otherwise
+
+    """
+    return deadline is not None and time.time() >= deadline
+
+
+def _cancel(runs: List[Future]) -> None:
+    """
+    Cancels the runs not started yet, the running ones stop by themselves at their
+    next generation as they share the same deadline
+    Args:
+        runs: List of Future instances
+
+    Returns: None
+
+    """
+    for run in runs:
+        run.cancel()
+
+
+def _load_checkpoint(checkpointer: Optional[Checkpointer]) -> Optional[Checkpoint]:
+    """
+    Reads the checkpoint the execution resumes from
+    Args:
+        checkpointer: Checkpointer instance, None if CHECKPOINT_PATH is not set
+
+    Returns: Checkpoint instance, None if there is nothing to resume from
+
+    """
+    if checkpointer is None:
+        LOG.warning("No CHECKPOINT_PATH configured, nothing to resume from")
+        return None
+
+    checkpoint = checkpointer.load()
+    if checkpoint is None:
+        LOG.info(f"No checkpoint found at {checkpointer.path}, starting afresh")
+    else:
+        LOG.info(
+            f"Resuming from checkpoint {checkpointer.path}: {checkpoint.run} out of "
+            f"{Config().max_runs} runs completed"
+        )
+    return checkpoint
+
+
+def _warm_start(
+    library: Optional[PatternLibrary], grammar: CompiledGrammar, config: Config
+) -> List[np.ndarray]:
+    """
+    Picks the genotypes of the pattern library every run starts its evolution with
+    Args:
+        library: PatternLibrary instance, None if LIBRARY_PATH is not set
+        grammar: CompiledGrammar instance of the execution
+        config: Config instance
+
+    Returns: List of arrays of bits, at most WARM_START_FRACTION of the population
+
+    """
+    if library is None:
+        return list()
+
+    size = int(round(config.warm_start_fraction * config.population_size))
+    warm_start = library.seeds(grammar_fingerprint(grammar), grammar, size)
+    LOG.info(
+        f"Warm start: {len(warm_start)} individuals seeded from the pattern library "
+        f"{library.path}"
+    )
+    return warm_start
+
+
+def _fitness_executor(
+    samples: List[Doc], weights: List[int], config: Config
+) -> ContextManager[Optional[FitnessExecutor]]:
+    """
+    Starts a pool of worker processes scoring fenotypes, if configured
+    Args:
+        samples: List of Spacy Doc objects
+        weights: Number of duplicated samples each sample stands for
+        config: Config instance
+
+    Returns: FitnessExecutor instance, or a context holding None
+
+    """
+    if config.fitness_workers == 1:
+        return nullcontext()
+
+    if config.batch_evaluation is not True:
+        LOG.warning("Fitness workers need batch evaluation. Scoring in process")
+        return nullcontext()
+
+    LOG.info("Starting fitness workers...")
+    return FitnessExecutor(samples, weights)
+
+
+def _run_seeds(config: Config, num_workers: int) -> List[Optional[SeedSequence]]:
+    """
+    Spawns an independent random number stream per run. Unseeded sequential runs
+    keep on drawing from the global NumPy random state
+    Args:
+        config: Config instance
+        num_workers: Number of worker processes
+
+    Returns: List of SeedSequence instances (or None), one per run
+
+    """
+    if config.random_seed < 0 and num_workers <= 1:
+        return [None] * config.max_runs
+
+    entropy = config.random_seed if config.random_seed >= 0 else None
+    return SeedSequence(entropy).spawn(config.max_runs)
+
+
+def _run(
+    samples: List[Doc],
+    grammar: CompiledGrammar,
+    stats: Stats,
+    seed: Optional[SeedSequence] = None,
+    fitness_cache: FitnessCache = None,
+    sample_matrix: SampleMatrix = None,
+    sample_index: SampleIndex = None,
+    weights: List[int] = None,
+    decode_cache: DecodeCache = None,
+    fitness_executor: FitnessExecutor = None,
+    deadline: float = None,
+    checkpointer: Checkpointer = None,
+    checkpoint: Checkpoint = None,
+    warm_start: List[np.ndarray] = None,
+) -> None:
+    """
+    Evolves a new population, accounting the run at the stats instance
+    Args:
+        samples: List of Spacy Doc objects
+        grammar: CompiledGrammar instance
+        stats: Stats instance
+        seed: Optional, random number stream of this run
+        fitness_cache: Optional, fitness values memoized across runs
+        sample_matrix: Optional, samples encoded for the matrix fitness engine
+        sample_index: Optional, positional inverted index of the samples
+        weights: Optional, number of duplicated samples each sample stands for
+        decode_cache: Optional, derivations memoized across runs
+        fitness_executor: Optional, pool of worker processes scoring fenotypes
+        deadline: Optional, time (seconds since the epoch) the run must stop at
+        checkpointer: Optional, Checkpointer instance saving the population state
+        checkpoint: Optional, Checkpoint instance the run resumes from
+        warm_start: Optional, genotypes the new population starts with (islands
+            always start afresh)
+
+    Returns: None
+
+    """
+    population_state = None
+    if checkpoint is not None:
+        checkpoint.restore_random_state()
+        population_state = checkpoint.population
+
+    # Resumed evolutions go on with their checkpointed random number streams
+    if population_state is None:
+        _seed_run(seed)
+
+    start = time.monotonic()
+    if Config().islands > 1:
+        p = IslandModel(samples, grammar, stats, weights, deadline)
     else:
-        config = Config()
-        LOG.info(f"Existing Config instance found: {config}")
+        p = Population(
+            samples,
+            grammar,
+            stats,
+            fitness_cache,
+            sample_matrix,
+            sample_index,
+            weights,
+            decode_cache,
+            fitness_executor,
+            deadline,
+            checkpointer,
+            population_state,
+            warm_start,
+        )
+    p.evolve()
+    end = time.monotonic()
+    stats.add_time(end - start)
+    stats.calculate_metrics()
 
-    stats = Stats()
 
-    bnf_g = dgg(samples)
+def _seed_run(seed: Optional[SeedSequence]) -> None:
+    """
+    Seeds the random number generators with the stream of a run
+    Args:
+        seed: Random number stream of the run, None keeps on drawing from the global
+            random state
 
-    LOG.info("Starting Execution...")
-    for _ in range(0, config.max_runs):
-        start = time.monotonic()
-        p = Population(samples, bnf_g, stats)
-        p.evolve()
-        end = time.monotonic()
-        stats.add_time(end - start)
-        stats.calculate_metrics()
+    Returns: None
 
-    LOG.info(f"Execution report {stats}")
-    stats.persist()
+    """
+    if seed is not None:
+        state = seed.generate_state(1)[0]
+        random.seed(int(state))
+        np.random.seed(state)
 
-    LOG.info("Best individuals for this execution:")
-    stats.most_fitted_accumulator.sort(key=lambda i: i.fitness_value, reverse=True)
-    for individual in stats.most_fitted_accumulator:
-        LOG.info(f"{individual}")
 
-    return list(
-        zip(*[[i.fenotype, i.fitness_value] for i in stats.most_fitted_accumulator])
+def _init_worker(
+    samples: List[str],
+    model_name: str,
+    options: dict,
+    warm_start: List[np.ndarray] = None,
+) -> None:
+    """
+    Worker process initializer, sets up the configuration and loads the language
+    model and the samples once for every run the worker takes
+    Args:
+        samples: List of strings
+        model_name: Spacy Language Model name
+        options: Configuration parameters of the parent process
+        warm_start: Optional, genotypes every run starts its evolution with
+
+    Returns: None
+
+    """
+    restore_config(options)
+
+    nlp = spacy_load(model_name)
+    unique_samples, sample_ids = _build_docs(nlp, samples)
+    bnf_g = _build_grammar(unique_samples, sample_ids)
+    sample_matrix, sample_index = encode_samples(unique_samples)
+
+    _worker.update(
+        samples=unique_samples,
+        grammar=compile_grammar(bnf_g),
+        sample_matrix=sample_matrix,
+        sample_index=sample_index,
+        weights=sample_weights(sample_ids),
+        warm_start=warm_start,
     )
+
+
+def _worker_run(seed: SeedSequence, deadline: Optional[float] = None) -> Stats:
+    """
+    Executes a run at a worker process
+    Args:
+        seed: Random number stream of this run
+        deadline: Optional, time (seconds since the epoch) the run must stop at
+
+    Returns: Stats instance accounting just this run
+
+    """
+    stats = Stats()
+    _run(
+        _worker["samples"],
+        _worker["grammar"],
+        stats,
+        seed,
+        sample_matrix=_worker["sample_matrix"],
+        sample_index=_worker["sample_index"],
+        weights=_worker["weights"],
+        deadline=deadline,
+        warm_start=_worker["warm_start"],
+    )
+    return stats
+
+
+def _init_grammar_worker(model_name: str, options: dict) -> None:
+    """
+    Grammar worker process initializer, sets up the configuration and loads the
+    language model once for every chunk of samples the worker takes
+    Args:
+        model_name: Spacy Language Model name
+        options: Configuration parameters of the parent process
+
+    Returns: None
+
+    """
+    restore_config(options)
+    _worker.update(nlp=spacy_load(model_name))
+
+
+def _grammar_worker_run(samples: List[str]) -> FeatureAccumulator:
+    """
+    Parses a chunk of samples at a grammar worker process
+    Args:
+        samples: List of strings
+
+    Returns: FeatureAccumulator instance accounting just this chunk
+
+    """
+    accumulator = FeatureAccumulator()
+    accumulator.add(list(_worker["nlp"].pipe(samples)))
+    return accumulator
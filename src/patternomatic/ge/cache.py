@@ -0,0 +1,251 @@
+""" Evolutionary fitness memoization module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from patternomatic.ge.stats import Stats
+from patternomatic.settings.config import Config
+
+
+class FitnessCache(object):
+    """
+    Bounded Least Recently Used (LRU) cache of fitness values, keyed by the canonical
+    form of a fenotype plus the configuration parameters the fitness depends on
+    """
+
+    __slots__ = ("max_size", "stats", "_entries")
+
+    def __init__(self, stats: Stats, max_size: int):
+        """
+        FitnessCache constructor
+        Args:
+            stats: Stats instance where hits, misses and evictions are accounted
+            max_size: Maximum number of fitness values to keep, 0 or less disables it
+        """
+        self.max_size = max_size
+        self.stats = stats
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def key(config: Config, fenotype: List[dict]) -> tuple:
+        """
+        Builds the cache key for a fenotype under the given configuration
+        Args:
+            config: Config instance
+            fenotype: Spacy's Rule Based Matcher pattern
+
+        Returns: Hashable tuple
+
+        """
+        return (
+            canonical_fenotype(fenotype),
+            config.fitness_function_type,
+            config.use_token_wildcard,
+        )
+
+    def get(self, key: tuple) -> Optional[float]:
+        """
+        Retrieves a fitness value, refreshing its recency
+        Args:
+            key: Cache key as built by FitnessCache.key
+
+        Returns: The fitness value or None if not cached
+
+        """
+        # A disabled cache accounts no lookup at all
+        if self.max_size <= 0:
+            return None
+
+        fitness_value = self._entries.get(key)
+
+        if fitness_value is None:
+            self.stats.sum_cache_misses(1)
+        else:
+            self._entries.move_to_end(key)
+            self.stats.sum_cache_hits(1)
+
+        return fitness_value
+
+    def put(self, key: tuple, fitness_value: float) -> None:
+        """
+        Stores a fitness value, evicting the least recently used one if full
+        Args:
+            key: Cache key as built by FitnessCache.key
+            fitness_value: Fitness value to be memoized
+
+        Returns: None
+
+        """
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = fitness_value
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.sum_cache_evictions(1)
+
+    def clear(self) -> None:
+        """Drops every memoized fitness value"""
+        self._entries.clear()
+
+
+class DecodeCache(object):
+    """
+    Bounded Least Recently Used (LRU) cache of derivations, keyed by the codon prefix
+    each derivation consumed. Since decoding reads the codons in order, any genotype of
+    the same length sharing that prefix decodes into the very same fenotype, so
+    mutations landing on unread codons are neutral
+    """
+
+    __slots__ = ("max_size", "stats", "_entries", "_prefix_lengths")
+
+    def __init__(self, stats: Stats, max_size: int):
+        """
+        DecodeCache constructor
+        Args:
+            stats: Stats instance where short-circuits are accounted
+            max_size: Maximum number of derivations to keep, 0 or less disables it
+        """
+        self.max_size = max_size
+        self.stats = stats
+        self._entries = OrderedDict()
+        # Length of the stored prefixes along with how many entries share it
+        self._prefix_lengths = dict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(int_genotype: List[int], consumed: int) -> tuple:
+        """
+        Builds the cache key of a derivation. Derivations wrapping around the genotype
+        consume every codon
+        Args:
+            int_genotype: List of integers, the codons
+            consumed: Number of codons the derivation consumed
+
+        Returns: Hashable tuple
+
+        """
+        return len(int_genotype), tuple(
+            int_genotype[: min(consumed, len(int_genotype))]
+        )
+
+    def get(self, int_genotype: List[int]) -> Optional[list]:
+        """
+        Retrieves the derivation whose consumed prefix the codons start with,
+        refreshing its recency
+        Args:
+            int_genotype: List of integers, the codons
+
+        Returns: List holding the fenotype, the number of consumed codons and the
+            fitness value (None if not scored yet), or None if not cached
+
+        """
+        num_codons = len(int_genotype)
+
+        for prefix_length in self._prefix_lengths:
+            key = (num_codons, tuple(int_genotype[:prefix_length]))
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        return None
+
+    def put(
+        self,
+        int_genotype: List[int],
+        consumed: int,
+        fenotype: List[dict],
+        fitness_value: float = None,
+    ) -> None:
+        """
+        Stores a derivation, evicting the least recently used one if full
+        Args:
+            int_genotype: List of integers, the codons
+            consumed: Number of codons the derivation consumed
+            fenotype: Spacy's Rule Based Matcher pattern the codons decode into
+            fitness_value: Optional, fitness value of the fenotype
+
+        Returns: None
+
+        """
+        if self.max_size <= 0:
+            return
+
+        key = self.key(int_genotype, consumed)
+        if key not in self._entries:
+            prefix_length = len(key[1])
+            self._prefix_lengths[prefix_length] = (
+                self._prefix_lengths.get(prefix_length, 0) + 1
+            )
+
+        self._entries[key] = [fenotype, consumed, fitness_value]
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            (_, prefix), _ = self._entries.popitem(last=False)
+            self._prefix_lengths[len(prefix)] -= 1
+            if self._prefix_lengths[len(prefix)] == 0:
+                del self._prefix_lengths[len(prefix)]
+
+    def clear(self) -> None:
+        """Drops every memoized derivation"""
+        self._entries.clear()
+        self._prefix_lengths.clear()
+
+
+def canonical_fenotype(fenotype: List[dict]) -> Tuple[Any, ...]:
+    """
+    Converts a Spacy's Rule Based Matcher pattern into a hashable form where the
+    order of the keys within a token does not matter
+    Args:
+        fenotype: Spacy's Rule Based Matcher pattern
+
+    Returns: Tuple of tuples
+
+    """
+    return tuple(_canonical(token) for token in fenotype)
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Recursively converts dicts and lists into hashable tuples
+    Args:
+        value: Any item of a Spacy's Rule Based Matcher pattern
+
+    Returns: Hashable version of value
+
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _canonical(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_canonical(v) for v in value)
+    return value
@@ -0,0 +1,252 @@
+""" Checkpoint and resume module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import hashlib
+import os
+import pickle
+import random
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from patternomatic.ge.stats import Stats
+from patternomatic.settings.config import Config
+from patternomatic.settings.log import LOG
+
+# Configuration parameters a checkpoint depends on: the ones shaping the grammar,
+# the genotypes and the fitness values. Any other can change between resumes
+FINGERPRINT_OPTIONS = (
+    "codon_length",
+    "num_codons_per_individual",
+    "dna_length",
+    "fitness_function_type",
+    "features_per_token",
+    "use_boolean_features",
+    "use_custom_attributes",
+    "use_uniques",
+    "use_grammar_operators",
+    "use_token_wildcard",
+    "use_extended_pattern_syntax",
+)
+
+
+class Checkpoint(object):
+    """
+    Snapshot of an execution: the runs already finished, accounted at their stats,
+    and the state of the population evolving at the time, if any
+    """
+
+    __slots__ = (
+        "fingerprint",
+        "run",
+        "stats",
+        "population",
+        "random_state",
+        "np_random_state",
+    )
+
+    def __init__(
+        self,
+        fingerprint: str,
+        run: int,
+        stats: Stats,
+        population: dict = None,
+        random_state: tuple = None,
+        np_random_state: tuple = None,
+    ):
+        """
+        Checkpoint constructor
+        Args:
+            fingerprint: Digest of the samples and configuration of the execution
+            run: Number of runs finished
+            stats: Stats instance accounting the finished runs
+            population: Optional, state of the population of the next run, as
+                built by Population.state
+            random_state: Optional, state of the Python random number generator
+            np_random_state: Optional, state of the NumPy random number generator
+        """
+        self.fingerprint = fingerprint
+        self.run = run
+        self.stats = stats
+        self.population = population
+        self.random_state = random_state
+        self.np_random_state = np_random_state
+
+    def restore_random_state(self) -> None:
+        """Sets the random number generators back to their checkpointed state"""
+        if self.random_state is not None:
+            random.setstate(self.random_state)
+        if self.np_random_state is not None:
+            np.random.set_state(self.np_random_state)
+
+
+class Checkpointer(object):
+    """
+    Periodically saves the state of an execution to a file. Snapshots are taken at
+    the generation loop, but written by a background thread to a temporary file that
+    atomically replaces the previous checkpoint, so an interrupted write never
+    corrupts it
+    """
+
+    __slots__ = ("path", "fingerprint", "interval", "run", "_writer")
+
+    def __init__(self, path: str, fingerprint: str, interval: int = 0):
+        """
+        Checkpointer constructor
+        Args:
+            path: Checkpoint file path
+            fingerprint: Digest of the samples and configuration of the execution
+            interval: Optional, generations between two population checkpoints, 0
+                or less checkpoints finished runs only
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.interval = interval
+        self.run = 0
+        self._writer = ThreadPoolExecutor(max_workers=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def load(self) -> Optional[Checkpoint]:
+        """
+        Reads the checkpoint of this very execution, if any
+        Returns: Checkpoint instance, None if missing, unreadable or belonging to
+            some other samples or configuration
+
+        """
+        if not os.path.isfile(self.path):
+            return None
+
+        try:
+            with open(self.path, mode="rb") as f:
+                checkpoint = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError) as ex:
+            LOG.warning(f"Checkpoint {self.path} unreadable ({repr(ex)}). Ignoring it")
+            return None
+
+        if checkpoint.fingerprint != self.fingerprint:
+            LOG.warning(
+                f"Checkpoint {self.path} belongs to other samples or configuration. "
+                "Ignoring it"
+            )
+            return None
+
+        return checkpoint
+
+    def generation(self, population: any) -> None:
+        """
+        Checkpoints an evolving population every interval generations
+        Args:
+            population: Population instance
+
+        Returns: None
+
+        """
+        if self.interval > 0 and population.generations % self.interval == 0:
+            self.save(population.context.stats, population)
+
+    def save(self, stats: Stats, population: any = None, run: int = None) -> None:
+        """
+        Takes a snapshot of the execution, written later on by the background thread
+        Args:
+            stats: Stats instance accounting the finished runs
+            population: Optional, Population instance evolving the next run
+            run: Optional, number of runs finished (defaults to the current run)
+
+        Returns: None
+
+        """
+        checkpoint = Checkpoint(
+            self.fingerprint,
+            self.run if run is None else run,
+            stats,
+            population.state() if population is not None else None,
+            random.getstate(),
+            np.random.get_state(),
+        )
+        data = pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+
+        write = self._writer.submit(write_atomically, self.path, data)
+        write.add_done_callback(_log_failure)
+
+    def close(self) -> None:
+        """Waits for the pending writes"""
+        self._writer.shutdown(wait=True)
+
+
+def fingerprint(samples: List[str], model_name: str) -> str:
+    """
+    Digest of everything a checkpoint depends on
+    Args:
+        samples: List of strings
+        model_name: Spacy Language Model name
+
+    Returns: Hexadecimal digest
+
+    """
+    config = Config()
+    options = [repr(getattr(config, option)) for option in FINGERPRINT_OPTIONS]
+    return hashlib.sha256(
+        "\x00".join([model_name, *options, *samples]).encode()
+    ).hexdigest()
+
+
+def write_atomically(path: str, data: bytes) -> None:
+    """
+    Writes a file atomically: a temporary file at the same directory replaces it
+    once fully written
+    Args:
+        path: File path
+        data: File content
+
+    Returns: None
+
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode="wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def _log_failure(write: Future) -> None:
+    """
+    Warns about a failed checkpoint write, the execution goes on anyway
+    Args:
+        write: Future instance of the write
+
+    Returns: None
+
+    """
+    if write.exception() is not None:
+        LOG.warning(f"Checkpoint write failed: {repr(write.exception())}")
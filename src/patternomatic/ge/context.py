@@ -0,0 +1,95 @@
+""" Shared evaluation context module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+from typing import TYPE_CHECKING, List, Union
+
+from spacy.tokens import Doc
+
+from patternomatic.ge.cache import DecodeCache, FitnessCache
+from patternomatic.ge.decoder import CompiledGrammar, compile_grammar
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.matrix import SampleIndex, SampleMatrix
+from patternomatic.settings.config import Config
+
+if TYPE_CHECKING:
+    from patternomatic.ge.executor import FitnessExecutor
+
+
+class EvaluationContext(object):
+    """
+    Flyweight holding, just once per run, everything Individual instances need to be
+    decoded and scored, so every Individual carries nothing but its own genotype,
+    fenotype and fitness value
+    """
+
+    __slots__ = (
+        "config",
+        "samples",
+        "grammar",
+        "stats",
+        "fitness_cache",
+        "sample_matrix",
+        "sample_index",
+        "weights",
+        "decode_cache",
+        "fitness_executor",
+    )
+
+    def __init__(
+        self,
+        samples: List[Doc],
+        grammar: Union[dict, CompiledGrammar] = None,
+        stats: Stats = None,
+        fitness_cache: FitnessCache = None,
+        sample_matrix: SampleMatrix = None,
+        sample_index: SampleIndex = None,
+        weights: List[int] = None,
+        decode_cache: DecodeCache = None,
+        fitness_executor: "FitnessExecutor" = None,
+    ):
+        """
+        EvaluationContext constructor
+        Args:
+            samples: list of Spacy doc objects
+            grammar: Optional, Backus Naur Form grammar notation encoded in a
+                dictionary (compiled here once) or its CompiledGrammar, needed to
+                decode genotypes
+            stats: Optional, statistics object related with this run, needed to
+                account evaluations
+            fitness_cache: Optional, memoized fitness values
+            sample_matrix: Optional, samples encoded for the matrix fitness engine
+            sample_index: Optional, positional inverted index of the samples for the
+                full match fitness
+            weights: Optional, number of samples each sample stands for
+            decode_cache: Optional, memoized derivations
+            fitness_executor: Optional, pool of worker processes scoring batches of
+                fenotypes (batch evaluation only)
+        """
+        self.config = Config()
+
+        self.samples = samples
+        self.grammar = compile_grammar(grammar) if grammar is not None else None
+        self.stats = stats
+        self.fitness_cache = fitness_cache
+        self.sample_matrix = sample_matrix
+        self.sample_index = sample_index
+        self.weights = weights
+        self.decode_cache = decode_cache
+        self.fitness_executor = fitness_executor
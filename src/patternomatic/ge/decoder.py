@@ -0,0 +1,290 @@
+""" Compiled grammar decoder module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+from collections.abc import Sequence
+from itertools import cycle
+from typing import Any, Callable, List, Tuple, Union
+
+from patternomatic.settings.literals import (
+    EF,
+    EQQ,
+    GEQ,
+    GTH,
+    IN,
+    LEQ,
+    LTH,
+    NOT_IN,
+    SLD,
+    SRD,
+    TOKEN_WILDCARD,
+    UNDERSCORE,
+    XPS,
+    XPS_AS,
+    F,
+    P,
+    S,
+    T,
+)
+
+# Terminal items of a compiled production. Nonterminal symbols are plain integers
+OPEN = ("{",)
+CLOSE = ("}",)
+KEY = "key"
+VALUE = "value"
+
+
+class CompiledGrammar(object):
+    """
+    Integer indexed production table of a Backus Naur Form grammar dict, as generated
+    by nlp.bnf.dynamic_generator. Decodes codons straight into Spacy's Rule Based
+    Matcher patterns, with no string rewriting nor JSON parsing
+    """
+
+    __slots__ = ("grammar", "symbols", "productions", "root", "num_keys")
+
+    def __init__(self, grammar: dict):
+        """
+        CompiledGrammar constructor
+        Args:
+            grammar: Backus Naur Form grammar notation encoded in a dictionary
+        """
+        self.grammar = grammar
+        self.symbols = {key: symbol for symbol, key in enumerate(grammar.keys())}
+        self.num_keys = len(self.symbols)
+        self.productions = [
+            [self._compile(key, rule) for rule in rules]
+            if isinstance(rules, list)
+            else LazyProductions(self._compile, key, rules)
+            for key, rules in grammar.items()
+        ]
+        self.root = self._sequence(grammar[S][0])
+
+    def decode(self, int_genotype: List[int]) -> List[dict]:
+        """
+        Decodes codons into a Spacy's Rule Based Matcher pattern
+        Args:
+            int_genotype: List of integers, the codons
+
+        Returns: Spacy's Rule Based Matcher pattern
+
+        """
+        return self.derive(int_genotype)[0]
+
+    def derive(self, int_genotype: List[int]) -> Tuple[List[dict], int]:
+        """
+        Expands the grammar root the same way the former string rewriting did: every
+        pass takes the next codon (cycling over the genotype) and, key by key in
+        grammar order, replaces the leftmost pending occurrence of that key with the
+        production the codon fires. It stops after a pass that changes nothing
+        Args:
+            int_genotype: List of integers, the codons
+
+        Returns: Spacy's Rule Based Matcher pattern and the number of codons the
+            derivation consumed (passes that changed something)
+
+        """
+        pending = list(self.root)
+        counts = [0] * len(self.symbols)
+        for item in pending:
+            if isinstance(item, int):
+                counts[item] += 1
+
+        codons = cycle(int_genotype)
+        consumed = -1
+        changed = True
+
+        while changed:
+            changed = False
+            codon = next(codons)
+            consumed += 1
+
+            for symbol in range(self.num_keys):
+                if counts[symbol] == 0:
+                    continue
+
+                rules = self.productions[symbol]
+                production = rules[codon % len(rules)]
+                position = pending.index(symbol)
+                pending[position : position + 1] = production
+
+                counts[symbol] -= 1
+                for item in production:
+                    if isinstance(item, int):
+                        counts[item] += 1
+                changed = True
+
+        return self._build(pending), consumed
+
+    def _compile(self, key: str, rule: Any) -> list:
+        """
+        Compiles a grammar rule into a list of terminal items and nonterminal symbols
+        Args:
+            key: Grammar key the rule belongs to
+            rule: Grammar rule
+
+        Returns: List of items
+
+        """
+        if key in [T, XPS]:
+            if rule == TOKEN_WILDCARD:
+                return [OPEN, CLOSE]
+            return [OPEN] + self._sequence(rule) + [CLOSE]
+
+        if key is UNDERSCORE:
+            return [(KEY, "_"), OPEN] + self._sequence(rule) + [CLOSE]
+
+        if key in [P, F, EF]:
+            return self._sequence(rule)
+
+        if key in [IN, NOT_IN]:
+            return [(KEY, key.replace(SLD, "").replace(SRD, "")), (VALUE, rule)]
+
+        if key in [GTH, LTH, GEQ, LEQ, EQQ]:
+            return [(KEY, XPS_AS[key]), (VALUE, rule)]
+
+        key_r = key.replace(SLD, "").replace(SRD, "")
+        if str(rule) == XPS:
+            return [(KEY, key_r), self._symbol(XPS)]
+        return [(KEY, key_r), (VALUE, str(rule))]
+
+    def _sequence(self, rule: Any) -> List[int]:
+        """
+        Compiles a comma separated list of grammar symbols
+        Args:
+            rule: Grammar rule such as "<T>,<T>"
+
+        Returns: List of nonterminal symbols
+
+        """
+        return [self._symbol(name) for name in str(rule).split(",")]
+
+    def _symbol(self, name: str) -> int:
+        """
+        Integer id of a grammar symbol. Symbols the grammar does not define get an id
+        too, they are never expanded and make decoding fail
+        Args:
+            name: Grammar symbol
+
+        Returns: Integer
+
+        """
+        symbol = self.symbols.get(name)
+        if symbol is None:
+            symbol = self.symbols[name] = len(self.symbols)
+        return symbol
+
+    def _build(self, items: list) -> List[dict]:
+        """
+        Assembles the pattern out of the fully expanded terminal items
+        Args:
+            items: List of terminal items
+
+        Returns: Spacy's Rule Based Matcher pattern
+
+        Raises: ValueError if the items do not make up a valid pattern
+
+        """
+        pattern = list()
+        containers = [pattern]
+        key = None
+
+        for item in items:
+            if isinstance(item, int):
+                raise ValueError(f"Unresolved grammar symbol {self._name(item)}")
+
+            if item is OPEN:
+                token = dict()
+                self._put(containers[-1], key, token)
+                containers.append(token)
+                key = None
+            elif item is CLOSE:
+                containers.pop()
+            elif item[0] == KEY:
+                key = item[1]
+            else:
+                value = list(item[1]) if isinstance(item[1], list) else item[1]
+                self._put(containers[-1], key, value)
+                key = None
+
+        return pattern
+
+    @staticmethod
+    def _put(container: Union[list, dict], key: str, value: Any) -> None:
+        """
+        Places a value at a pattern list or at a token dict under the given key
+        Args:
+            container: Pattern list or token dict
+            key: Key for dicts, None for lists
+            value: Value to place
+
+        Returns: None
+
+        """
+        if isinstance(container, list) and key is None:
+            container.append(value)
+        elif isinstance(container, dict) and key is not None:
+            container[key] = value
+        else:
+            raise ValueError(f"Malformed pattern item {key}: {value}")
+
+    def _name(self, symbol: int) -> str:
+        """Grammar symbol of an integer id"""
+        return next(name for name, s in self.symbols.items() if s == symbol)
+
+
+class LazyProductions(Sequence):
+    """
+    Compiled productions of a lazy sequence of grammar rules, such as the extended
+    pattern syntax set operators terminals, compiled on demand rather than all at once
+    """
+
+    __slots__ = ("compile", "key", "rules")
+
+    def __init__(self, compile_rule: Callable, key: str, rules: Sequence):
+        """
+        LazyProductions constructor
+        Args:
+            compile_rule: Compiles a grammar rule of a grammar key into its production
+            key: Grammar key the rules belong to
+            rules: Sequence of grammar rules
+        """
+        self.compile = compile_rule
+        self.key = key
+        self.rules = rules
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __getitem__(self, index: int) -> list:
+        return self.compile(self.key, self.rules[index])
+
+
+def compile_grammar(grammar: Union[dict, CompiledGrammar]) -> CompiledGrammar:
+    """
+    Compiles a grammar dict, leaving already compiled grammars untouched
+    Args:
+        grammar: Backus Naur Form grammar dict or CompiledGrammar instance
+
+    Returns: CompiledGrammar instance
+
+    """
+    if isinstance(grammar, CompiledGrammar):
+        return grammar
+    return CompiledGrammar(grammar)
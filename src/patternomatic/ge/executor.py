@@ -0,0 +1,210 @@
+""" Parallel fitness evaluation module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from spacy.attrs import (
+    DEP,
+    ENT_ID,
+    ENT_IOB,
+    ENT_KB_ID,
+    ENT_TYPE,
+    HEAD,
+    LEMMA,
+    NORM,
+    ORTH,
+    POS,
+    SPACY,
+    TAG,
+)
+from spacy.tokens import Doc, DocBin
+from spacy.util import get_lang_class
+
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.individual import BatchFitness
+from patternomatic.nlp.bnf import custom_attribute_names, set_custom_attributes
+from patternomatic.nlp.matrix import encode_samples
+from patternomatic.settings.config import Config, restore_config
+
+# Token attributes shipped to the workers, every one a pattern or the custom
+# attributes may look at. Lexical ones (LOWER, SHAPE, LENGTH, IS_*...) are computed
+# again by the language defaults of the worker vocabulary
+DOC_BIN_ATTRIBUTES = [
+    ORTH,
+    NORM,
+    LEMMA,
+    POS,
+    TAG,
+    DEP,
+    HEAD,
+    ENT_IOB,
+    ENT_TYPE,
+    ENT_ID,
+    ENT_KB_ID,
+    SPACY,
+]
+
+# Scoring state of a worker process, loaded just once by _init_worker
+_worker = dict()
+
+
+class FitnessExecutor(object):
+    """
+    Pool of worker processes scoring batches of fenotypes. The samples are shipped
+    to every worker just once, when the pool starts, so only fenotypes and fitness
+    values travel afterwards
+    """
+
+    __slots__ = ("chunk_size", "num_workers", "_executor")
+
+    def __init__(self, samples: List[Doc], weights: List[int] = None):
+        """
+        FitnessExecutor constructor, starts the pool of worker processes
+        Args:
+            samples: List of Spacy Doc objects
+            weights: Optional, number of duplicated samples each sample stands for
+        """
+        config = Config()
+
+        self.chunk_size = max(config.fitness_chunk_size, 1)
+        self.num_workers = (
+            config.fitness_workers if config.fitness_workers > 0 else os.cpu_count()
+        )
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=_init_worker,
+            initargs=(pack_samples(samples), weights, config.__dict__),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def map(self, fenotypes: List[List[dict]]) -> List[float]:
+        """
+        Scores the fenotypes across the worker processes, in chunks
+        Args:
+            fenotypes: List of Spacy's Rule Based Matcher patterns
+
+        Returns: List of fitness values, in the same order
+
+        """
+        chunks = [
+            fenotypes[start : start + self.chunk_size]
+            for start in range(0, len(fenotypes), self.chunk_size)
+        ]
+
+        return [
+            fitness_value
+            for fitness_values in self._executor.map(_score, chunks)
+            for fitness_value in fitness_values
+        ]
+
+    def shutdown(self) -> None:
+        """Stops the pool of worker processes"""
+        self._executor.shutdown()
+
+
+def pack_samples(samples: List[Doc]) -> tuple:
+    """
+    Serializes the samples to be shipped to another process
+    Args:
+        samples: List of Spacy Doc objects
+
+    Returns: Tuple holding the language, the vocabulary and DocBin bytes and the
+        token attributes registered as custom attributes
+
+    """
+    doc_bin = DocBin(attrs=DOC_BIN_ATTRIBUTES)
+    for sample in samples:
+        doc_bin.add(sample)
+
+    custom_attributes = (
+        custom_attribute_names(samples[0][0])
+        if Config().use_custom_attributes is True
+        else list()
+    )
+
+    return (
+        samples[0].vocab.lang,
+        samples[0].vocab.to_bytes(),
+        doc_bin.to_bytes(),
+        custom_attributes,
+    )
+
+
+def unpack_samples(packed_samples: tuple) -> List[Doc]:
+    """
+    Restores the samples serialized by pack_samples at another process
+    Args:
+        packed_samples: Tuple built by pack_samples
+
+    Returns: List of Spacy Doc objects
+
+    """
+    lang, vocab_bytes, doc_bin_bytes, custom_attributes = packed_samples
+
+    vocab = get_lang_class(lang).Defaults.create_vocab().from_bytes(vocab_bytes)
+    samples = list(DocBin().from_bytes(doc_bin_bytes).get_docs(vocab))
+    set_custom_attributes(custom_attributes)
+
+    return samples
+
+
+def _init_worker(packed_samples: tuple, weights: List[int], options: dict) -> None:
+    """
+    Worker process initializer, restores the configuration and the samples
+    Args:
+        packed_samples: Samples serialized by pack_samples
+        weights: Number of duplicated samples each sample stands for
+        options: Configuration parameters of the parent process
+
+    Returns: None
+
+    """
+    restore_config(options)
+    samples = unpack_samples(packed_samples)
+
+    sample_matrix, sample_index = encode_samples(samples)
+    _worker["batch_fitness"] = BatchFitness(
+        EvaluationContext(
+            samples,
+            sample_matrix=sample_matrix,
+            sample_index=sample_index,
+            weights=weights,
+        )
+    )
+
+
+def _score(fenotypes: List[List[dict]]) -> List[float]:
+    """
+    Scores a chunk of fenotypes at a worker process
+    Args:
+        fenotypes: List of Spacy's Rule Based Matcher patterns
+
+    Returns: List of fitness values, in the same order
+
+    """
+    return _worker["batch_fitness"].score(fenotypes)
@@ -18,50 +18,56 @@ You should have received a copy of the GNU Lesser General Public License
 along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
-import json
-import re
-from itertools import cycle
-from random import random
-from typing import List
+from typing import List, Union
 
+import numpy as np
 from spacy.matcher import Matcher
-from spacy.tokens import Doc
-
-from patternomatic.ge.stats import Stats
-from patternomatic.settings.config import Config
-from patternomatic.settings.literals import (
-    EF,
-    EQQ,
-    GEQ,
-    GTH,
-    IN,
-    LEQ,
-    LTH,
-    NOT_IN,
-    SLD,
-    SRD,
-    TOKEN_WILDCARD,
-    UNDERSCORE,
-    XPS,
-    XPS_AS,
-    F,
-    FitnessType,
-    P,
-    S,
-    T,
-)
+
+from patternomatic.ge.cache import FitnessCache
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.settings.literals import FitnessType
 from patternomatic.settings.log import LOG
 
 
 class Fitness(object):
     """Dispatches the proper fitness type for individual instances"""
 
-    __slots__ = ("_fitness", "config", "samples", "fenotype")
+    __slots__ = (
+        "_fitness",
+        "config",
+        "samples",
+        "fenotype",
+        "sample_matrix",
+        "sample_index",
+        "encoded_fenotype",
+        "weights",
+        "total_weight",
+    )
 
-    def __init__(self, config, samples, fenotype):
+    def __init__(
+        self,
+        config,
+        samples,
+        fenotype,
+        sample_matrix=None,
+        sample_index=None,
+        weights=None,
+    ):
         self.config = config
         self.samples = samples
         self.fenotype = fenotype
+        self.weights = weights
+        self.total_weight = len(samples) if weights is None else sum(weights)
+        self.sample_matrix = sample_matrix
+        self.sample_index = (
+            sample_index
+            if config.fitness_function_type == FitnessType.FULL_MATCH
+            else None
+        )
+        encoder = self.sample_index if self.sample_index is not None else sample_matrix
+        self.encoded_fenotype = (
+            encoder.encode(fenotype) if encoder is not None else None
+        )
         self._dispatch_fitness(self.config.fitness_function_type)
 
     def __call__(self, *args, **kwargs) -> float:
@@ -76,7 +82,14 @@ class Fitness(object):
         Returns: None
 
         """
-        if fitness_function_type == FitnessType.FULL_MATCH:
+        if self.encoded_fenotype is not None:
+            if self.sample_index is not None:
+                self._fitness = self._fitness_full_match_index
+            elif fitness_function_type == FitnessType.FULL_MATCH:
+                self._fitness = self._fitness_full_match_matrix
+            else:
+                self._fitness = self._fitness_basic_matrix
+        elif fitness_function_type == FitnessType.FULL_MATCH:
             self._fitness = self._fitness_full_match
         else:
             self._fitness = self._fitness_basic
@@ -90,17 +103,7 @@ class Fitness(object):
         Returns:
             Fitness value
         """
-        max_score_per_sample = 1 / len(self.samples)
-        matcher = Matcher(self.samples[0].vocab)
-        matcher.add(repr(FitnessType.BASIC), None, self.fenotype)
-        contact = 0.0
-
-        for sample in self.samples:
-            matches = matcher(sample)
-            if len(matches) > 0:
-                contact += max_score_per_sample
-
-        return self._wildcard_penalty(contact)
+        return self._score_basic(self._match(repr(FitnessType.BASIC)))
 
     def _fitness_full_match(self) -> float:
         """
@@ -110,25 +113,137 @@ class Fitness(object):
         Returns: Float
 
         """
-        max_score_per_sample = 1 / len(self.samples)
+        return self._score_full_match(self._match(repr(FitnessType.FULL_MATCH)))
+
+    def _match(self, key: str) -> List[list]:
+        """
+        Runs a Spacy's Rule Based Matcher holding just this fenotype over every sample
+        Args:
+            key: Key for the fenotype within the matcher
+
+        Returns: List of matches per sample
 
-        current_vocab = self.samples[0].vocab
+        """
+        matcher = Matcher(self.samples[0].vocab)
+        matcher.add(key, None, self.fenotype)
+        return [matcher(sample) for sample in self.samples]
 
-        matcher = Matcher(current_vocab)
-        matcher.add(repr(FitnessType.FULL_MATCH), None, self.fenotype)
+    def score(self, sample_matches: List[list]) -> float:
+        """
+        Computes the fitness value out of the Spacy's Rule Based Matcher matches of
+        this fenotype over every sample
+        Args:
+            sample_matches: List of matches per sample
+
+        Returns: Fitness value
+
+        """
+        if self.config.fitness_function_type == FitnessType.FULL_MATCH:
+            return self._score_full_match(sample_matches)
+        return self._score_basic(sample_matches)
+
+    def _score_basic(self, sample_matches: List[list]) -> float:
+        """
+        Scores each sample with at least one match
+        Args:
+            sample_matches: List of matches per sample
+
+        Returns: Fitness value
+
+        """
         contact = 0.0
 
-        for sample in self.samples:
-            matches = matcher(sample)
+        for index, matches in enumerate(sample_matches):
+            if len(matches) > 0:
+                contact += self._max_score_per_sample(index)
+
+        return self._wildcard_penalty(contact)
+
+    def _score_full_match(self, sample_matches: List[list]) -> float:
+        """
+        Scores each match that spans its whole sample
+        Args:
+            sample_matches: List of matches per sample
+
+        Returns: Fitness value
+
+        """
+        contact = 0.0
+
+        for index, (sample, matches) in enumerate(zip(self.samples, sample_matches)):
             if len(matches) > 0:
                 for match in matches:
                     contact += (
-                        max_score_per_sample
+                        self._max_score_per_sample(index)
                         if match[2] == len(sample) and match[1] == 0
                         else +0
                     )
         return self._wildcard_penalty(contact)
 
+    def _max_score_per_sample(self, index: int) -> float:
+        """
+        Score a sample contributes when matched, its share of the total weight
+        Args:
+            index: Position of the sample
+
+        Returns: Float
+
+        """
+        weight = 1 if self.weights is None else self.weights[index]
+        return weight / self.total_weight
+
+    def _fitness_basic_matrix(self) -> float:
+        """
+        Same as the "basic" fitness, evaluated over the token attribute matrix
+        Returns: Float
+
+        """
+        matched = self.sample_matrix.match(self.encoded_fenotype)
+        return self._wildcard_penalty(float(self._matched_weight(matched)))
+
+    def _fitness_full_match_matrix(self) -> float:
+        """
+        Same as the "full match" fitness, evaluated over the token attribute matrix
+        Returns: Float
+
+        """
+        matched = self.sample_matrix.full_match(self.encoded_fenotype)
+        return self._wildcard_penalty(float(self._matched_weight(matched)))
+
+    def _fitness_full_match_index(self) -> float:
+        """
+        Same as the "full match" fitness, intersecting the bitsets of the positional
+        inverted index of the samples
+        Returns: Float
+
+        """
+        matched = self.sample_index.full_match(self.encoded_fenotype)
+
+        if self.weights is None:
+            contact = bin(matched).count("1") / self.total_weight
+        else:
+            matched_weight = 0
+            while matched:
+                lowest_bit = matched & -matched
+                matched_weight += self.weights[lowest_bit.bit_length() - 1]
+                matched ^= lowest_bit
+            contact = matched_weight / self.total_weight
+
+        return self._wildcard_penalty(contact)
+
+    def _matched_weight(self, matched: np.ndarray) -> float:
+        """
+        Share of the total weight held by the matched samples
+        Args:
+            matched: Boolean array, one item per sample
+
+        Returns: Float
+
+        """
+        if self.weights is None:
+            return matched.sum() / self.total_weight
+        return np.dot(matched, self.weights) / self.total_weight
+
     def _wildcard_penalty(self, contact: float) -> float:
         """
         Applies a penalty for the usage of token wildcard if usage of token wildcard is
@@ -151,219 +266,414 @@ class Fitness(object):
         return contact
 
 
+class BatchFitness(object):
+    """
+    Scores a whole batch of Individual instances at once, registering every distinct
+    fenotype under its own key in a single Spacy's Rule Based Matcher that runs once
+    per sample, or handing them over to a FitnessExecutor pool of worker processes
+    """
+
+    __slots__ = ("context",)
+
+    def __init__(self, context: EvaluationContext):
+        """
+        BatchFitness constructor
+        Args:
+            context: EvaluationContext shared by the individuals to score
+        """
+        self.context = context
+
+    def __call__(self, individuals: List["Individual"]) -> None:
+        """
+        Sets the fitness value of every individual not evaluated yet, individuals
+        short-circuited by the decode cache already hold theirs
+        Args:
+            individuals: List of Individual instances built with evaluate=False
+
+        Returns: None
+
+        """
+        context = self.context
+        pending = [i for i in individuals if i.fitness_value is None]
+        keys = [FitnessCache.key(context.config, i.fenotype) for i in pending]
+        fitness_values = dict()
+        unknown = dict()
+
+        for key, individual in zip(keys, pending):
+            if key in fitness_values or key in unknown:
+                continue
+
+            fitness_value = (
+                context.fitness_cache.get(key)
+                if context.fitness_cache is not None
+                else None
+            )
+            if fitness_value is None:
+                unknown[key] = individual.fenotype
+            else:
+                fitness_values[key] = fitness_value
+
+        if len(unknown) > 0:
+            fenotypes = list(unknown.values())
+            scores = (
+                context.fitness_executor.map(fenotypes)
+                if context.fitness_executor is not None
+                else self.score(fenotypes)
+            )
+            for key, fitness_value in zip(unknown, scores):
+                fitness_values[key] = self._memoize(key, fitness_value)
+
+        for key, individual in zip(keys, pending):
+            individual.fitness_value = fitness_values[key]
+            if context.decode_cache is not None:
+                context.decode_cache.put(
+                    transcription(individual.genotype, context.config.codon_length),
+                    individual.consumed,
+                    individual.fenotype,
+                    individual.fitness_value,
+                )
+
+        for individual in individuals:
+            individual._is_solution(context)
+
+    def score(self, fenotypes: List[List[dict]]) -> List[float]:
+        """
+        Scores several fenotypes, the ones the sample encodings can not evaluate share
+        a single Spacy's Rule Based Matcher
+        Args:
+            fenotypes: List of Spacy's Rule Based Matcher patterns
+
+        Returns: List of fitness values, in the same order
+
+        """
+        context = self.context
+        fitness_values = [None] * len(fenotypes)
+        unmatched = dict()
+
+        for position, fenotype in enumerate(fenotypes):
+            fitness = Fitness(
+                context.config,
+                context.samples,
+                fenotype,
+                context.sample_matrix,
+                context.sample_index,
+                context.weights,
+            )
+            if fitness.encoded_fenotype is None:
+                unmatched[position] = fitness
+            else:
+                fitness_values[position] = fitness.__call__()
+
+        if len(unmatched) > 0:
+            for position, fitness_value in self._match(unmatched).items():
+                fitness_values[position] = fitness_value
+
+        return fitness_values
+
+    def _match(self, unmatched: dict) -> dict:
+        """
+        Evaluates several fenotypes with a single Spacy's Rule Based Matcher
+        Args:
+            unmatched: dict of fenotype positions and Fitness instances
+
+        Returns: dict of fenotype positions and fitness values
+
+        """
+        samples = self.context.samples
+        vocab = samples[0].vocab
+        matcher = Matcher(vocab)
+        match_keys = dict()
+        sample_matches = dict()
+
+        for position, (key, fitness) in enumerate(unmatched.items()):
+            match_key = f"{repr(self.context.config.fitness_function_type)}_{position}"
+            matcher.add(match_key, None, fitness.fenotype)
+            match_keys[vocab.strings.add(match_key)] = key
+            sample_matches[key] = [[] for _ in samples]
+
+        for index, sample in enumerate(samples):
+            for match in matcher(sample):
+                sample_matches[match_keys[match[0]]][index].append(match)
+
+        return {
+            key: fitness.score(sample_matches[key])
+            for key, fitness in unmatched.items()
+        }
+
+    def _memoize(self, key: tuple, fitness_value: float) -> float:
+        """
+        Stores a fitness value at the fitness cache, if any
+        Args:
+            key: Cache key
+            fitness_value: Fitness value
+
+        Returns: The same fitness value
+
+        """
+        if self.context.fitness_cache is not None:
+            self.context.fitness_cache.put(key, fitness_value)
+        return fitness_value
+
+
 class Individual(object):
     """
-    Individual implementation of an AI Grammatical Evolution algorithm in OOP fashion
+    Individual implementation of an AI Grammatical Evolution algorithm in OOP fashion.
+    Whatever individuals share (samples, grammar, configuration, stats, caches...)
+    stays at their EvaluationContext
     """
 
     __slots__ = (
-        "config",
-        "samples",
-        "grammar",
-        "stats",
-        "bin_genotype",
-        "int_genotype",
+        "genotype",
+        "codon_length",
         "fenotype",
+        "consumed",
         "fitness_value",
     )
 
     def __init__(
-        self, samples: List[Doc], grammar: dict, stats: Stats, dna: str = None
+        self,
+        context: EvaluationContext,
+        dna: Union[str, np.ndarray] = None,
+        evaluate: bool = True,
+        mutate_dna: bool = True,
     ):
         """
         Individual constructor, if dna is not supplied, sets up randomly its binary
         genotype.
 
         Args:
-            samples: list of Spacy doc objects
-            grammar: Backus Naur Form grammar notation encoded in a dictionary
-            stats (Stats): statistics object related with this run
-            dna: Optional, binary string representation
+            context (EvaluationContext): samples, grammar, stats, caches and sample
+                encodings shared with other individuals
+            dna: Optional, binary string or array of bits representation
+            evaluate: Optional, when False the fitness value is left unset to be
+                computed later on by a BatchFitness instance
+            mutate_dna: Optional, when False the supplied dna is taken as is, for dna
+                already mutated along with the whole offspring
         """
-        self.config = Config()
+        config = context.config
+        decode_cache = context.decode_cache
 
-        self.samples = samples
-        self.grammar = grammar
-        self.stats = stats
-        self.bin_genotype = (
-            self._initialize()
-            if dna is None
-            else self.mutate(dna, self.config.mutation_probability)
-        )
-        self.int_genotype = self._transcription()
-        self.fenotype = self._translation()
-        self.fitness_value = Fitness(
-            self.config, self.samples, self.fenotype
-        ).__call__()
+        if dna is None:
+            self.genotype = self._initialize(config.dna_length)
+        elif mutate_dna is True:
+            self.genotype = self.mutate(dna, config.mutation_probability)
+        else:
+            self.genotype = bits(dna)
+        self.codon_length = config.codon_length
+        int_genotype = transcription(self.genotype, self.codon_length)
+
+        derivation = None
+        if decode_cache is not None:
+            derivation = decode_cache.get(int_genotype)
+
+        if derivation is None:
+            self.fenotype, self.consumed = context.grammar.derive(int_genotype)
+            self.fitness_value = None
+        else:
+            # Neutral mutations, only codons the derivation never reads changed
+            self.fenotype, self.consumed, self.fitness_value = derivation
+            if self.fitness_value is not None:
+                context.stats.sum_short_circuits(1)
+
+        if evaluate is True:
+            if self.fitness_value is None:
+                self.fitness_value = self._evaluate(context)
+                if decode_cache is not None:
+                    decode_cache.put(
+                        int_genotype,
+                        self.consumed,
+                        self.fenotype,
+                        self.fitness_value,
+                    )
 
-        # Stats concerns
-        self._is_solution()
+            # Stats concerns
+            self._is_solution(context)
 
     @property
     def __dict__(self):
         """Dictionary representation for a slotted class (that has no dict at all)"""
         # Above works just for POPOs
         return {
-            s: getattr(self, s, None)
-            for s in self.__slots__
-            if s in ("bin_genotype", "fenotype", "fitness_value")
+            "bin_genotype": self.bin_genotype,
+            "fenotype": getattr(self, "fenotype", None),
+            "fitness_value": getattr(self, "fitness_value", None),
         }
 
     def __repr__(self):
         """String representation of a slotted class using hijacked dict"""
         return f"{self.__class__.__name__}({self.__dict__})"
 
+    def __getstate__(self):
+        """Pickling state, the hijacked dict is just a representation"""
+        return {s: getattr(self, s, None) for s in self.__slots__}
+
+    def __setstate__(self, state):
+        """Restores a pickled Individual instance"""
+        for s, value in state.items():
+            setattr(self, s, value)
+
+    @property
+    def bin_genotype(self) -> str:
+        """Binary string view of the genotype, for representation purposes"""
+        genotype = getattr(self, "genotype", None)
+        return None if genotype is None else (genotype + ord("0")).tobytes().decode()
+
+    @property
+    def int_genotype(self) -> List[int]:
+        """Integer representation of the genotype, computed on demand"""
+        return self._transcription()
+
     #
     # Problem specific GE methods
     #
-    def _initialize(self) -> str:
+    @staticmethod
+    def _initialize(dna_length: int) -> np.ndarray:
         """
-        Sets up randomly the binary string representation of an individual
-        Returns: String, binary fashion
+        Sets up randomly the array of bits representation of an individual
+        Args:
+            dna_length: Number of bits
+
+        Returns: Array of 0/1 uint8 values
 
         """
-        return "".join(
-            [
-                "".join("1") if random() > 0.5 else "".join("0")
-                for _ in range(0, self.config.dna_length)
-            ]
-        ).strip()
+        return (np.random.random(dna_length) > 0.5).astype(np.uint8)
 
     def _transcription(self) -> List[int]:
         """
-        Converts a binary string representation to an integer representation codon by
+        Converts an array of bits representation to an integer representation codon by
         codon
 
         Returns:
             List of integers
         """
-        return [
-            int(self.bin_genotype[i : (i + self.config.codon_length - 1)], 2)
-            for i in range(0, len(self.bin_genotype), self.config.codon_length - 1)
-        ]
-
-    def _translation(self):
-        done = False
-        symbolic_string = self.grammar[S][0]  # Root
-        circular = cycle(self.int_genotype)
-
-        while done is not True:
-            # First save previous iteration copy
-            old_symbolic_string = symbolic_string
-            ci = next(circular)
-
-            for key in self.grammar.keys():
-                symbolic_string = self._translate(ci, key, symbolic_string)
+        return transcription(self.genotype, self.codon_length)
 
-            # Check if anything changed from last iteration
-            if old_symbolic_string == symbolic_string:
-                done = True
-
-        translated_individual = "[" + symbolic_string + "]"
-
-        return json.loads(translated_individual)
-
-    def _translate(self, ci: iter, key, symbolic_string: str):
+    def _evaluate(self, context: EvaluationContext) -> float:
         """
-        Helper method to reduce cognitive overload of the public method with the same
-        name (_translation)
+        Computes the fitness value of the individual, unless an equivalent fenotype
+        was already scored and remains memoized at the fitness cache
 
         Args:
-            ci: Last circular iterator
-            key: Last key in the grammar dict
-            symbolic_string: String representation of the individual's Spacy's Rule
-                Based Matcher pattern
+            context: EvaluationContext holding the samples, their encodings and the
+                fitness cache
 
-        Returns:
-            String representation of the individual's Spacy's Rule Based Matcher pattern
+        Returns: Fitness value
 
         """
-        fire = divmod(ci, len(self.grammar[key]))[1]
+        fitness_cache = context.fitness_cache
+        if fitness_cache is None:
+            return self._fitness(context)
 
-        if key in [T, XPS]:
-            fired_rule = self.grammar[key][fire]
-            if fired_rule == TOKEN_WILDCARD:
-                symbolic_string = re.sub(key, "{}", symbolic_string, 1)
-            else:
-                symbolic_string = re.sub(
-                    key, "{" + str(self.grammar[key][fire]) + "}", symbolic_string, 1
-                )
+        key = fitness_cache.key(context.config, self.fenotype)
+        fitness_value = fitness_cache.get(key)
 
-        elif key is UNDERSCORE:
-            symbolic_string = re.sub(
-                key,
-                '"_"' + ": " + "{" + str(self.grammar[key][fire]) + "}",
-                symbolic_string,
-                1,
-            )
+        if fitness_value is None:
+            fitness_value = self._fitness(context)
+            fitness_cache.put(key, fitness_value)
 
-        elif key in [P, T, F, EF]:
-            symbolic_string = re.sub(
-                key, str(self.grammar[key][fire]), symbolic_string, 1
-            )
+        return fitness_value
 
-        elif key in [IN, NOT_IN]:
-            key_r = key.replace(SLD, "").replace(SRD, "")
-            feature = (
-                '"'
-                + key_r
-                + '"'
-                + ":"
-                + str(self.grammar[key][fire]).replace("'", '"').replace("'", "")
-            )
-            symbolic_string = re.sub(key, feature, symbolic_string, 1)
+    def _fitness(self, context: EvaluationContext) -> float:
+        """
+        Scores the fenotype over the samples
+        Args:
+            context: EvaluationContext holding the samples and their encodings
 
-        elif key in [GTH, LTH, GEQ, LEQ, EQQ]:
-            feature = '"' + XPS_AS[key] + '"' + ":" + str(self.grammar[key][fire])
-            symbolic_string = re.sub(key, feature, symbolic_string, 1)
+        Returns: Fitness value
 
-        else:
-            key_r = key.replace(SLD, "").replace(SRD, "")
-            fired_rule = str(self.grammar[key][fire])
-            if fired_rule != XPS:
-                feature = '"' + key_r + '"' + ":" + '"' + fired_rule + '"'
-            else:
-                feature = '"' + key_r + '"' + ":" + fired_rule
-            symbolic_string = re.sub(key, feature, symbolic_string, 1)
-
-        return symbolic_string
+        """
+        return Fitness(
+            context.config,
+            context.samples,
+            self.fenotype,
+            context.sample_matrix,
+            context.sample_index,
+            context.weights,
+        ).__call__()
 
     #
     # Generic GA methods
     #
     @classmethod
-    def mutate(cls, dna, mutation_probability) -> str:
+    def mutate(cls, dna, mutation_probability) -> np.ndarray:
         """
-        Mutates a given dna string by a mutation probability
+        Mutates a given dna sequence by a mutation probability
         Args:
-            dna: binary string representation of a dna sequence
+            dna: binary string or array of bits representation of a dna sequence
             mutation_probability: Chances of each gen to be mutated
 
-        Returns: Binary string
+        Returns: Array of 0/1 uint8 values
 
         """
-        mutated_dna = ""
-
-        for gen in dna:
-            if random() < mutation_probability:
-                if gen == "1":
-                    mutated_dna += "0"
-                else:
-                    mutated_dna += "1"
-            else:
-                mutated_dna += gen
-        return mutated_dna
+        dna = bits(dna)
+        mask = np.random.random(len(dna)) < mutation_probability
+        return dna ^ mask
 
     #
     # Stats concerns
     #
-    def _is_solution(self) -> None:
+    def _is_solution(self, context: EvaluationContext) -> None:
         """
-        Method to manage AES for the given RUN
+        Method to manage AES and fitness evaluations for the given RUN
+        Args:
+            context: EvaluationContext holding the stats of the RUN
 
         """
-        if self.stats.solution_found is False:
-            self.stats.sum_aes(1)
-            if self.fitness_value >= self.config.success_threshold:
+        stats = context.stats
+        stats.sum_evaluations(1)
+        if stats.solution_found is False:
+            stats.sum_aes(1)
+            if self.fitness_value >= context.config.success_threshold:
                 LOG.debug("Solution found for this run!")
-                self.stats.solution_found = True
+                stats.solution_found = True
+
+
+def transcription(genotype: np.ndarray, codon_length: int) -> List[int]:
+    """
+    Converts an array of bits into its integer representation, codon by codon
+    Args:
+        genotype: Array of 0/1 uint8 values
+        codon_length: Codon length, every codon reads codon_length - 1 bits
+
+    Returns: List of integers
+
+    """
+    step = codon_length - 1
+    genotype = genotype.astype(np.int64)
+    num_chunks = len(genotype) // step
+
+    int_genotype = (
+        genotype[: num_chunks * step].reshape(num_chunks, step) @ _bit_weights(step)
+    ).tolist()
+
+    remainder = genotype[num_chunks * step :]
+    if len(remainder) > 0:
+        int_genotype.append(int(remainder @ _bit_weights(len(remainder))))
+
+    return int_genotype
+
+
+def bits(dna: Union[str, np.ndarray]) -> np.ndarray:
+    """
+    Converts a dna sequence into an array of bits
+    Args:
+        dna: binary string or array of bits representation of a dna sequence
+
+    Returns: Array of 0/1 uint8 values
+
+    """
+    if isinstance(dna, str):
+        return np.frombuffer(dna.encode(), dtype=np.uint8) - ord("0")
+    return np.asarray(dna, dtype=np.uint8)
+
+
+def _bit_weights(num_bits: int) -> np.ndarray:
+    """
+    Powers of two to read a big endian array of bits as an integer
+    Args:
+        num_bits: Number of bits
+
+    Returns: Array of int64 values
+
+    """
+    return 1 << np.arange(num_bits - 1, -1, -1, dtype=np.int64)
@@ -0,0 +1,201 @@
+""" Persisted pattern library module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from patternomatic.ge.cache import canonical_fenotype
+from patternomatic.ge.checkpoint import write_atomically
+from patternomatic.ge.decoder import CompiledGrammar
+from patternomatic.ge.individual import bits, transcription
+from patternomatic.ge.records import PatternRecord
+from patternomatic.settings.config import Config
+from patternomatic.settings.log import LOG
+
+# Version of the library file layout, files of any other version are ignored
+LIBRARY_VERSION = 1
+
+
+class PatternLibrary(object):
+    """
+    Best patterns of past executions along with their genotypes, kept at a JSON file
+    by the fingerprint of the grammar they were decoded with, so later executions
+    over similar samples start their evolution from them
+    """
+
+    __slots__ = ("path", "max_size", "entries")
+
+    def __init__(self, path: str, max_size: int = 0):
+        """
+        PatternLibrary constructor, loads the library file if any
+        Args:
+            path: Library file path
+            max_size: Optional, maximum number of patterns kept per grammar, 0 or
+                less keeps them all
+        """
+        self.path = path
+        self.max_size = max_size
+        self.entries: Dict[str, List[PatternRecord]] = self._load()
+
+    def __len__(self):
+        return sum(len(records) for records in self.entries.values())
+
+    def add(self, grammar_fingerprint: str, records: List[PatternRecord]) -> None:
+        """
+        Stores the patterns found with a grammar, keeping the most fitted ones
+        Args:
+            grammar_fingerprint: Digest of the grammar the patterns were decoded with
+            records: List of PatternRecord instances
+
+        Returns: None
+
+        """
+        unique = dict()
+        for record in [*self.entries.get(grammar_fingerprint, list()), *records]:
+            key = canonical_fenotype(record.fenotype)
+            if key not in unique or record.fitness_value > unique[key].fitness_value:
+                unique[key] = PatternRecord(
+                    record.fenotype, record.fitness_value, record.genotype
+                )
+
+        # Stable sort, patterns already stored come first on ties
+        kept = sorted(unique.values(), key=lambda r: r.fitness_value, reverse=True)
+        if self.max_size > 0:
+            kept = kept[: self.max_size]
+        self.entries[grammar_fingerprint] = kept
+
+    def seeds(
+        self, grammar_fingerprint: str, grammar: CompiledGrammar, size: int
+    ) -> List[np.ndarray]:
+        """
+        Genotypes of the most fitted patterns compatible with a grammar: those found
+        with that very grammar, then those found with any other grammar whose
+        genotypes still decode to the same pattern
+        Args:
+            grammar_fingerprint: Digest of the grammar
+            grammar: CompiledGrammar instance
+            size: Maximum number of genotypes
+
+        Returns: List of arrays of bits, the most fitted pattern first
+
+        """
+        if size <= 0:
+            return list()
+
+        config = Config()
+        compatible = list(self.entries.get(grammar_fingerprint, list()))
+        for other_fingerprint, records in self.entries.items():
+            if other_fingerprint == grammar_fingerprint:
+                continue
+            compatible.extend(
+                record
+                for record in records
+                if len(record.genotype) == config.dna_length
+                and canonical_fenotype(
+                    grammar.decode(transcription(record.dna, config.codon_length))
+                )
+                == canonical_fenotype(record.fenotype)
+            )
+
+        compatible.sort(key=lambda r: r.fitness_value, reverse=True)
+
+        seeds = dict()
+        for record in compatible:
+            seeds.setdefault(record.genotype, record.dna.copy())
+            if len(seeds) == size:
+                break
+
+        return list(seeds.values())
+
+    def persist(self) -> None:
+        """
+        Writes the library file, atomically replacing the previous one
+        Returns: None
+
+        """
+        library = {
+            "version": LIBRARY_VERSION,
+            "grammars": {
+                grammar_fingerprint: [
+                    {
+                        "fenotype": record.fenotype,
+                        "fitness_value": record.fitness_value,
+                        "genotype": record.bin_genotype,
+                    }
+                    for record in records
+                ]
+                for grammar_fingerprint, records in self.entries.items()
+            },
+        }
+        write_atomically(self.path, json.dumps(library).encode())
+
+    def _load(self) -> Dict[str, List[PatternRecord]]:
+        """
+        Reads the library file
+        Returns: Patterns by grammar fingerprint, none if the file is missing or
+            unreadable
+
+        """
+        if not os.path.isfile(self.path):
+            return dict()
+
+        try:
+            with open(self.path, mode="r") as f:
+                library = json.load(f)
+            if library["version"] != LIBRARY_VERSION:
+                raise ValueError(f"Unsupported version {library['version']}")
+            return {
+                grammar_fingerprint: [
+                    PatternRecord(
+                        entry["fenotype"],
+                        entry["fitness_value"],
+                        bits(entry["genotype"]).tobytes(),
+                    )
+                    for entry in entries
+                ]
+                for grammar_fingerprint, entries in library["grammars"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            LOG.warning(
+                f"Pattern library {self.path} unreadable ({repr(ex)}). Ignoring it"
+            )
+            return dict()
+
+
+def grammar_fingerprint(grammar: CompiledGrammar) -> str:
+    """
+    Digest of a grammar and of the genotype layout decoded with it, the same
+    genotypes decode to the same patterns for equal digests
+    Args:
+        grammar: CompiledGrammar instance
+
+    Returns: Hexadecimal digest
+
+    """
+    config = Config()
+    return hashlib.sha256(
+        repr(
+            (config.codon_length, config.dna_length, list(grammar.grammar.items()))
+        ).encode()
+    ).hexdigest()
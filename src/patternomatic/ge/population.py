@@ -18,17 +18,161 @@ You should have received a copy of the GNU Lesser General Public License
 along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
-import random
-from typing import Dict, List, Tuple
-
+import heapq
+from multiprocessing import Array, Barrier, Process, Queue
+from queue import Empty
+from threading import BrokenBarrierError
+from time import time
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
 from spacy.tokens import Doc
 
-from patternomatic.ge.individual import Individual
+from patternomatic.ge.cache import DecodeCache, FitnessCache, canonical_fenotype
+from patternomatic.ge.checkpoint import Checkpointer
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.decoder import CompiledGrammar, compile_grammar
+from patternomatic.ge.executor import FitnessExecutor, pack_samples, unpack_samples
+from patternomatic.ge.individual import BatchFitness, Individual
+from patternomatic.ge.records import PatternRecord
 from patternomatic.ge.stats import Stats
-from patternomatic.settings.config import Config
-from patternomatic.settings.literals import ReplacementType, SelectionType
+from patternomatic.nlp.matrix import SampleIndex, SampleMatrix
+from patternomatic.settings.config import Config, restore_config
+from patternomatic.settings.literals import (
+    FitnessEngine,
+    FitnessType,
+    MigrationTopology,
+    ReplacementType,
+    SelectionType,
+    StopReason,
+)
 from patternomatic.settings.log import LOG
 
+# Seconds the island model waits for a result before checking the islands are alive
+ISLAND_POLL_INTERVAL = 1.0
+
+
+class PopulationStore(object):
+    """
+    Stacks the genotypes of a list of Individual instances into one 2-D array (one row
+    per individual) with their fitness values in a parallel 1-D array, so variation
+    operators run as whole generation array operations
+    """
+
+    __slots__ = ("individuals", "fitness_values", "_genotypes")
+
+    def __init__(self, individuals: List[Individual]):
+        """
+        PopulationStore constructor
+        Args:
+            individuals: A list of Individual instances
+        """
+        self.individuals = individuals
+        self.fitness_values = np.fromiter(
+            (i.fitness_value for i in individuals),
+            dtype=np.float64,
+            count=len(individuals),
+        )
+        self._genotypes = None
+
+    def __len__(self):
+        return len(self.individuals)
+
+    @property
+    def genotypes(self) -> np.ndarray:
+        """2-D array of bits, row i holds the genotype of the i-th individual"""
+        if self._genotypes is None:
+            self._genotypes = np.stack([i.genotype for i in self.individuals])
+        return self._genotypes
+
+    def take(self, rows: np.ndarray) -> List[Individual]:
+        """
+        Retrieves the Individual instances at the given rows
+        Args:
+            rows: Array of row positions
+
+        Returns: A list of Individual instances
+
+        """
+        return [self.individuals[row] for row in rows.tolist()]
+
+    def replace(self, row: int, individual: Individual) -> None:
+        """
+        Puts an Individual instance at the given row, in place
+        Args:
+            row: Row position
+            individual: Individual instance
+
+        Returns: None
+
+        """
+        self.individuals[row] = individual
+        self.fitness_values[row] = individual.fitness_value
+        if self._genotypes is not None:
+            self._genotypes[row] = individual.genotype
+
+    def survivors(self, size: int) -> np.ndarray:
+        """
+        Finds the most fitted individuals without sorting the whole store
+        Args:
+            size: Number of individuals to keep
+
+        Returns: Array of row positions, the most fitted individual first
+
+        """
+        size = min(size, len(self))
+        if size <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.argpartition(-self.fitness_values, size - 1)[:size]
+        best = np.argmax(self.fitness_values[rows])
+        rows[[0, best]] = rows[[best, 0]]
+        return rows
+
+
+class FitnessIndex(object):
+    """
+    Min-heap of the rows of a PopulationStore by fitness value, so the least fitted
+    individual is found and replaced in logarithmic time, with no sorting at all
+    """
+
+    __slots__ = ("store", "_heap")
+
+    def __init__(self, store: PopulationStore):
+        """
+        FitnessIndex constructor
+        Args:
+            store: PopulationStore instance, modified in place by the insertions
+        """
+        self.store = store
+        self._heap = [
+            (fitness_value, row)
+            for row, fitness_value in enumerate(store.fitness_values.tolist())
+        ]
+        heapq.heapify(self._heap)
+
+    def worst(self) -> Individual:
+        """Least fitted Individual instance of the store"""
+        return self.store.individuals[self._heap[0][1]]
+
+    def insert(self, individual: Individual) -> bool:
+        """
+        Replaces the least fitted individual of the store, unless it is fitter than
+        the one to insert
+        Args:
+            individual: Individual instance
+
+        Returns: True if the individual got in, False otherwise
+
+        """
+        fitness_value, row = self._heap[0]
+        if individual.fitness_value < fitness_value:
+            return False
+
+        heapq.heapreplace(self._heap, (individual.fitness_value, row))
+        self.store.replace(row, individual)
+        return True
+
 
 class Selection(object):
     """Dispatches the proper selection type for population instances"""
@@ -38,17 +182,21 @@ class Selection(object):
     def __init__(self, selection_type: SelectionType):
         self.__dispatch_selection(selection_type)
 
-    def __call__(self, generation: List[Individual]) -> List[Individual]:
+    def __call__(
+        self, generation: Union[List[Individual], PopulationStore], size: int = None
+    ) -> List[Individual]:
         """
         Performs a selection operation for the population
         Args:
-            generation: A list of Individual instances
+            generation: A list of Individual instances, or their PopulationStore
+            size: Optional, number of individuals to select (generation size plus
+                one by default)
 
         Returns: A list of Individual instances
 
         """
         LOG.debug("Selecting individuals...")
-        return self._select(generation)
+        return self._select(generation, size)
 
     def __dispatch_selection(self, selection_type: SelectionType) -> None:
         """
@@ -68,69 +216,87 @@ class Selection(object):
             self._select = self._binary_tournament
 
     @staticmethod
-    def _binary_tournament(generation: List[Individual]) -> List[Individual]:
+    def _binary_tournament(
+        generation: Union[List[Individual], PopulationStore], size: int = None
+    ) -> List[Individual]:
         """
         Selects members of the current generation into the mating pool in order to produce offspring by comparing pairs
         of Individuals and adding the best of each pair to the "mating pool" until its filled
 
         Args:
-            generation: A list of Individual instances
+            generation: A list of Individual instances, or their PopulationStore
+            size: Optional, mating pool size (generation size plus one by default)
 
         Returns: A list of Individual instances
 
         """
-        mating_pool = []
-
-        while len(mating_pool) <= len(generation):
-            i = random.randint(0, len(generation) - 1)
-            j = i
-
-            while j == i:
-                j = random.randint(0, len(generation) - 1)
-
-            i = generation[i]
-            j = generation[j]
+        store = (
+            generation
+            if isinstance(generation, PopulationStore)
+            else PopulationStore(generation)
+        )
+        mating_pool_size = size if size is not None else len(store) + 1
+        size = len(store)
 
-            if i.fitness_value >= j.fitness_value:
-                mating_pool.append(i)
-            else:
-                mating_pool.append(j)
+        # Pairs of different individuals (unless there is just one to choose)
+        i = np.random.randint(0, size, size=mating_pool_size)
+        j = (i + np.random.randint(1, max(size, 2), size=mating_pool_size)) % size
 
-        return mating_pool
+        winners = np.where(store.fitness_values[i] >= store.fitness_values[j], i, j)
+        return store.take(winners)
 
     @staticmethod
-    def _k_tournament(generation: List[Individual]) -> List[Individual]:
+    def _k_tournament(
+        generation: Union[List[Individual], PopulationStore], size: int = None
+    ) -> List[Individual]:
         """
-        Not implemented
+        Selects members of the current generation into the mating pool by drawing K_VALUE Individuals per slot of
+        the mating pool and adding the best of them. Every tournament is drawn at once, as a matrix of row positions
+        with one row per slot
+
         Args:
-            generation: A list of Individual instances
+            generation: A list of Individual instances, or their PopulationStore
+            size: Optional, mating pool size (generation size plus one by default)
 
-        Raises: NotImplementedError
         Returns: A list of Individual instances
 
         """
-        # TODO(me): k tournament
-        raise NotImplementedError
+        store = (
+            generation
+            if isinstance(generation, PopulationStore)
+            else PopulationStore(generation)
+        )
+        mating_pool_size = size if size is not None else len(store) + 1
+        k = max(Config().k_value, 1)
+
+        competitors = np.random.randint(0, len(store), size=(mating_pool_size, k))
+        best = np.argmax(store.fitness_values[competitors], axis=1)
+        winners = competitors[np.arange(mating_pool_size), best]
+        return store.take(winners)
 
 
 class Recombination(object):
     """Dispatches the proper recombination type for population instances"""
 
-    __slots__ = ("_recombine", "config", "grammar", "samples", "stats")
+    __slots__ = ("_recombine", "config", "context", "batch_fitness")
 
-    def __init__(self, grammar: Dict, samples: List[Doc], stats: Stats):
+    def __init__(self, context: EvaluationContext):
         self._recombine = None
         self.config = Config()
-        self.grammar = grammar
-        self.samples = samples
-        self.stats = stats
+        self.context = context
+        self.batch_fitness = (
+            BatchFitness(context) if self.config.batch_evaluation is True else None
+        )
         self.__dispatch_recombination_type()
 
     def __call__(
-        self, mating_pool: List[Individual], generation: List[Individual]
+        self,
+        mating_pool: List[Individual],
+        generation: List[Individual],
+        num_pairs: int = None,
     ) -> List[Individual]:
         LOG.debug(f"Combining individuals...")
-        return self._recombine(mating_pool, generation)
+        return self._recombine(mating_pool, generation, num_pairs)
 
     def __dispatch_recombination_type(self) -> None:
         """
@@ -142,51 +308,55 @@ class Recombination(object):
         self._recombine = self._random_one_point_crossover
 
     def _random_one_point_crossover(
-        self, mating_pool: List[Individual], generation: List[Individual]
+        self,
+        mating_pool: List[Individual],
+        generation: List[Individual],
+        num_pairs: int = None,
     ) -> List[Individual]:
         """
-        For each pair of Individual instances, recombines them produce two offsprings. Puts them all into the offspring
+        For each pair of Individual instances, recombines them produce two offsprings. Puts them all into the offspring.
+        Every pair gets its own cut point and the whole offspring is built and mutated at once over the stacked
+        genotypes. Pairs failing the mating probability would just be drawn again, so only mating pairs are drawn
         Args:
             mating_pool: A list of Individual instances
             generation: A list of Individual instances
+            num_pairs: Optional, number of pairs to recombine (enough to fill the
+                offspring max size by default)
 
         Returns: A list of Individual instances
 
         """
-        offspring = []
-        offspring_max_size = round(
-            len(generation) * self.config.offspring_max_size_factor
+        if num_pairs is None:
+            num_pairs = offspring_pairs(len(generation))
+
+        genotypes = PopulationStore(mating_pool).genotypes
+        parents = np.random.randint(0, len(genotypes), size=(num_pairs, 2))
+        cuts = (
+            np.random.randint(1, self.config.codon_length, size=(num_pairs, 1))
+            * self.config.num_codons_per_individual
         )
+        head = np.arange(genotypes.shape[1]) < cuts
+        parent_1 = genotypes[parents[:, 0]]
+        parent_2 = genotypes[parents[:, 1]]
+
+        # Create children, then mutate them all
+        children = np.empty((2 * num_pairs, genotypes.shape[1]), dtype=np.uint8)
+        children[0::2] = np.where(head, parent_1, parent_2)
+        children[1::2] = np.where(head, parent_2, parent_1)
+        children ^= np.random.random(children.shape) < self.config.mutation_probability
+
+        offspring = [
+            Individual(
+                self.context,
+                dna=child,
+                evaluate=self.batch_fitness is None,
+                mutate_dna=False,
+            )
+            for child in children
+        ]
 
-        while len(offspring) <= offspring_max_size:
-            parent_1 = random.choice(mating_pool)
-            parent_2 = random.choice(mating_pool)
-
-            if random.random() < self.config.mating_probability:
-                cut = (
-                    random.randint(1, self.config.codon_length - 1)
-                    * self.config.num_codons_per_individual
-                )
-
-                # Create children
-                child_1 = Individual(
-                    self.samples,
-                    self.grammar,
-                    self.stats,
-                    dna=parent_1.bin_genotype[:cut]
-                    + parent_2.bin_genotype[-(self.config.dna_length - cut) :],
-                )
-
-                child_2 = Individual(
-                    self.samples,
-                    self.grammar,
-                    self.stats,
-                    dna=parent_2.bin_genotype[:cut]
-                    + parent_1.bin_genotype[-(self.config.dna_length - cut) :],
-                )
-
-                offspring.append(child_1)
-                offspring.append(child_2)
+        if self.batch_fitness is not None:
+            self.batch_fitness(offspring)
 
         return offspring
 
@@ -219,6 +389,8 @@ class Replacement(object):
                 self._replace = self._mu_lambda_elite
             elif replacement_type == ReplacementType.MU_LAMBDA_WITHOUT_ELITISM:
                 self._replace = self._mu_lambda_no_elite
+            elif replacement_type == ReplacementType.STEADY_STATE:
+                self._replace = self._steady_state
             else:
                 self._replace = self._mu_plus_lambda
         else:
@@ -237,9 +409,8 @@ class Replacement(object):
         Returns: A tuple containing two list of Individual instances
 
         """
-        replacement_pool = generation + offspring
-        replacement_pool.sort(key=lambda i: i.fitness_value, reverse=True)
-        generation = replacement_pool[: len(generation)]
+        store = PopulationStore(generation + offspring)
+        generation = store.take(store.survivors(len(generation)))
         offspring = []
 
         return generation, offspring
@@ -257,9 +428,15 @@ class Replacement(object):
         Returns: A tuple containing two list of Individual instances
 
         """
-        generation.sort(key=lambda i: i.fitness_value, reverse=True)
-        offspring.sort(key=lambda i: i.fitness_value, reverse=True)
-        generation[1 : len(generation)] = offspring[0 : len(generation)]
+        elite = PopulationStore(generation)
+        store = PopulationStore(offspring)
+        generation = elite.take(elite.survivors(1)) + store.take(
+            store.survivors(len(generation) - 1)
+        )
+
+        # The most fitted individual leads the generation
+        store = PopulationStore(generation)
+        generation = store.take(store.survivors(len(generation)))
         offspring = []
 
         return generation, offspring
@@ -277,8 +454,33 @@ class Replacement(object):
         Returns: A tuple containing two list of Individual instances
 
         """
-        offspring.sort(key=lambda i: i.fitness_value, reverse=True)
-        generation = offspring[0 : len(generation)]
+        store = PopulationStore(offspring)
+        generation = store.take(store.survivors(len(generation)))
+        offspring = []
+
+        return generation, offspring
+
+    @staticmethod
+    def _steady_state(
+        generation: List[Individual], offspring: List[Individual]
+    ) -> Tuple[List[Individual], List[Individual]]:
+        """
+        Produces the next generation inserting the offspring one at a time, each
+        child replacing the least fitted individual (if not fitter than the child)
+        Args:
+            generation: A list of Individual instances
+            offspring: A list of Individual instances
+
+        Returns: A tuple containing two list of Individual instances
+
+        """
+        store = PopulationStore(list(generation))
+        index = FitnessIndex(store)
+        for child in offspring:
+            index.insert(child)
+
+        # The most fitted individual leads the generation
+        generation = store.take(store.survivors(len(store)))
         offspring = []
 
         return generation, offspring
@@ -289,61 +491,318 @@ class Population(object):
 
     __slots__ = (
         "config",
-        "samples",
-        "grammar",
-        "stats",
+        "context",
         "generation",
         "offspring",
         "best_individual",
+        "best_generation",
+        "best_evaluations",
+        "generations",
+        "stagnant_generations",
+        "deadline",
+        "checkpointer",
         "selection",
         "recombination",
         "replacement",
     )
 
-    def __init__(self, samples: [Doc], grammar: dict, stats: Stats):
+    def __init__(
+        self,
+        samples: [Doc],
+        grammar: Union[dict, CompiledGrammar],
+        stats: Stats,
+        fitness_cache: FitnessCache = None,
+        sample_matrix: SampleMatrix = None,
+        sample_index: SampleIndex = None,
+        weights: List[int] = None,
+        decode_cache: DecodeCache = None,
+        fitness_executor: FitnessExecutor = None,
+        deadline: float = None,
+        checkpointer: Checkpointer = None,
+        state: dict = None,
+        seeds: List[np.ndarray] = None,
+    ):
         """
         Population constructor, initializes a list of Individual objects
         Args:
             samples: list of Spacy doc objets
-            grammar: Backus Naur Form grammar notation encoded in a dictionary
+            grammar: Backus Naur Form grammar notation encoded in a dictionary (compiled
+                here once for every Individual) or its CompiledGrammar
+            stats: statistics object related with this execution
+            fitness_cache: Optional, fitness values memoized across populations
+            sample_matrix: Optional, samples already encoded for the matrix fitness
+                engine (built here if that engine is configured)
+            sample_index: Optional, positional inverted index of the samples (built
+                here if the index engine and the full match fitness are configured)
+            weights: Optional, number of duplicated samples each sample stands for
+            decode_cache: Optional, derivations memoized across populations sharing
+                the same grammar
+            fitness_executor: Optional, pool of worker processes scoring batches of
+                fenotypes (batch evaluation only)
+            deadline: Optional, time (seconds since the epoch) the evolution must
+                stop at, checked between generations
+            checkpointer: Optional, Checkpointer instance saving the population state
+                every few generations
+            state: Optional, population state built by Population.state to resume
+                the evolution from, instead of a new generation
+            seeds: Optional, genotypes (arrays of bits) the new generation starts
+                with, as found at a PatternLibrary, the rest of it is random
         """
         self.config = Config()
 
-        self.samples = samples
-        self.grammar = grammar
-        self.stats = stats
-        self.generation = self._genesis()
+        if fitness_cache is None:
+            fitness_cache = FitnessCache(stats, self.config.fitness_cache_size)
+        if sample_matrix is None and self.config.fitness_engine == FitnessEngine.MATRIX:
+            sample_matrix = SampleMatrix(samples)
+        if (
+            sample_index is None
+            and self.config.fitness_engine == FitnessEngine.INDEX
+            and self.config.fitness_function_type == FitnessType.FULL_MATCH
+        ):
+            sample_index = SampleIndex(samples)
+        if decode_cache is None:
+            decode_cache = DecodeCache(stats, self.config.decode_cache_size)
+
+        self.context = EvaluationContext(
+            samples,
+            grammar,
+            stats,
+            fitness_cache,
+            sample_matrix,
+            sample_index,
+            weights,
+            decode_cache,
+            fitness_executor,
+        )
+        self.generation = self._genesis(seeds) if state is None else list()
         self.offspring = list()
         self.best_individual = None
+        self.best_generation = 0
+        self.best_evaluations = 0
+        self.generations = 0
+        self.stagnant_generations = 0
+        self.deadline = deadline
+        self.checkpointer = checkpointer
 
         self.selection = Selection(self.config.selection_type)
-        self.recombination = Recombination(grammar, samples, stats)
+        self.recombination = Recombination(self.context)
         self.replacement = Replacement(self.config.replacement_type)
 
+        if state is not None:
+            self._restore(state)
+
     #
     # Population specific methods
     #
-    def _genesis(self) -> List[Individual]:
+    def _genesis(self, seeds: List[np.ndarray] = None) -> List[Individual]:
         """
         Initializes the first generation
+        Args:
+            seeds: Optional, genotypes taken as they are, random ones fill the rest
+                of the generation
+
         Returns: A list of individual objects
 
         """
-        return [
-            Individual(self.samples, self.grammar, self.stats)
-            for _ in range(0, self.config.dna_length)
+        batch_evaluation = self.config.batch_evaluation is True
+        seeds = seeds[: self.config.population_size] if seeds is not None else list()
+        generation = [
+            Individual(
+                self.context, dna=seed, evaluate=not batch_evaluation, mutate_dna=False
+            )
+            for seed in seeds
+        ] + [
+            Individual(self.context, evaluate=not batch_evaluation)
+            for _ in range(len(seeds), self.config.population_size)
         ]
 
+        if batch_evaluation:
+            BatchFitness(self.context)(generation)
+
+        return generation
+
     def _best_challenge(self) -> None:
         """
         Compares current generation best fitness individual against previous generation best fitness individual.
-        Updates the best individual attribute accordingly
+        Updates the best individual attribute accordingly, restarting the count of
+        generations with no improvement
         """
-        if self.best_individual is not None:
-            if self.generation[0].fitness_value > self.best_individual.fitness_value:
-                self.best_individual = self.generation[0]
-        else:
+        if (
+            self.best_individual is None
+            or self.generation[0].fitness_value > self.best_individual.fitness_value
+        ):
             self.best_individual = self.generation[0]
+            self.best_generation = self.generations
+            self.best_evaluations = self.context.stats.evaluations_counter
+            self.stagnant_generations = 0
+
+    def best_record(self) -> PatternRecord:
+        """
+        Record of the best individual, holding none of the population state. Runs
+        stopping before evolving any generation take the most fitted individual of
+        the genesis as the best one
+        Returns: PatternRecord instance
+
+        """
+        if self.best_individual is None:
+            self.best_individual = max(self.generation, key=lambda i: i.fitness_value)
+            self.best_evaluations = self.context.stats.evaluations_counter
+
+        return PatternRecord.from_individual(
+            self.best_individual,
+            generation=self.best_generation,
+            evaluations=self.best_evaluations,
+        )
+
+    def state(self) -> dict:
+        """
+        Snapshot of the evolution, the genotypes packed 8 bits a byte
+        Returns: dict, as taken by the constructor to resume the evolution
+
+        """
+        store = PopulationStore(self.generation)
+        return {
+            "dna_length": store.genotypes.shape[1],
+            "genotypes": np.packbits(store.genotypes, axis=1),
+            "fitness_values": store.fitness_values,
+            "best_genotype": np.packbits(self.best_individual.genotype),
+            "best_fitness_value": self.best_individual.fitness_value,
+            "best_generation": self.best_generation,
+            "best_evaluations": self.best_evaluations,
+            "generations": self.generations,
+            "stagnant_generations": self.stagnant_generations,
+        }
+
+    def _restore(self, state: dict) -> None:
+        """
+        Resumes the evolution from a snapshot, no individual is scored again
+        Args:
+            state: dict built by Population.state
+
+        Returns: None
+
+        """
+        dna_length = state["dna_length"]
+        genotypes = np.unpackbits(state["genotypes"], axis=1, count=dna_length)
+
+        self.generation = [
+            self._revive(genotype, fitness_value)
+            for genotype, fitness_value in zip(genotypes, state["fitness_values"])
+        ]
+        self.best_individual = self._revive(
+            np.unpackbits(state["best_genotype"], count=dna_length),
+            state["best_fitness_value"],
+        )
+        self.best_generation = state["best_generation"]
+        self.best_evaluations = state["best_evaluations"]
+        self.generations = state["generations"]
+        self.stagnant_generations = state["stagnant_generations"]
+
+    def _revive(self, genotype: np.ndarray, fitness_value: float) -> Individual:
+        """
+        Decodes again an individual whose fitness value is already known
+        Args:
+            genotype: Array of bits
+            fitness_value: Fitness value
+
+        Returns: Individual instance
+
+        """
+        individual = Individual(
+            self.context, dna=genotype, evaluate=False, mutate_dna=False
+        )
+        individual.fitness_value = float(fitness_value)
+        return individual
+
+    def carry_over(self, context: EvaluationContext, delta: EvaluationContext) -> None:
+        """
+        Moves the current generation to the context of a grown set of samples, decoded
+        with the grammar extended for them, so the evolution goes on from it rather
+        than from a new generation. Individuals still decoding to the same pattern are
+        scored against the new samples alone, their fitness value being the weighted
+        mean of both scores, the rest of them against every sample
+        Args:
+            context: EvaluationContext of every sample, the grammar extended, whose
+                caches hold no fitness value scored against fewer samples
+            delta: EvaluationContext of just the new samples
+
+        Returns: None
+
+        """
+        old_weight = _total_weight(self.context)
+        delta_weight = _total_weight(delta)
+
+        moved = [
+            Individual(context, dna=i.genotype, evaluate=False, mutate_dna=False)
+            for i in self.generation
+        ]
+        kept = [
+            (individual, previous.fitness_value)
+            for individual, previous in zip(moved, self.generation)
+            if canonical_fenotype(individual.fenotype)
+            == canonical_fenotype(previous.fenotype)
+        ]
+
+        delta_values = BatchFitness(delta).score([i.fenotype for i, _ in kept])
+        for (individual, fitness_value), delta_value in zip(kept, delta_values):
+            # The wildcard penalty is the same for both scores, so the mean keeps it
+            individual.fitness_value = (
+                fitness_value * old_weight + delta_value * delta_weight
+            ) / (old_weight + delta_weight)
+            if context.fitness_cache is not None:
+                context.fitness_cache.put(
+                    FitnessCache.key(context.config, individual.fenotype),
+                    individual.fitness_value,
+                )
+        BatchFitness(context)(moved)
+
+        LOG.info(
+            f"Carried over {len(moved)} individuals, {len(kept)} of them scored "
+            f"against the new samples alone"
+        )
+
+        self.context = context
+        self.recombination = Recombination(context)
+
+        # The most fitted individual leads the generation
+        store = PopulationStore(moved)
+        self.generation = store.take(store.survivors(len(store)))
+        self.offspring = list()
+        self.best_individual = None
+        self.generations = 0
+        self.stagnant_generations = 0
+        self._best_challenge()
+
+    def stop_reason(self) -> Optional[StopReason]:
+        """
+        Checks the configured stopping criteria against the current state of the run
+        Returns: The stopping criterion met, if any, None otherwise
+
+        """
+        config = self.config
+
+        # Genesis has no best individual yet, just its most fitted one
+        best_fitness_value = (
+            self.best_individual.fitness_value
+            if self.best_individual is not None
+            else max(i.fitness_value for i in self.generation)
+        )
+
+        if (
+            config.stop_on_success is True
+            and best_fitness_value >= config.success_threshold
+        ):
+            return StopReason.SUCCESS
+        if 0 < config.stagnation_generations <= self.stagnant_generations:
+            return StopReason.STAGNATION
+        if 0 < config.max_evaluations <= self.context.stats.evaluations_counter:
+            return StopReason.MAX_EVALUATIONS
+        if self.deadline is not None and time() >= self.deadline:
+            return StopReason.TIME_BUDGET
+        # Every run evolves a generation at least
+        if 0 < self.generations and self.generations >= config.max_generations:
+            return StopReason.MAX_GENERATIONS
+        return None
 
     #
     # Evolution
@@ -355,28 +814,488 @@ class Population(object):
             2) Crossover or recombination of the previously selected individuals
             3) Replace/mix the this generation with the offspring
             4) Save the best individual by fitness
-            5) Calculate statistics for this Run
+            5) Stop as soon as a stopping criterion is met
+            6) Calculate statistics for this Run
         """
 
         LOG.info("Evolution taking place, please wait...")
 
-        self.stats.reset()
+        stats = self.context.stats
+        # Resumed evolutions go on with their checkpointed counters
+        if self.generations == 0:
+            stats.reset()
+            stats.sum_evaluations(len(self.generation))
+
+        # Genesis may already meet the success threshold or use up a budget
+        stop_reason = self.stop_reason()
+        while stop_reason is None:
+            self.step()
+            stop_reason = self.stop_reason()
+            if stop_reason is None and self.checkpointer is not None:
+                self.checkpointer.generation(self)
+        best_record = self.best_record()
+
+        LOG.info(
+            f"Best candidate found on this run after {self.generations} generations "
+            f"({stop_reason!r}): {self.best_individual}"
+        )
+
+        # Stats concerns
+        _account_run(stats, best_record, stop_reason, self.generations)
 
-        for _ in range(self.config.max_generations):
+    def step(self) -> None:
+        """
+        Evolves a single generation: selection, recombination and replacement
+        Returns: None
+
+        """
+        if self.config.replacement_type == ReplacementType.STEADY_STATE:
+            self._steady_state_step()
+        else:
             mating_pool = self.selection(self.generation)
             self.offspring = self.recombination(mating_pool, self.generation)
             self.generation, self.offspring = self.replacement(
                 self.generation, self.offspring
             )
-            self._best_challenge()
+        self.generations += 1
+        self.stagnant_generations += 1
+        self._best_challenge()
+
+    def _steady_state_step(self) -> None:
+        """
+        Evolves a single generation the steady state way: as many children as the
+        generational offspring, though every pair is selected out of, scored and
+        inserted into the current generation before the next pair is born
+        Returns: None
+
+        """
+        store = PopulationStore(list(self.generation))
+        index = FitnessIndex(store)
+
+        for _ in range(offspring_pairs(len(store))):
+            parents = self.selection(store, 2)
+            for child in self.recombination(parents, self.generation, 1):
+                index.insert(child)
+
+        # The most fitted individual leads the generation
+        self.generation = store.take(store.survivors(len(store)))
+        self.offspring = list()
+
+    #
+    # Migration
+    #
+    def emigrants(self, size: int) -> np.ndarray:
+        """
+        Genotypes of the most fitted individuals of the current generation
+        Args:
+            size: Number of individuals to send away
+
+        Returns: 2-D array of bits, one row per individual
+
+        """
+        store = PopulationStore(self.generation)
+        return store.genotypes[store.survivors(size)]
+
+    def immigrate(self, genotypes: np.ndarray) -> None:
+        """
+        Replaces the least fitted individuals of the current generation with the
+        individuals coming from another island
+        Args:
+            genotypes: 2-D array of bits, one row per individual
+
+        Returns: None
+
+        """
+        batch_evaluation = self.config.batch_evaluation is True
+        immigrants = [
+            Individual(
+                self.context,
+                dna=genotype,
+                evaluate=not batch_evaluation,
+                mutate_dna=False,
+            )
+            for genotype in genotypes
+        ]
+
+        if batch_evaluation:
+            BatchFitness(self.context)(immigrants)
+
+        size = len(self.generation)
+        store = PopulationStore(self.generation)
+        natives = store.take(store.survivors(size - len(immigrants)))
+
+        # The most fitted individual leads the generation
+        store = PopulationStore(natives + immigrants)
+        self.generation = store.take(store.survivors(size))
+        self._best_challenge()
+
+
+class IslandModel(object):
+    """
+    Island model of an AI Grammatical Evolution algorithm. Several populations evolve
+    at their own process and, every few generations, send their best individuals to
+    their neighbour islands through queues
+    """
+
+    __slots__ = (
+        "config",
+        "samples",
+        "grammar",
+        "stats",
+        "weights",
+        "deadline",
+        "best_record",
+    )
 
-        LOG.info(f"Best candidate found on this run: {self.best_individual}")
+    def __init__(
+        self,
+        samples: List[Doc],
+        grammar: Union[dict, CompiledGrammar],
+        stats: Stats,
+        weights: List[int] = None,
+        deadline: float = None,
+    ):
+        """
+        IslandModel constructor
+        Args:
+            samples: list of Spacy doc objets
+            grammar: Backus Naur Form grammar notation encoded in a dictionary or
+                its CompiledGrammar
+            stats: statistics object related with this execution
+            weights: Optional, number of duplicated samples each sample stands for
+            deadline: Optional, time (seconds since the epoch) every island must stop
+                evolving at
+        """
+        self.config = Config()
+
+        self.samples = samples
+        self.grammar = compile_grammar(grammar).grammar
+        self.stats = stats
+        self.weights = weights
+        self.deadline = deadline
+        self.best_record = None
+
+    def evolve(self):
+        """
+        Evolves every island at its own process, gathering the best individual and
+        the counters of all of them into this run stats
+        """
+        LOG.info(f"Evolution taking place at {self.config.islands} islands...")
+
+        self.stats.reset()
+
+        num_islands = self.config.islands
+        inboxes = [Queue() for _ in range(num_islands)]
+        results = Queue()
+        stopped = Array("b", num_islands)
+        barrier = Barrier(num_islands)
+        seeds = np.random.randint(0, 2**32, size=num_islands, dtype=np.uint64)
+        packed_samples = pack_samples(self.samples)
+
+        islands = [
+            Process(
+                target=_island,
+                args=(
+                    island,
+                    packed_samples,
+                    self.grammar,
+                    self.weights,
+                    self.deadline,
+                    self.config.__dict__,
+                    int(seeds[island]),
+                    inboxes,
+                    stopped,
+                    barrier,
+                    results,
+                ),
+            )
+            for island in range(num_islands)
+        ]
+        for island in islands:
+            island.start()
+
+        try:
+            island_results = sorted(_island_results(islands, results))
+        except BaseException:
+            for island in islands:
+                if island.is_alive():
+                    island.terminate()
+            raise
+        finally:
+            for island in islands:
+                island.join()
+
+        stop_reason = None
+        generations = 0
+        for (
+            _,
+            best_record,
+            island_stats,
+            island_stop,
+            island_generations,
+        ) in island_results:
+            self.stats.sum_aes(island_stats.aes_counter)
+            self.stats.sum_cache_hits(island_stats.cache_hits)
+            self.stats.sum_cache_misses(island_stats.cache_misses)
+            self.stats.sum_cache_evictions(island_stats.cache_evictions)
+            self.stats.sum_short_circuits(island_stats.short_circuits)
+            self.stats.sum_evaluations(island_stats.evaluations_counter)
+            generations = max(generations, island_generations)
+            if (
+                self.best_record is None
+                or best_record.fitness_value > self.best_record.fitness_value
+            ):
+                self.best_record = best_record
+                stop_reason = island_stop
+
+        LOG.info(
+            f"Best candidate found on this run after {generations} generations "
+            f"({stop_reason!r}): {self.best_record}"
+        )
 
         # Stats concerns
-        self.stats.add_most_fitted(self.best_individual)
-        self.stats.add_mbf(self.best_individual.fitness_value)
+        _account_run(self.stats, self.best_record, stop_reason, generations)
 
-        if self.best_individual.fitness_value > self.config.success_threshold:
-            self.stats.add_sr(True)
-        else:
-            self.stats.add_sr(False)
+
+def _island_results(islands: List[Process], results: Queue) -> List[tuple]:
+    """
+    Gathers the result of every island process, failing as soon as any island does
+    Args:
+        islands: Island processes
+        results: Queue where the islands leave their results
+
+    Returns: List of island results, as left by _island but the error
+
+    Raises: RuntimeError if an island failed or its process died
+
+    """
+    island_results = list()
+    while len(island_results) < len(islands):
+        try:
+            island, error, *result = results.get(timeout=ISLAND_POLL_INTERVAL)
+        except Empty:
+            for island, process in enumerate(islands):
+                if not process.is_alive() and process.exitcode != 0:
+                    raise RuntimeError(
+                        f"Island {island} died with exit code {process.exitcode}"
+                    )
+            if not any(process.is_alive() for process in islands) and results.empty():
+                raise RuntimeError("Islands quit with no result")
+            continue
+
+        if error is not None:
+            raise RuntimeError(f"Island {island} failed: {error}")
+        island_results.append((island, *result))
+
+    return island_results
+
+
+def _total_weight(context: EvaluationContext) -> int:
+    """
+    Number of samples an evaluation context stands for, duplicates included
+    Args:
+        context: EvaluationContext instance
+
+    Returns: Integer
+
+    """
+    if context.weights is None:
+        return len(context.samples)
+    return sum(context.weights)
+
+
+def offspring_pairs(generation_size: int) -> int:
+    """
+    Number of pairs of children a generation breeds, enough to fill the offspring
+    max size
+    Args:
+        generation_size: Number of individuals of the generation
+
+    Returns: Integer
+
+    """
+    offspring_max_size = round(generation_size * Config().offspring_max_size_factor)
+    return offspring_max_size // 2 + 1
+
+
+def migration_targets(island: int, num_islands: int) -> List[int]:
+    """
+    Islands receiving the migrants of an island under the configured topology
+    Args:
+        island: Island position
+        num_islands: Number of islands
+
+    Returns: List of island positions
+
+    """
+    if Config().migration_topology == MigrationTopology.ALL_TO_ALL:
+        return [target for target in range(num_islands) if target != island]
+    return [(island + 1) % num_islands]
+
+
+def migration_sources(island: int, num_islands: int) -> List[int]:
+    """
+    Islands sending their migrants to an island under the configured topology
+    Args:
+        island: Island position
+        num_islands: Number of islands
+
+    Returns: List of island positions
+
+    """
+    if Config().migration_topology == MigrationTopology.ALL_TO_ALL:
+        return [source for source in range(num_islands) if source != island]
+    return [(island - 1) % num_islands]
+
+
+def island_types(island: int) -> dict:
+    """
+    Selection and replacement types of an island, as given by the per island
+    configuration parameters
+    Args:
+        island: Island position
+
+    Returns: dict of configuration parameters and values to override
+
+    """
+    config = Config()
+    overrides = dict()
+
+    for option, enum_type, types in (
+        ("selection_type", SelectionType, config.island_selection_types),
+        ("replacement_type", ReplacementType, config.island_replacement_types),
+    ):
+        values = [value.strip() for value in types.split(",") if value.strip()]
+        if len(values) > 0:
+            try:
+                overrides[option] = enum_type(int(values[island % len(values)]))
+            except ValueError:
+                LOG.warning(f"Wrong {option} {types} for island {island}. Skipping")
+
+    return overrides
+
+
+def _island(
+    island: int,
+    packed_samples: tuple,
+    grammar: dict,
+    weights: List[int],
+    deadline: Optional[float],
+    options: dict,
+    seed: int,
+    inboxes: List[Queue],
+    stopped: Array,
+    barrier: Barrier,
+    results: Queue,
+) -> None:
+    """
+    Evolves an island population at its own process. Once a stopping criterion is
+    met the island stops evolving, though it keeps exchanging migrants so the other
+    islands never wait for it. Every island quits at the first migration all of
+    them have stopped by
+    Args:
+        island: Island position
+        packed_samples: Samples serialized by pack_samples
+        grammar: Backus Naur Form grammar notation encoded in a dictionary
+        weights: Number of duplicated samples each sample stands for
+        deadline: Time (seconds since the epoch) to stop evolving at, if any
+        options: Configuration parameters of the parent process
+        seed: Seed of the island random number stream
+        inboxes: Queue of migrants of every island
+        stopped: Shared flags of the islands that already stopped evolving
+        barrier: Barrier every island waits at to agree on quitting
+        results: Queue where the island leaves the record of its best individual,
+            stats, stop reason and number of generations evolved, or the error it
+            failed with
+
+    Returns: None
+
+    """
+    try:
+        config = restore_config(options)
+        for option, value in island_types(island).items():
+            setattr(config, option, value)
+        np.random.seed(seed)
+
+        num_islands = config.islands
+        targets = migration_targets(island, num_islands)
+        sources = migration_sources(island, num_islands)
+
+        stats = Stats()
+        population = Population(
+            unpack_samples(packed_samples),
+            grammar,
+            stats,
+            weights=weights,
+            deadline=deadline,
+        )
+        stats.reset()
+        stats.sum_evaluations(len(population.generation))
+
+        stop_reason = population.stop_reason()
+        for generation in range(1, config.max_generations + 1):
+            if stop_reason is None:
+                population.step()
+                stop_reason = population.stop_reason()
+
+            if (
+                generation % config.migration_interval == 0
+                and generation < config.max_generations
+            ):
+                # Every island reads the flags between both barriers, same decision
+                stopped[island] = stop_reason is not None
+                barrier.wait()
+                all_stopped = all(stopped)
+                barrier.wait()
+                if all_stopped:
+                    break
+
+                emigrants = population.emigrants(config.migrants)
+                for target in targets:
+                    inboxes[target].put((island, emigrants))
+
+                # Sorted by source, so migrations do not depend on process scheduling
+                for _, immigrants in sorted(inboxes[island].get() for _ in sources):
+                    population.immigrate(immigrants)
+
+        results.put(
+            (
+                island,
+                None,
+                population.best_record(),
+                stats,
+                stop_reason,
+                population.generations,
+            )
+        )
+    except BrokenBarrierError:
+        # Some other island failed, it is the one reporting why
+        return
+    except BaseException as ex:
+        results.put((island, repr(ex), None, None, None, 0))
+        # The other islands must not wait for this one at the barrier any longer
+        barrier.abort()
+
+
+def _account_run(
+    stats: Stats, best_record: PatternRecord, stop_reason: StopReason, generations: int
+) -> None:
+    """
+    Accounts the best individual of a run at the stats instance
+    Args:
+        stats: Stats instance
+        best_record: Record of the most fitted individual found over the run
+        stop_reason: Stopping criterion that ended the run
+        generations: Number of generations the run evolved
+
+    Returns: None
+
+    """
+    stats.add_most_fitted(best_record.replace(run=len(stats.mbf_accumulator)))
+    stats.add_stop(stop_reason, generations)
+    stats.add_mbf(best_record.fitness_value)
+
+    if best_record.fitness_value > Config().success_threshold:
+        stats.add_sr(True)
+    else:
+        stats.add_sr(False)
@@ -0,0 +1,211 @@
+""" Result records module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import heapq
+from copy import deepcopy
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+
+class PatternRecord(object):
+    """
+    Immutable outcome of a run: the best pattern found along with where and when it
+    was found. Unlike an Individual, it holds no reference to the samples, the grammar
+    or any other execution state, so it is cheap to keep and to ship across processes
+    """
+
+    __slots__ = (
+        "fenotype",
+        "fitness_value",
+        "genotype",
+        "run",
+        "generation",
+        "evaluations",
+    )
+
+    def __init__(
+        self,
+        fenotype: List[dict],
+        fitness_value: float,
+        genotype: bytes,
+        run: int = 0,
+        generation: int = 0,
+        evaluations: int = 0,
+    ):
+        """
+        PatternRecord constructor
+        Args:
+            fenotype: Spacy's Rule Based Matcher pattern, copied so the record never
+                shares it with the individual or the caches it was decoded at
+            fitness_value: Fitness value of the pattern
+            genotype: Bits of the genotype, one byte each
+            run: Optional, position of the run the pattern was found at
+            generation: Optional, generation the pattern became the best of its run
+            evaluations: Optional, fitness evaluations spent by the run until then
+        """
+        object.__setattr__(self, "fenotype", deepcopy(fenotype))
+        object.__setattr__(self, "fitness_value", fitness_value)
+        object.__setattr__(self, "genotype", bytes(genotype))
+        object.__setattr__(self, "run", run)
+        object.__setattr__(self, "generation", generation)
+        object.__setattr__(self, "evaluations", evaluations)
+
+    @classmethod
+    def from_individual(
+        cls, individual: any, run: int = 0, generation: int = 0, evaluations: int = 0
+    ) -> "PatternRecord":
+        """
+        Builds the record of an Individual instance
+        Args:
+            individual: Individual instance
+            run: Optional, position of the run the individual was found at
+            generation: Optional, generation the individual became the best of its run
+            evaluations: Optional, fitness evaluations spent by the run until then
+
+        Returns: PatternRecord instance
+
+        """
+        return cls(
+            individual.fenotype,
+            individual.fitness_value,
+            individual.genotype.tobytes(),
+            run,
+            generation,
+            evaluations,
+        )
+
+    def __setattr__(self, key, value) -> None:
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PatternRecord) and all(
+            getattr(self, s) == getattr(other, s) for s in self.__slots__
+        )
+
+    @property
+    def __dict__(self):
+        """Dictionary representation for a slotted class (that has no dict at all)"""
+        # Above works just for POPOs
+        return {
+            "bin_genotype": self.bin_genotype,
+            "fenotype": self.fenotype,
+            "fitness_value": self.fitness_value,
+            "run": self.run,
+            "generation": self.generation,
+            "evaluations": self.evaluations,
+        }
+
+    def __repr__(self):
+        """String representation of a slotted class using hijacked dict"""
+        return f"{self.__class__.__name__}({self.__dict__})"
+
+    def __getstate__(self):
+        """Pickling state, the hijacked dict is just a representation"""
+        return {s: getattr(self, s) for s in self.__slots__}
+
+    def __setstate__(self, state):
+        """Restores a pickled PatternRecord instance"""
+        for s, value in state.items():
+            object.__setattr__(self, s, value)
+
+    @property
+    def dna(self) -> np.ndarray:
+        """Genotype as an array of bits, as Individual instances hold it"""
+        return np.frombuffer(self.genotype, dtype=np.uint8)
+
+    @property
+    def bin_genotype(self) -> str:
+        """Binary string view of the genotype, for representation purposes"""
+        return (self.dna + ord("0")).tobytes().decode()
+
+    def replace(self, **changes) -> "PatternRecord":
+        """
+        Copies the record with some of its fields changed
+        Args:
+            **changes: New values by field name
+
+        Returns: PatternRecord instance
+
+        """
+        return PatternRecord(**{**self.__getstate__(), **changes})
+
+
+class HallOfFame(object):
+    """
+    Bounded collection of the most fitted PatternRecord instances. A min-heap keeps
+    the least fitted record on top, so both inserting and dropping it take O(log n).
+    Among equally fitted records, the earliest inserted ones are kept
+    """
+
+    __slots__ = ("max_size", "_heap", "_inserted")
+
+    def __init__(self, max_size: int = 0):
+        """
+        HallOfFame constructor
+        Args:
+            max_size: Optional, maximum number of records to keep, 0 or less keeps
+                them all
+        """
+        self.max_size = max_size
+        self._heap = list()
+        self._inserted = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[PatternRecord]:
+        """Records from the most to the least fitted"""
+        yield from (record for _, _, record in sorted(self._heap, reverse=True))
+
+    def insert(self, record: PatternRecord) -> bool:
+        """
+        Inserts a record, dropping the least fitted one if full
+        Args:
+            record: PatternRecord instance
+
+        Returns: False if the record was not fitted enough to get in, True otherwise
+
+        """
+        # Later insertions sort lower, so they are the first ones dropped on ties
+        entry = (record.fitness_value, -self._inserted, record)
+        self._inserted += 1
+
+        if self.max_size <= 0 or len(self._heap) < self.max_size:
+            heapq.heappush(self._heap, entry)
+            return True
+
+        return heapq.heappushpop(self._heap, entry) is not entry
+
+    def best(self) -> Optional[PatternRecord]:
+        """
+        Most fitted record
+        Returns: PatternRecord instance, None if there is none
+
+        """
+        return max(self._heap)[2] if len(self._heap) > 0 else None
+
+    def records(self) -> List[PatternRecord]:
+        """
+        Every record kept
+        Returns: List of PatternRecord instances, from the most to the least fitted
+
+        """
+        return list(self)
@@ -18,11 +18,11 @@ You should have received a copy of the GNU Lesser General Public License
 along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
-import operator
 from time import time
 
+from patternomatic.ge.records import HallOfFame, PatternRecord
 from patternomatic.settings.config import Config
-from patternomatic.settings.literals import ReportFormat
+from patternomatic.settings.literals import ReportFormat, StopReason
 
 
 class Stats(object):
@@ -34,13 +34,23 @@ class Stats(object):
         "mbf_accumulator",
         "aes_accumulator",
         "time_accumulator",
-        "most_fitted_accumulator",
+        "hall_of_fame",
+        "stop_reason_accumulator",
+        "generations_accumulator",
         "solution_found",
         "success_rate",
         "mbf",
         "aes",
         "mean_time",
+        "mean_generations",
+        "stop_reasons",
+        "phase_times",
         "aes_counter",
+        "evaluations_counter",
+        "cache_hits",
+        "cache_misses",
+        "cache_evictions",
+        "short_circuits",
     ]
 
     def __init__(self):
@@ -50,14 +60,24 @@ class Stats(object):
         self.mbf_accumulator = list()
         self.aes_accumulator = list()
         self.time_accumulator = list()
-        self.most_fitted_accumulator = list()
+        self.hall_of_fame = HallOfFame(self.config.hall_of_fame_size)
+        self.stop_reason_accumulator = list()
+        self.generations_accumulator = list()
         self.solution_found = False
         self.success_rate = None
         self.mbf = None
         self.aes = None
         self.mean_time = None
+        self.mean_generations = None
+        self.stop_reasons = None
+        self.phase_times = dict()
 
         self.aes_counter = 0
+        self.evaluations_counter = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.short_circuits = 0
 
     @property
     def __dict__(self):
@@ -66,7 +86,16 @@ class Stats(object):
         stats_dict = {
             s: getattr(self, s, None)
             for s in self.__slots__
-            if s in ("success_rate", "mbf", "aes", "mean_time")
+            if s
+            in (
+                "success_rate",
+                "mbf",
+                "aes",
+                "mean_time",
+                "mean_generations",
+                "stop_reasons",
+                "phase_times",
+            )
         }
 
         most_fitted = self.get_most_fitted()
@@ -87,6 +116,16 @@ class Stats(object):
         """Enable dict(self)"""
         yield from self.__dict__.items()
 
+    def __getstate__(self):
+        """Pickling state, the Config instance stays at each process"""
+        return {s: getattr(self, s) for s in self.__slots__ if s != "config"}
+
+    def __setstate__(self, state):
+        """Restores a pickled Stats instance under this process Config instance"""
+        self.config = Config()
+        for s, value in state.items():
+            setattr(self, s, value)
+
     #
     # Accumulators & Counters
     #
@@ -126,16 +165,37 @@ class Stats(object):
         """
         self.time_accumulator.append(time_interval)
 
-    def add_most_fitted(self, individual: any) -> None:
+    def add_most_fitted(self, record: PatternRecord) -> None:
         """
-        Adds a new individual to the accumulator
+        Adds a new record to the hall of fame
         Args:
-            individual: Individual with best fitness found over a RUN
+            record: Record of the individual with best fitness found over a RUN
 
         Returns:
 
         """
-        self.most_fitted_accumulator.append(individual)
+        self.hall_of_fame.insert(record)
+
+    def add_stop(self, stop_reason: StopReason, generations: int) -> None:
+        """
+        Adds why a RUN stopped and the generation it reached to the accumulators
+        Args:
+            stop_reason: Stopping criterion that ended the RUN
+            generations: Number of generations the RUN evolved
+
+        """
+        self.stop_reason_accumulator.append(stop_reason)
+        self.generations_accumulator.append(generations)
+
+    def add_phase_time(self, phase: str, time_interval: float) -> None:
+        """
+        Adds the time lapsed by an execution phase
+        Args:
+            phase: Name of the phase, such as docs, grammar or evolution
+            time_interval: Time lapsed of the phase
+
+        """
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time_interval
 
     def sum_aes(self, es: int) -> None:
         """
@@ -148,21 +208,103 @@ class Stats(object):
         """
         self.aes_counter += es
 
+    def sum_evaluations(self, evaluations: int) -> None:
+        """
+        Sums fitness evaluations to the counter, those after a solution was found too
+        Args:
+            evaluations: Number of individuals evaluated over a given Run
+
+        """
+        self.evaluations_counter += evaluations
+
+    def sum_cache_hits(self, hits: int) -> None:
+        """
+        Sums fitness cache hits to the counter
+        Args:
+            hits: Number of fitness values served by the fitness cache
+
+        """
+        self.cache_hits += hits
+
+    def sum_cache_misses(self, misses: int) -> None:
+        """
+        Sums fitness cache misses to the counter
+        Args:
+            misses: Number of fitness values not found at the fitness cache
+
+        """
+        self.cache_misses += misses
+
+    def sum_cache_evictions(self, evictions: int) -> None:
+        """
+        Sums fitness cache evictions to the counter
+        Args:
+            evictions: Number of fitness values dropped from the fitness cache
+
+        """
+        self.cache_evictions += evictions
+
+    def sum_short_circuits(self, short_circuits: int) -> None:
+        """
+        Sums decode cache short-circuits to the counter
+        Args:
+            short_circuits: Number of individuals whose fenotype and fitness value were
+                reused from a known derivation, with no decoding nor scoring
+
+        """
+        self.short_circuits += short_circuits
+
     #
     # Metrics
     #
     def reset(self):
         """Resets variables that depend on the run"""
         self.aes_counter = 0
+        self.evaluations_counter = 0
         self.solution_found = False
 
     def calculate_metrics(self):
         """Calculates the common GE evaluation metrics"""
         self.add_aes(self.aes_counter)
+        self._average_metrics()
+
+    def merge(self, other: "Stats") -> None:
+        """
+        Gathers the runs accounted by another Stats instance, such as the ones coming
+        from worker processes, and calculates the metrics of them all
+        Args:
+            other: Stats instance whose runs already got their metrics calculated
+
+        Returns: None
+
+        """
+        # Runs of the other instance are numbered after the ones accounted here
+        runs = len(self.mbf_accumulator)
+        for record in other.hall_of_fame:
+            self.add_most_fitted(record.replace(run=runs + record.run))
+
+        self.success_rate_accumulator.extend(other.success_rate_accumulator)
+        self.mbf_accumulator.extend(other.mbf_accumulator)
+        self.aes_accumulator.extend(other.aes_accumulator)
+        self.time_accumulator.extend(other.time_accumulator)
+        self.stop_reason_accumulator.extend(other.stop_reason_accumulator)
+        self.generations_accumulator.extend(other.generations_accumulator)
+        self.sum_cache_hits(other.cache_hits)
+        self.sum_cache_misses(other.cache_misses)
+        self.sum_cache_evictions(other.cache_evictions)
+        self.sum_short_circuits(other.short_circuits)
+        self._average_metrics()
+
+    def _average_metrics(self):
+        """Averages the accumulated metrics"""
         self.success_rate = Stats.avg(self.success_rate_accumulator)
         self.mbf = Stats.avg(self.mbf_accumulator)
         self.aes = Stats.avg(self.aes_accumulator)
         self.mean_time = Stats.avg(self.time_accumulator)
+        self.mean_generations = Stats.avg(self.generations_accumulator)
+        self.stop_reasons = [
+            stop_reason.name for stop_reason in self.stop_reason_accumulator
+        ]
 
     #
     # Auxiliary methods
@@ -170,14 +312,10 @@ class Stats(object):
     def get_most_fitted(self):
         """
         Best individual found
-        Returns: Individual with Best Fitness found for this Execution
+        Returns: Record of the individual with Best Fitness found for this Execution
 
         """
-        return (
-            max(self.most_fitted_accumulator, key=operator.attrgetter("fitness_value"))
-            if len(self.most_fitted_accumulator) > 0
-            else None
-        )
+        return self.hall_of_fame.best()
 
     @staticmethod
     def avg(al: list) -> float:
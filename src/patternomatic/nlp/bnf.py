@@ -18,9 +18,15 @@ You should have received a copy of the GNU Lesser General Public License
 along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
+from bisect import bisect_right
+from collections.abc import Sequence
 from inspect import getmembers
-from typing import List, Tuple
+from itertools import accumulate, islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
+from spacy import attrs
+from spacy.strings import StringStore
 from spacy.tokens import Doc, Token
 
 from patternomatic.settings.config import Config
@@ -89,6 +95,54 @@ from patternomatic.settings.literals import (
 )
 from patternomatic.settings.log import LOG
 
+# Token attributes whose values the grammar offers, read at once as Doc.to_array columns
+FEATURE_COLUMNS = (
+    attrs.ORTH,
+    attrs.LOWER,
+    attrs.LENGTH,
+    attrs.POS,
+    attrs.TAG,
+    attrs.DEP,
+    attrs.LEMMA,
+    attrs.SHAPE,
+    attrs.ENT_TYPE,
+)
+
+# Extra token attributes whose values the grammar offers as custom attributes
+CUSTOM_FEATURE_COLUMNS = (
+    attrs.ENT_ID,
+    attrs.ENT_IOB,
+    attrs.ENT_KB_ID,
+    attrs.LANG,
+    attrs.NORM,
+    attrs.PREFIX,
+    attrs.SUFFIX,
+    attrs.SPACY,
+)
+
+# Grammar symbols offering a value per token holding it, repeated ones included, unless USE_UNIQUES
+# (the extended pattern syntax arithmetical symbols offer the lengths)
+REPEATED_FEATURES = (
+    ORTH,
+    TEXT,
+    LOWER,
+    LENGTH,
+    POS,
+    TAG,
+    DEP,
+    LEMMA,
+    SHAPE,
+    ENT_TYPE,
+    EQQ,
+    GEQ,
+    LEQ,
+    GTH,
+    LTH,
+)
+
+# Token.ent_iob_ strings by ENT_IOB value
+IOB_STRINGS = ("", "I", "O", "B")
+
 
 #
 # Dynamic Grammar (Backus Naur Form) Generator
@@ -103,10 +157,46 @@ def dynamic_generator(samples: List[Doc]) -> dict:
     Returns: Backus Naur Form grammar notation encoded in a dictionary
 
     """
-    config = Config()
-
     LOG.info(f"Generating BNF based on the following samples: {str(samples)}")
 
+    accumulator = FeatureAccumulator()
+    accumulator.add(samples)
+
+    return accumulated_generator(accumulator)
+
+
+def stream_generator(samples: Iterable[Doc], chunk_size: int = 1000) -> dict:
+    """
+    Dynamically generates the very same grammar dynamic_generator does out of a stream of samples, say
+    Language.pipe or DocBin.get_docs ones, read chunk by chunk so they are never held in memory at once
+    Args:
+        samples: Iterable of Spacy Doc objects
+        chunk_size: Optional, number of samples read at once
+
+    Returns: Backus Naur Form grammar notation encoded in a dictionary
+
+    """
+    accumulator = FeatureAccumulator()
+    for chunk in chunked(samples, chunk_size):
+        accumulator.add(chunk)
+
+    LOG.info(f"Generating BNF based on a stream of {accumulator.num_samples} samples")
+
+    return accumulated_generator(accumulator)
+
+
+def accumulated_generator(accumulator: "FeatureAccumulator") -> dict:
+    """
+    Dynamically generates a grammar in Backus Naur Form (BNF) notation representing the Spacy NLP
+    Linguistic Feature values accumulated out of some samples
+    Args:
+        accumulator: FeatureAccumulator instance
+
+    Returns: Backus Naur Form grammar notation encoded in a dictionary
+
+    """
+    config = Config()
+
     # BNF root
     pattern_grammar = {S: [P]}
 
@@ -116,7 +206,7 @@ def dynamic_generator(samples: List[Doc]) -> dict:
         min_length_token,
         features_dict,
         extended_features,
-    ) = _features_seen(samples)
+    ) = accumulator.features()
 
     # Update times token per pattern [Min length of tokens, Max length of tokens] interval
     pattern_grammar[P] = _symbol_stacker(T, max_length_token, min_length_token)
@@ -158,147 +248,521 @@ def dynamic_generator(samples: List[Doc]) -> dict:
     return pattern_grammar
 
 
-#
-# BNF Utilities
-#
-def _features_seen(samples: List[Doc]) -> Tuple[int, int, dict, dict]:
+def extend_grammar(grammar: dict, samples: List[Doc]) -> dict:
     """
-    Builds up a dictionary containing Spacy Linguistic Feature Keys and their respective
-    seen values for the sample.
-    
+    Extends a grammar with the Spacy NLP Linguistic Feature values and lengths of some new samples not seen yet.
+    New productions are appended after the existing ones, so every production keeps its position and the
+    derivations not reaching an extended symbol decode to the very same pattern. Productions already present
+    are left out, but for the repeated feature values weighting the grammar when USE_UNIQUES is disabled
     Args:
+        grammar: Backus Naur Form grammar notation encoded in a dictionary
         samples: List of Spacy Doc objects
 
-    Returns:
-        Integer, the max length of a doc within the sample and a dict of features
+    Returns: Backus Naur Form grammar notation encoded in a dictionary, the input one is left untouched
 
     """
     config = Config()
 
-    # Just tokenizer features
-    orth_list = []
-    text_list = []
-    lower_list = []
-    length_list = []
-    shape_list = []
+    extended_grammar = {
+        symbol: list(productions) if isinstance(productions, list) else productions
+        for symbol, productions in grammar.items()
+    }
 
-    # For boolean features
-    bool_list = [True, False]
+    for symbol, productions in dynamic_generator(samples).items():
+        extended_productions = extended_grammar.get(symbol)
+        if isinstance(productions, TerminalPrefixes) and (
+            extended_productions is None
+            or isinstance(extended_productions, TerminalPrefixes)
+        ):
+            # Prefixes already present are left out by the terminal sequence itself
+            extended_grammar[symbol] = (
+                productions
+                if extended_productions is None
+                else extended_productions.extend(productions)
+            )
+            continue
 
-    # Require more than a tokenizer
-    pos_list = []
-    tag_list = []
-    dep_list = []
-    lemma_list = []
-    ent_type_list = []
+        extended_productions = extended_grammar.setdefault(symbol, list())
+        seen = set(repr(production) for production in extended_productions)
 
-    # Capture the len of the largest doc
-    max_doc_length = 0
-    min_doc_length = 999999999
+        # Repeated values weight the feature values unless USE_UNIQUES, so they are kept
+        keep_repeated = config.use_uniques is not True and symbol in REPEATED_FEATURES
 
-    # Set token extensions
-    if config.use_custom_attributes is True:
-        _set_token_extension_attributes(samples[0][0])
-        extended_features = _extended_features_seen(
-            [token for sample in samples for token in sample]
+        for production in productions:
+            if (keep_repeated and production != XPS) or repr(production) not in seen:
+                seen.add(repr(production))
+                extended_productions.append(production)
+
+    LOG.info(f"Extended BNF: {str(extended_grammar)}")
+
+    return extended_grammar
+
+
+#
+# Feature Accumulation
+#
+class FeatureAccumulator(object):
+    """
+    Accumulates the token attribute values the grammar offers, chunk of samples after chunk of samples,
+    so grammars are built over streams of samples never held in memory at once.
+    Every distinct value is resolved and kept just once by its hash id, so memory is bounded by the
+    vocabulary of the samples rather than by their size, unless every repeated value is kept (USE_UNIQUES
+    disabled), which takes a compact row of hash ids per token.
+    Partial accumulators, say built at other processes, are merged in the order of their samples
+    """
+
+    __slots__ = (
+        "num_samples",
+        "max_length",
+        "min_length",
+        "custom_attributes",
+        "values",
+        "rows",
+        "texts_with_ws",
+        "sentiments",
+    )
+
+    def __init__(self):
+        """FeatureAccumulator constructor, nothing accumulated yet"""
+        self.num_samples = 0
+        self.max_length = 0
+        self.min_length = 999999999
+        self.custom_attributes: Optional[List[str]] = None
+        # Value of every distinct hash id seen, by FEATURE_COLUMNS then CUSTOM_FEATURE_COLUMNS column
+        self.values: List[dict] = [
+            dict() for _ in range(len(FEATURE_COLUMNS) + len(CUSTOM_FEATURE_COLUMNS))
+        ]
+        # FEATURE_COLUMNS hash ids of every token, just when repeated values are kept
+        self.rows: List[np.ndarray] = list()
+        self.texts_with_ws = dict()
+        self.sentiments = set()
+
+    def add(self, samples: List[Doc]) -> None:
+        """
+        Accumulates the token attribute values of a chunk of samples. Every token attribute is read in a
+        single pass as a column of Doc.to_array hash ids, strings are resolved through the StringStore just
+        once per distinct id
+        Args:
+            samples: List of Spacy Doc objects
+
+        Returns: None
+
+        """
+        if len(samples) == 0:
+            return
+
+        config = Config()
+
+        columns = list(FEATURE_COLUMNS)
+        if config.use_custom_attributes is True:
+            columns += CUSTOM_FEATURE_COLUMNS
+
+        # One row per token of every sample, one column per token attribute
+        tokens = np.concatenate(
+            [sample.to_array(columns).reshape(-1, len(columns)) for sample in samples]
         )
-    else:
-        extended_features = {UNDERSCORE: {}}
-
-    for sample in samples:
-        sample_length = len(sample)
-
-        for token in sample:
-            orth_list.append(token.orth_)
-            text_list.append(token.text)
-            lower_list.append(token.lower_)
-            length_list.append(len(token))
-            pos_list.append(token.pos_)
-            tag_list.append(token.tag_)
-            dep_list.append(token.dep_)
-            lemma_list.append(token.lemma_)
-            shape_list.append(token.shape_)
-            ent_type_list.append(token.ent_type_)
-
-        # Checks for max/min length of tokens per sample
-        if sample_length > max_doc_length:
-            max_doc_length = sample_length
-
-        if sample_length < min_doc_length:
-            min_doc_length = sample_length
-
-    if config.use_uniques is True:
-        features = {
-            ORTH: sorted(list(set(orth_list))),
-            TEXT: sorted(list(set(text_list))),
-            LOWER: sorted(list(set(lower_list))),
-            LENGTH: sorted(list(set(length_list))),
-            POS: sorted(list(set(pos_list))),
-            TAG: sorted(list(set(tag_list))),
-            DEP: sorted(list(set(dep_list))),
-            LEMMA: sorted(list(set(lemma_list))),
-            SHAPE: sorted(list(set(shape_list))),
-            ENT_TYPE: sorted(list(set(ent_type_list))),
-        }
-    else:
+        strings = samples[0].vocab.strings
+
+        # Capture the len of the largest doc
+        sample_lengths = [len(sample) for sample in samples]
+        self.num_samples += len(samples)
+        self.max_length = max(self.max_length, max(sample_lengths))
+        self.min_length = min(self.min_length, min(sample_lengths))
+
+        # Lemmas the pipeline did not set are looked up the way Token.lemma_ does
+        lemma_ids = tokens[:, FEATURE_COLUMNS.index(attrs.LEMMA)]
+        unset_lemmas = np.flatnonzero(lemma_ids == 0)
+        if len(unset_lemmas) > 0:
+            all_tokens = [token for sample in samples for token in sample]
+            for row in unset_lemmas.tolist():
+                lemma_ids[row] = strings.add(all_tokens[row].lemma_)
+
+        orth_ids = tokens[:, FEATURE_COLUMNS.index(attrs.ORTH)]
+        orths_seen = self.values[FEATURE_COLUMNS.index(attrs.ORTH)]
+        new_orth_ids = [
+            orth_id
+            for orth_id in np.unique(orth_ids).tolist()
+            if orth_id not in orths_seen
+        ]
+
+        for column, attribute in enumerate(columns):
+            values = self.values[column]
+            resolve = _resolver(attribute, strings)
+            for value_id in np.unique(tokens[:, column]).tolist():
+                if value_id not in values:
+                    values[value_id] = resolve(value_id)
+
+        if config.use_uniques is not True:
+            self.rows.append(tokens[:, : len(FEATURE_COLUMNS)].copy())
+
+        if config.use_custom_attributes is True:
+            if self.custom_attributes is None:
+                first_token = next(
+                    (token for sample in samples for token in sample), None
+                )
+                if first_token is not None:
+                    self.custom_attributes = custom_attribute_names(first_token)
+            self._add_extended(samples, orth_ids, new_orth_ids, tokens, strings)
+
+    def merge(self, other: "FeatureAccumulator") -> None:
+        """
+        Accumulates the token attribute values some other accumulator did, as if its samples were added
+        after these ones
+        Args:
+            other: FeatureAccumulator instance
+
+        Returns: None
+
+        """
+        self.num_samples += other.num_samples
+        self.max_length = max(self.max_length, other.max_length)
+        self.min_length = min(self.min_length, other.min_length)
+        if self.custom_attributes is None:
+            self.custom_attributes = other.custom_attributes
+        for values, other_values in zip(self.values, other.values):
+            for value_id, value in other_values.items():
+                values.setdefault(value_id, value)
+        self.rows.extend(other.rows)
+        for key, text_with_ws in other.texts_with_ws.items():
+            self.texts_with_ws.setdefault(key, text_with_ws)
+        self.sentiments.update(other.sentiments)
+
+    def features(self) -> Tuple[int, int, dict, dict]:
+        """
+        Builds up a dictionary containing Spacy Linguistic Feature Keys and their respective
+        seen values for the accumulated samples
+
+        Returns:
+            Integer, the max length of a doc within the sample and a dict of features
+
+        """
+        config = Config()
+
+        # For boolean features
+        bool_list = [True, False]
+
+        rows = (
+            np.concatenate(self.rows)
+            if len(self.rows) > 0
+            else np.empty((0, len(FEATURE_COLUMNS)), dtype=np.uint64)
+        )
+
+        def seen(attribute: int) -> list:
+            column = FEATURE_COLUMNS.index(attribute)
+            values = self.values[column]
+            if config.use_uniques is True:
+                return sorted(set(values.values()))
+            return [values[value_id] for value_id in rows[:, column].tolist()]
+
+        orth_list = seen(attrs.ORTH)
         features = {
             ORTH: orth_list,
-            TEXT: text_list,
-            LOWER: lower_list,
-            LENGTH: length_list,
-            POS: pos_list,
-            TAG: tag_list,
-            DEP: dep_list,
-            LEMMA: lemma_list,
-            SHAPE: shape_list,
-            ENT_TYPE: ent_type_list,
+            TEXT: list(orth_list),
+            LOWER: seen(attrs.LOWER),
+            LENGTH: seen(attrs.LENGTH),
+            POS: seen(attrs.POS),
+            TAG: seen(attrs.TAG),
+            DEP: seen(attrs.DEP),
+            LEMMA: seen(attrs.LEMMA),
+            SHAPE: seen(attrs.SHAPE),
+            ENT_TYPE: seen(attrs.ENT_TYPE),
         }
 
-    # Add boolean features
-    if config.use_boolean_features is True:
-        features.update(
-            {
-                IS_ALPHA: bool_list,
-                IS_ASCII: bool_list,
-                IS_DIGIT: bool_list,
-                IS_LOWER: bool_list,
-                IS_UPPER: bool_list,
-                IS_TITLE: bool_list,
-                IS_PUNCT: bool_list,
-                IS_SPACE: bool_list,
-                IS_STOP: bool_list,
-                LIKE_NUM: bool_list,
-                LIKE_URL: bool_list,
-                LIKE_EMAIL: bool_list,
+        # Set token extensions
+        if config.use_custom_attributes is True:
+            if self.custom_attributes is not None:
+                set_custom_attributes(self.custom_attributes)
+            extended_features = self._extended_features()
+        else:
+            extended_features = {UNDERSCORE: {}}
+
+        # Add boolean features
+        if config.use_boolean_features is True:
+            features.update(
+                {
+                    IS_ALPHA: bool_list,
+                    IS_ASCII: bool_list,
+                    IS_DIGIT: bool_list,
+                    IS_LOWER: bool_list,
+                    IS_UPPER: bool_list,
+                    IS_TITLE: bool_list,
+                    IS_PUNCT: bool_list,
+                    IS_SPACE: bool_list,
+                    IS_STOP: bool_list,
+                    LIKE_NUM: bool_list,
+                    LIKE_URL: bool_list,
+                    LIKE_EMAIL: bool_list,
+                }
+            )
+
+        # Drop all observations equal to empty string
+        features = _feature_pruner(features)
+        extended_features[UNDERSCORE] = _feature_pruner(extended_features[UNDERSCORE])
+
+        return self.max_length, self.min_length, features, extended_features
+
+    def _add_extended(
+        self,
+        samples: List[Doc],
+        orth_ids: np.ndarray,
+        new_orth_ids: List[int],
+        tokens: np.ndarray,
+        strings: StringStore,
+    ) -> None:
+        """
+        Accumulates the values of the extended attributes (those attributes not accepted by the Spacy Matcher
+        by default, included as token extensions) not read as Doc.to_array columns
+        Args:
+            samples: List of Spacy Doc objects
+            orth_ids: ORTH hash id of every token of the samples
+            new_orth_ids: Distinct ORTH hash ids of the samples not accumulated before
+            tokens: Doc.to_array rows of every token of the samples, FEATURE_COLUMNS then CUSTOM_FEATURE_COLUMNS
+            strings: StringStore resolving the hash ids of the rows
+
+        Returns: None
+
+        """
+        spacy_column = len(FEATURE_COLUMNS) + CUSTOM_FEATURE_COLUMNS.index(attrs.SPACY)
+        for orth_id, spacy in np.unique(
+            np.stack((orth_ids, tokens[:, spacy_column]), axis=1), axis=0
+        ).tolist():
+            if (orth_id, spacy) not in self.texts_with_ws:
+                self.texts_with_ws[(orth_id, spacy)] = strings[orth_id] + (
+                    " " if spacy else ""
+                )
+
+        # Sentiment is a lexeme attribute, unless a hook sets it token by token
+        if any("sentiment" in sample.user_token_hooks for sample in samples):
+            self.sentiments.update(
+                token.sentiment for sample in samples for token in sample
+            )
+        else:
+            vocab = samples[0].vocab
+            self.sentiments.update(vocab[orth_id].sentiment for orth_id in new_orth_ids)
+
+    def _extended_features(self) -> dict:
+        """
+        Builds up a dictionary containing Spacy Linguistic Feature Keys and their respective seen values for the
+        accumulated extended attributes (those attributes not accepted by the Spacy Matcher by default,
+        included as token extensions)
+
+        Returns: dict of features
+
+        """
+        bool_list = [True, False]
+
+        def seen(attribute: int) -> list:
+            column = len(FEATURE_COLUMNS) + CUSTOM_FEATURE_COLUMNS.index(attribute)
+            return sorted(set(self.values[column].values()))
+
+        text_with_ws = sorted(set(self.texts_with_ws.values()))
+
+        extended_features = {
+            UNDERSCORE: {
+                ENT_ID: seen(attrs.ENT_ID),
+                ENT_IOB: seen(attrs.ENT_IOB),
+                ENT_KB_ID: seen(attrs.ENT_KB_ID),
+                HAS_VECTOR: bool_list,
+                IS_BRACKET: bool_list,
+                IS_CURRENCY: bool_list,
+                IS_LEFT_PUNCT: bool_list,
+                IS_OOV: bool_list,
+                IS_QUOTE: bool_list,
+                IS_RIGHT_PUNCT: bool_list,
+                # IS_SENT_START:
+                #     sorted(list(set([getattr(getattr(token, '_'), 'CUSTOM_IS_SENT_START') for token in tokens]))),
+                LANG: seen(attrs.LANG),
+                NORM: seen(attrs.NORM),
+                PREFIX: seen(attrs.PREFIX),
+                # PROB:
+                #     sorted(list(set([abs(getattr(getattr(token, '_'), 'CUSTOM_PROB')) for token in tokens]))),
+                SENTIMENT: sorted(self.sentiments),
+                STRING: text_with_ws,
+                SUFFIX: seen(attrs.SUFFIX),
+                TEXT_WITH_WS: list(text_with_ws),
+                WHITESPACE: seen(attrs.SPACY),
             }
+        }
+
+        return extended_features
+
+
+def _resolver(attribute: int, strings: StringStore) -> Callable:
+    """
+    Converter of the Doc.to_array hash ids of a token attribute into its values
+    Args:
+        attribute: Spacy attribute id
+        strings: StringStore resolving hash ids into strings
+
+    Returns: Callable converting a hash id into the token attribute value
+
+    """
+    if attribute == attrs.LENGTH:
+        return int
+    if attribute == attrs.ENT_IOB:
+        return IOB_STRINGS.__getitem__
+    if attribute == attrs.SPACY:
+        return lambda spacy: " " if spacy else ""
+    return strings.__getitem__
+
+
+#
+# Extended Pattern Syntax Terminals
+#
+class TerminalPrefixes(Sequence):
+    """
+    Terminal list of the extended pattern syntax set operators (IN, NOT_IN): every growing prefix of every
+    feature value list, feature after feature, each distinct prefix just once.
+    Prefixes are derived on demand out of the value lists, so the sequence takes memory linear in the
+    number of feature values. A prefix of some value list repeats a former one just as long as both value
+    lists share their beginning, so duplicates are skipped by their longest common prefix length
+    """
+
+    __slots__ = ("columns", "skipped", "ends")
+
+    def __init__(self, columns: Iterable[Iterable]):
+        """
+        TerminalPrefixes constructor
+        Args:
+            columns: Value lists whose prefixes are stacked, in order
+        """
+        self.columns = tuple(tuple(column) for column in columns)
+        # Leading prefixes of every column already stacked by some former column
+        self.skipped = tuple(
+            max(
+                (_common_prefix_length(column, former) for former in self.columns[:i]),
+                default=0,
+            )
+            for i, column in enumerate(self.columns)
+        )
+        # Position where the prefixes of every column end
+        self.ends = list(
+            accumulate(
+                len(column) - skipped
+                for column, skipped in zip(self.columns, self.skipped)
+            )
         )
 
-    # Drop all observations equal to empty string
-    features = _feature_pruner(features)
-    extended_features[UNDERSCORE] = _feature_pruner(extended_features[UNDERSCORE])
+    def __len__(self):
+        return self.ends[-1] if len(self.ends) > 0 else 0
+
+    def __getitem__(self, index: int) -> list:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TerminalPrefixes index out of range")
+
+        column = bisect_right(self.ends, index)
+        start = self.ends[column - 1] if column > 0 else 0
+        return list(self.columns[column][: self.skipped[column] + index - start + 1])
+
+    def __eq__(self, other):
+        if isinstance(other, TerminalPrefixes) and self.columns == other.columns:
+            return True
+        if not isinstance(other, (list, tuple, TerminalPrefixes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
 
-    return max_doc_length, min_doc_length, features, extended_features
+    def __repr__(self):
+        return f"{type(self).__name__}({[list(column) for column in self.columns]})"
 
+    def extend(self, other: "TerminalPrefixes") -> "TerminalPrefixes":
+        """
+        Stacks the prefixes of some other terminal sequence not stacked yet after these ones
+        Args:
+            other: TerminalPrefixes instance
 
-def _set_token_extension_attributes(token: Token) -> None:
+        Returns: TerminalPrefixes instance, this one is left untouched
+
+        """
+        return TerminalPrefixes(self.columns + other.columns)
+
+
+def _common_prefix_length(column: tuple, other_column: tuple) -> int:
     """
-    Given a Spacy Token instance, register all the Spacy token attributes not accepted by the Spacy Matcher
-    as custom attributes inside the Token Extensions (token._. space)
-    Returns: None
+    Length of the longest common prefix of two value lists
+    Args:
+        column: Tuple of values
+        other_column: Tuple of values
+
+    Returns: Integer
+
+    """
+    length = 0
+    for value, other_value in zip(column, other_column):
+        if value != other_value:
+            break
+        length += 1
+    return length
+
+
+#
+# BNF Utilities
+#
+def _features_seen(samples: List[Doc]) -> Tuple[int, int, dict, dict]:
+    """
+    Builds up a dictionary containing Spacy Linguistic Feature Keys and their respective
+    seen values for the sample.
+
+    Args:
+        samples: List of Spacy Doc objects
+
+    Returns:
+        Integer, the max length of a doc within the sample and a dict of features
+
+    """
+    accumulator = FeatureAccumulator()
+    accumulator.add(samples)
+    return accumulator.features()
+
+
+def chunked(items: Iterable, chunk_size: int) -> Iterator[list]:
+    """
+    Splits a stream of items, say samples, into consecutive chunks
+    Args:
+        items: Iterable of items
+        chunk_size: Maximum number of items per chunk
+
+    Returns: Iterator of lists of items
+
+    """
+    items = iter(items)
+    chunk = list(islice(items, max(chunk_size, 1)))
+    while len(chunk) > 0:
+        yield chunk
+        chunk = list(islice(items, max(chunk_size, 1)))
+
+
+def custom_attribute_names(token: Token) -> List[str]:
+    """
+    Given a Spacy Token instance, lists the Spacy token attributes not accepted by the Spacy Matcher
+    Returns: List of token attribute names
 
     """
     # Retrieve cleaned up Token Attributes
     token_attributes = _clean_token_attributes(
         {k: v for k, v in getmembers(token) if type(v) in (str, bool, float)}
     )
+    return list(token_attributes.keys())
+
 
-    # Set token custom attributes
-    lambda_list = []
-    i = 0
-    for k, v in token_attributes.items():
-        lambda_list.append(lambda token_=token, k_=k: getattr(token_, k_))
-        token.set_extension(str("custom_" + k).upper(), getter=lambda_list[i])
-        i += 1
+def set_custom_attributes(token_attributes: List[str]) -> None:
+    """
+    Registers the given Spacy token attributes as custom attributes inside the Token Extensions (token._. space)
+    Args:
+        token_attributes: List of token attribute names
+
+    Returns: None
+
+    """
+    for k in token_attributes:
+        Token.set_extension(
+            str("custom_" + k).upper(),
+            getter=lambda token_, k_=k: getattr(token_, k_),
+            force=True,
+        )
 
 
 def _clean_token_attributes(token_attributes: dict) -> dict:
@@ -317,148 +781,6 @@ def _clean_token_attributes(token_attributes: dict) -> dict:
     return token_attributes
 
 
-def _extended_features_seen(tokens: [Token]) -> dict:
-    """
-    Builds up a dictionary containing Spacy Linguistic Feature Keys and their respective seen values for the
-    input token list extended attributes (those attributes not accepted by the Spacy Matcher by default,
-    included as token extensions)
-    Args:
-        tokens: List of Spacy Token instances
-
-    Returns: dict of features
-
-    """
-    bool_list = [True, False]
-
-    extended_features = {
-        UNDERSCORE: {
-            ENT_ID: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_ENT_ID_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            ENT_IOB: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_ENT_IOB_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            ENT_KB_ID: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_ENT_KB_ID_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            HAS_VECTOR: bool_list,
-            IS_BRACKET: bool_list,
-            IS_CURRENCY: bool_list,
-            IS_LEFT_PUNCT: bool_list,
-            IS_OOV: bool_list,
-            IS_QUOTE: bool_list,
-            IS_RIGHT_PUNCT: bool_list,
-            # IS_SENT_START:
-            #     sorted(list(set([getattr(getattr(token, '_'), 'CUSTOM_IS_SENT_START') for token in tokens]))),
-            LANG: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_LANG_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            NORM: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_NORM_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            PREFIX: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_PREFIX_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            # PROB:
-            #     sorted(list(set([abs(getattr(getattr(token, '_'), 'CUSTOM_PROB')) for token in tokens]))),
-            SENTIMENT: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_SENTIMENT")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            STRING: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_STRING")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            SUFFIX: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_SUFFIX_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            TEXT_WITH_WS: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_TEXT_WITH_WS")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-            WHITESPACE: sorted(
-                list(
-                    set(
-                        [
-                            getattr(getattr(token, "_"), "CUSTOM_WHITESPACE_")
-                            for token in tokens
-                        ]
-                    )
-                )
-            ),
-        }
-    }
-
-    return extended_features
-
-
 def _feature_pruner(features: dict) -> dict:
     """
     Prunes dict keys whose values contain a list of repeated items
@@ -562,7 +884,7 @@ def _add_extended_pattern_syntax(
         dict: Backus Naur Form grammar notation encoded in a dictionary with Spacy's extended pattern syntax
     """
     tmp_lengths = features_dict[LENGTH].copy()
-    full_terminal_stack = _all_feature_terminal_list(features_dict)
+    full_terminal_stack = TerminalPrefixes(features_dict.values())
     pattern_grammar[F] = list_of_features
     pattern_grammar[XPS] = [IN, NOT_IN, EQQ, GEQ, LEQ, GTH, LTH]
     pattern_grammar[IN] = full_terminal_stack
@@ -576,38 +898,6 @@ def _add_extended_pattern_syntax(
     return pattern_grammar
 
 
-def _all_feature_terminal_list(features_dict: dict) -> list:
-    """
-    Stacks all feature terminal options in a list of lists to be used for the extended pattern syntax set operators
-    Args:
-        features_dict: dictionary of feature keys with all possible feature value options
-
-    Returns:
-
-    """
-    all_terminal_list = list()
-
-    for item in list(features_dict.items()):
-        current_terminal_holder = list()
-
-        for terminal_list_item in item[1]:
-            if len(current_terminal_holder) > 0:
-                temp_list = list(current_terminal_holder[-1])
-                temp_list.append(terminal_list_item)
-                current_terminal_holder.append(temp_list)
-            else:
-                current_terminal_holder.append([terminal_list_item])
-
-        all_terminal_list += current_terminal_holder
-
-    all_terminal_list = [
-        ele
-        for ind, ele in enumerate(all_terminal_list)
-        if ele not in all_terminal_list[:ind]
-    ]
-    return all_terminal_list
-
-
 def _add_custom_attributes(pattern_grammar: dict, extended_features: dict) -> dict:
     """
     Adds support to a specific set of custom attributes at BNF dict
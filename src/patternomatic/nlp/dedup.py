@@ -0,0 +1,96 @@
+""" Sample deduplication module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+from typing import List, Tuple
+
+from spacy.attrs import (
+    DEP,
+    ENT_ID,
+    ENT_IOB,
+    ENT_KB_ID,
+    ENT_TYPE,
+    LEMMA,
+    NORM,
+    ORTH,
+    POS,
+    SPACY,
+    TAG,
+)
+from spacy.tokens import Doc
+
+from patternomatic.settings.config import Config
+
+# Token attributes a pattern may look at. The remaining ones the grammar uses
+# (LOWER, SHAPE, LENGTH, boolean flags...) are lexical, so ORTH settles them
+SIGNATURE_ATTRIBUTES = [ORTH, POS, TAG, DEP, LEMMA, ENT_TYPE]
+
+# Extra token attributes reachable through custom attributes (token._. space)
+CUSTOM_SIGNATURE_ATTRIBUTES = [NORM, SPACY, ENT_IOB, ENT_ID, ENT_KB_ID]
+
+
+def deduplicate(samples: List[Doc]) -> Tuple[List[Doc], List[int]]:
+    """
+    Collapses the samples sharing the same token attribute signature, since every
+    pattern scores exactly the same over all of them
+    Args:
+        samples: List of Spacy Doc objects
+
+    Returns: List of unique Spacy Doc objects and, for each input sample, the
+        position of its unique sample
+
+    """
+    config = Config()
+
+    attributes = SIGNATURE_ATTRIBUTES
+    if config.use_custom_attributes is True:
+        attributes = SIGNATURE_ATTRIBUTES + CUSTOM_SIGNATURE_ATTRIBUTES
+
+    unique_samples = list()
+    signatures = dict()
+    sample_ids = list()
+
+    for sample in samples:
+        signature = sample.to_array(attributes).tobytes()
+        sample_id = signatures.get(signature)
+
+        if sample_id is None:
+            sample_id = signatures[signature] = len(unique_samples)
+            unique_samples.append(sample)
+
+        sample_ids.append(sample_id)
+
+    return unique_samples, sample_ids
+
+
+def sample_weights(sample_ids: List[int]) -> List[int]:
+    """
+    Counts how many samples collapsed into each unique sample
+    Args:
+        sample_ids: For each sample, the position of its unique sample
+
+    Returns: List of weights, one per unique sample
+
+    """
+    weights = [0] * (max(sample_ids) + 1 if len(sample_ids) > 0 else 0)
+
+    for sample_id in sample_ids:
+        weights[sample_id] += 1
+
+    return weights
@@ -0,0 +1,313 @@
+""" Token attribute matrix module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+from spacy.attrs import DEP, ENT_TYPE, LEMMA, LENGTH, LOWER, ORTH, POS, SHAPE, TAG
+from spacy.tokens import Doc
+
+from patternomatic.settings.config import Config
+from patternomatic.settings.literals import FitnessEngine, FitnessType
+
+# Token attributes encoded as matrix columns, in column order
+MATRIX_COLUMNS = (ORTH, LOWER, POS, TAG, DEP, LEMMA, SHAPE, ENT_TYPE, LENGTH)
+
+# Spacy's Rule Based Matcher pattern keys the matrix is able to evaluate
+MATRIX_ATTRIBUTES = {
+    "ORTH": 0,
+    "TEXT": 0,
+    "LOWER": 1,
+    "POS": 2,
+    "TAG": 3,
+    "DEP": 4,
+    "LEMMA": 5,
+    "SHAPE": 6,
+    "ENT_TYPE": 7,
+    "LENGTH": 8,
+}
+
+
+class PatternEncoder(object):
+    """
+    Translates operator free patterns into the integer values Spacy stores for the
+    token attributes of MATRIX_COLUMNS
+    """
+
+    __slots__ = ("vocab", "_value_ids")
+
+    def __init__(self, samples: List[Doc]):
+        """
+        PatternEncoder constructor
+        Args:
+            samples: List of Spacy Doc objects
+        """
+        self.vocab = samples[0].vocab
+        self._value_ids = dict()
+
+    def encode(self, fenotype: List[dict]) -> Optional[List[List[Tuple[int, int]]]]:
+        """
+        Translates a pattern into (column, value id) constraints per token position
+        Args:
+            fenotype: Spacy's Rule Based Matcher pattern
+
+        Returns: List of constraints per token, None if the pattern can not be
+            evaluated by the matrix (operators, extended syntax, custom attributes...)
+
+        """
+        encoded = list()
+
+        for token in fenotype:
+            if not isinstance(token, dict):
+                return None
+
+            constraints = list()
+            for key, value in token.items():
+                column = MATRIX_ATTRIBUTES.get(key)
+                value_id = self._value_id(value)
+                if column is None or value_id is None:
+                    return None
+                constraints.append((column, value_id))
+
+            encoded.append(constraints)
+
+        return encoded if len(encoded) > 0 else None
+
+    def _value_id(self, value) -> Optional[int]:
+        """
+        Converts a pattern value into the integer stored at the matrix, the same way
+        the Spacy's Rule Based Matcher does
+        Args:
+            value: Pattern token attribute value
+
+        Returns: Integer id, None if the value is not supported
+
+        """
+        if isinstance(value, str):
+            value_id = self._value_ids.get(value)
+            if value_id is None:
+                value_id = self._value_ids[value] = self.vocab.strings.add(value)
+            return value_id
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            return value
+        return None
+
+
+class SampleMatrix(PatternEncoder):
+    """
+    Encodes a list of Spacy Doc instances once into a single integer matrix (one row
+    per token, one column per token attribute) to evaluate operator free patterns
+    with vectorized equality checks instead of the Spacy's Rule Based Matcher
+    """
+
+    __slots__ = ("tokens", "doc_ids", "remaining", "starts", "lengths")
+
+    def __init__(self, samples: List[Doc]):
+        """
+        SampleMatrix constructor
+        Args:
+            samples: List of Spacy Doc objects
+        """
+        super().__init__(samples)
+        self.lengths = np.empty(0, dtype=np.int64)
+        self.starts = np.empty(0, dtype=np.int64)
+        self.tokens = np.empty((0, len(MATRIX_COLUMNS)), dtype=np.uint64)
+        self.doc_ids = np.empty(0, dtype=np.int64)
+        self.remaining = np.empty(0, dtype=np.int64)
+        self.extend(samples)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def extend(self, samples: List[Doc]) -> None:
+        """
+        Appends the rows of some more samples, the ones already encoded are kept
+        Args:
+            samples: List of Spacy Doc objects
+
+        Returns: None
+
+        """
+        if len(samples) == 0:
+            return
+
+        lengths = np.array([len(sample) for sample in samples], dtype=np.int64)
+        starts = len(self.tokens) + np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        tokens = np.concatenate(
+            [sample.to_array(list(MATRIX_COLUMNS)) for sample in samples]
+        ).reshape(-1, len(MATRIX_COLUMNS))
+        # Tokens left until the end of its Doc, the token itself included
+        remaining = np.repeat(starts + lengths, lengths) - np.arange(
+            len(self.tokens), len(self.tokens) + len(tokens)
+        )
+
+        self.doc_ids = np.concatenate(
+            (
+                self.doc_ids,
+                np.repeat(np.arange(len(self), len(self) + len(samples)), lengths),
+            )
+        )
+        self.lengths = np.concatenate((self.lengths, lengths))
+        self.starts = np.concatenate((self.starts, starts))
+        self.tokens = np.concatenate((self.tokens, tokens))
+        self.remaining = np.concatenate((self.remaining, remaining))
+
+    def match(self, encoded: List[List[Tuple[int, int]]]) -> np.ndarray:
+        """
+        Finds the samples where the pattern matches at any position
+        Args:
+            encoded: Pattern constraints as returned by SampleMatrix.encode
+
+        Returns: Boolean array, one item per sample
+
+        """
+        matched = np.zeros(len(self), dtype=bool)
+        num_starts = len(self.tokens) - len(encoded) + 1
+
+        if num_starts <= 0:
+            return matched
+
+        hits = self.remaining[:num_starts] >= len(encoded)
+
+        for position, constraints in enumerate(encoded):
+            for column, value_id in constraints:
+                hits &= (
+                    self.tokens[position : position + num_starts, column] == value_id
+                )
+
+        matched[self.doc_ids[:num_starts][hits]] = True
+        return matched
+
+    def full_match(self, encoded: List[List[Tuple[int, int]]]) -> np.ndarray:
+        """
+        Finds the samples fully spanned by the pattern
+        Args:
+            encoded: Pattern constraints as returned by SampleMatrix.encode
+
+        Returns: Boolean array, one item per sample
+
+        """
+        matched = np.zeros(len(self), dtype=bool)
+        candidates = np.flatnonzero(self.lengths == len(encoded))
+        rows = self.starts[candidates]
+
+        for position, constraints in enumerate(encoded):
+            for column, value_id in constraints:
+                keep = self.tokens[rows + position, column] == value_id
+                candidates = candidates[keep]
+                rows = rows[keep]
+
+        matched[candidates] = True
+        return matched
+
+
+class SampleIndex(PatternEncoder):
+    """
+    Positional inverted index of a list of Spacy Doc instances. Maps every (sample
+    length, token position, attribute column, value id) to the bitset of the samples
+    holding that value, so full matches of operator free patterns are solved with a
+    handful of AND operations
+    """
+
+    __slots__ = ("num_samples", "lengths", "_bitsets")
+
+    def __init__(self, samples: List[Doc]):
+        """
+        SampleIndex constructor
+        Args:
+            samples: List of Spacy Doc objects
+        """
+        super().__init__(samples)
+        self.num_samples = 0
+        self.lengths = dict()
+        self._bitsets = dict()
+        self.extend(samples)
+
+    def __len__(self):
+        return self.num_samples
+
+    def extend(self, samples: List[Doc]) -> None:
+        """
+        Indexes some more samples, their bits follow the ones already indexed
+        Args:
+            samples: List of Spacy Doc objects
+
+        Returns: None
+
+        """
+        for doc_id, sample in enumerate(samples, self.num_samples):
+            bit = 1 << doc_id
+            length = len(sample)
+            self.lengths[length] = self.lengths.get(length, 0) | bit
+
+            rows = sample.to_array(list(MATRIX_COLUMNS)).reshape(
+                -1, len(MATRIX_COLUMNS)
+            )
+            for position, row in enumerate(rows.tolist()):
+                for column, value_id in enumerate(row):
+                    key = (length, position, column, value_id)
+                    self._bitsets[key] = self._bitsets.get(key, 0) | bit
+
+        self.num_samples += len(samples)
+
+    def full_match(self, encoded: List[List[Tuple[int, int]]]) -> int:
+        """
+        Finds the samples fully spanned by the pattern
+        Args:
+            encoded: Pattern constraints as returned by SampleIndex.encode
+
+        Returns: Bitset of samples, bit i set if the i-th sample is matched
+
+        """
+        length = len(encoded)
+        bitset = self.lengths.get(length, 0)
+
+        for position, constraints in enumerate(encoded):
+            for column, value_id in constraints:
+                if bitset == 0:
+                    return 0
+                bitset &= self._bitsets.get((length, position, column, value_id), 0)
+
+        return bitset
+
+
+def encode_samples(
+    samples: List[Doc],
+) -> Tuple[Optional[SampleMatrix], Optional[SampleIndex]]:
+    """
+    Encodes the samples for the configured fitness engine and fitness function type
+    Args:
+        samples: List of Spacy Doc objects
+
+    Returns: SampleMatrix and SampleIndex instances, None when not configured
+
+    """
+    config = Config()
+
+    sample_matrix = (
+        SampleMatrix(samples) if config.fitness_engine == FitnessEngine.MATRIX else None
+    )
+    sample_index = (
+        SampleIndex(samples)
+        if config.fitness_engine == FitnessEngine.INDEX
+        and config.fitness_function_type == FitnessType.FULL_MATCH
+        else None
+    )
+    return sample_matrix, sample_index
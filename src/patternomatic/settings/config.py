@@ -24,33 +24,59 @@ import configparser
 from typing import Optional
 
 from patternomatic.settings.literals import (
+    BATCH_EVALUATION,
+    CHECKPOINT_INTERVAL,
+    CHECKPOINT_PATH,
     CODON_LENGTH,
     CODONS_X_INDIVIDUAL,
+    DECODE_CACHE_SIZE,
     DGG,
     FEATURES_X_TOKEN,
+    FITNESS_CACHE_SIZE,
+    FITNESS_CHUNK_SIZE,
+    FITNESS_ENGINE,
     FITNESS_FUNCTION_TYPE,
+    FITNESS_WORKERS,
     GE,
+    HALL_OF_FAME_SIZE,
     IO,
+    ISLAND_REPLACEMENT_TYPES,
+    ISLAND_SELECTION_TYPES,
+    ISLANDS,
     K_VALUE,
+    LIBRARY_PATH,
+    LIBRARY_SIZE,
     MATING_PROBABILITY,
+    MAX_EVALUATIONS,
     MAX_GENERATIONS,
     MAX_RUNS,
+    MIGRANTS,
+    MIGRATION_INTERVAL,
+    MIGRATION_TOPOLOGY,
     MUTATION_PROBABILITY,
+    NUM_WORKERS,
     OFFSPRING_FACTOR,
     POPULATION_SIZE,
+    RANDOM_SEED,
     RECOMBINATION_TYPE,
     REPLACEMENT_TYPE,
     REPORT_FORMAT,
     REPORT_PATH,
     SELECTION_TYPE,
+    STAGNATION_GENERATIONS,
+    STOP_ON_SUCCESS,
     SUCCESS_THRESHOLD,
+    TIME_BUDGET,
     USE_BOOLEAN_FEATURES,
     USE_CUSTOM_ATTRIBUTES,
     USE_EXTENDED_PATTERN_SYNTAX,
     USE_GRAMMAR_OPERATORS,
     USE_TOKEN_WILDCARD,
     USE_UNIQUES,
+    WARM_START_FRACTION,
+    FitnessEngine,
     FitnessType,
+    MigrationTopology,
     RecombinationType,
     ReplacementType,
     ReportFormat,
@@ -96,6 +122,28 @@ class Config(metaclass=SingletonMetaNaive):
         "recombination_type",
         "replacement_type",
         "fitness_function_type",
+        "fitness_cache_size",
+        "fitness_engine",
+        "batch_evaluation",
+        "decode_cache_size",
+        "num_workers",
+        "random_seed",
+        "fitness_workers",
+        "fitness_chunk_size",
+        "islands",
+        "migration_interval",
+        "migration_topology",
+        "migrants",
+        "island_selection_types",
+        "island_replacement_types",
+        "stop_on_success",
+        "stagnation_generations",
+        "max_evaluations",
+        "time_budget",
+        "hall_of_fame_size",
+        "checkpoint_interval",
+        "library_size",
+        "warm_start_fraction",
         "features_per_token",
         "use_boolean_features",
         "use_custom_attributes",
@@ -105,6 +153,8 @@ class Config(metaclass=SingletonMetaNaive):
         "use_extended_pattern_syntax",
         "report_path",
         "report_format",
+        "checkpoint_path",
+        "library_path",
         "file_path",
     )
 
@@ -181,6 +231,90 @@ class Config(metaclass=SingletonMetaNaive):
             self._validate_config_argument(GE, FITNESS_FUNCTION_TYPE, 1, config_parser)
         )
 
+        self.fitness_cache_size = self._validate_config_argument(
+            GE, FITNESS_CACHE_SIZE, 2048, config_parser
+        )
+
+        self.fitness_engine = FitnessEngine(
+            self._validate_config_argument(GE, FITNESS_ENGINE, 0, config_parser)
+        )
+
+        self.batch_evaluation = self._validate_config_argument(
+            GE, BATCH_EVALUATION, False, config_parser
+        )
+
+        self.decode_cache_size = self._validate_config_argument(
+            GE, DECODE_CACHE_SIZE, 2048, config_parser
+        )
+
+        self.num_workers = self._validate_config_argument(
+            GE, NUM_WORKERS, 1, config_parser
+        )
+
+        self.random_seed = self._validate_config_argument(
+            GE, RANDOM_SEED, -1, config_parser
+        )
+
+        self.fitness_workers = self._validate_config_argument(
+            GE, FITNESS_WORKERS, 1, config_parser
+        )
+
+        self.fitness_chunk_size = self._validate_config_argument(
+            GE, FITNESS_CHUNK_SIZE, 32, config_parser
+        )
+
+        self.islands = self._validate_config_argument(GE, ISLANDS, 1, config_parser)
+
+        self.migration_interval = self._validate_config_argument(
+            GE, MIGRATION_INTERVAL, 5, config_parser
+        )
+
+        self.migration_topology = MigrationTopology(
+            self._validate_config_argument(GE, MIGRATION_TOPOLOGY, 0, config_parser)
+        )
+
+        self.migrants = self._validate_config_argument(GE, MIGRANTS, 2, config_parser)
+
+        self.island_selection_types = self._validate_config_argument(
+            GE, ISLAND_SELECTION_TYPES, "", config_parser
+        )
+
+        self.island_replacement_types = self._validate_config_argument(
+            GE, ISLAND_REPLACEMENT_TYPES, "", config_parser
+        )
+
+        self.stop_on_success = self._validate_config_argument(
+            GE, STOP_ON_SUCCESS, False, config_parser
+        )
+
+        self.stagnation_generations = self._validate_config_argument(
+            GE, STAGNATION_GENERATIONS, 0, config_parser
+        )
+
+        self.max_evaluations = self._validate_config_argument(
+            GE, MAX_EVALUATIONS, 0, config_parser
+        )
+
+        self.time_budget = self._validate_config_argument(
+            GE, TIME_BUDGET, 0.0, config_parser
+        )
+
+        self.hall_of_fame_size = self._validate_config_argument(
+            GE, HALL_OF_FAME_SIZE, 0, config_parser
+        )
+
+        self.checkpoint_interval = self._validate_config_argument(
+            GE, CHECKPOINT_INTERVAL, 10, config_parser
+        )
+
+        self.library_size = self._validate_config_argument(
+            GE, LIBRARY_SIZE, 100, config_parser
+        )
+
+        self.warm_start_fraction = self._validate_config_argument(
+            GE, WARM_START_FRACTION, 0.25, config_parser
+        )
+
         #
         # BNF Grammar Generation configuration options
         #
@@ -222,6 +356,14 @@ class Config(metaclass=SingletonMetaNaive):
             self._validate_config_argument(IO, REPORT_FORMAT, 0, config_parser)
         )
 
+        self.checkpoint_path = self._validate_config_argument(
+            IO, CHECKPOINT_PATH, "", config_parser
+        )
+
+        self.library_path = self._validate_config_argument(
+            IO, LIBRARY_PATH, "", config_parser
+        )
+
         LOG.info(f"Configuration instance: {self}")
 
     def __setattr__(self, key, value) -> None:
@@ -327,3 +469,22 @@ class Config(metaclass=SingletonMetaNaive):
                 f"Extended Pattern Syntax has been disabled!"
             )
             self.use_extended_pattern_syntax = False
+
+
+def restore_config(options: dict) -> Config:
+    """
+    Sets up the Config instance of a worker process out of the parameters of the
+    parent process Config instance
+    Args:
+        options: Config instance dict representation
+
+    Returns: Config instance
+
+    """
+    Config.clear_instance()
+    config = Config(options["file_path"])
+    for option, value in options.items():
+        if getattr(config, option) != value:
+            setattr(config, option, value)
+
+    return config
@@ -54,6 +54,34 @@ class ReplacementType(Enum):
     MU_PLUS_LAMBDA = 0
     MU_LAMBDA_WITH_ELITISM = 1
     MU_LAMBDA_WITHOUT_ELITISM = 2
+    STEADY_STATE = 3
+
+    def __repr__(self):
+        """Human readable"""
+        return self.name
+
+
+@unique
+class MigrationTopology(Enum):
+    """Island model migration topologies enum"""
+
+    RING = 0
+    ALL_TO_ALL = 1
+
+    def __repr__(self):
+        """Human readable"""
+        return self.name
+
+
+@unique
+class StopReason(Enum):
+    """Run stopping criteria enum"""
+
+    MAX_GENERATIONS = 0
+    SUCCESS = 1
+    STAGNATION = 2
+    MAX_EVALUATIONS = 3
+    TIME_BUDGET = 4
 
     def __repr__(self):
         """Human readable"""
@@ -73,6 +101,20 @@ class FitnessType(Enum):
         return self.name
 
 
+# Fitness evaluation engines
+@unique
+class FitnessEngine(Enum):
+    """Fitness function evaluation engine"""
+
+    MATCHER = 0
+    MATRIX = 1
+    INDEX = 2
+
+    def __repr__(self):
+        """Human readable"""
+        return self.name
+
+
 #
 # Dynamic grammar generation related literals
 #
@@ -193,6 +235,28 @@ SELECTION_TYPE = "SELECTION_TYPE"
 RECOMBINATION_TYPE = "RECOMBINATION_TYPE"
 REPLACEMENT_TYPE = "REPLACEMENT_TYPE"
 FITNESS_FUNCTION_TYPE = "FITNESS_FUNCTION_TYPE"
+FITNESS_CACHE_SIZE = "FITNESS_CACHE_SIZE"
+FITNESS_ENGINE = "FITNESS_ENGINE"
+BATCH_EVALUATION = "BATCH_EVALUATION"
+DECODE_CACHE_SIZE = "DECODE_CACHE_SIZE"
+NUM_WORKERS = "NUM_WORKERS"
+RANDOM_SEED = "RANDOM_SEED"
+FITNESS_WORKERS = "FITNESS_WORKERS"
+FITNESS_CHUNK_SIZE = "FITNESS_CHUNK_SIZE"
+ISLANDS = "ISLANDS"
+MIGRATION_INTERVAL = "MIGRATION_INTERVAL"
+MIGRATION_TOPOLOGY = "MIGRATION_TOPOLOGY"
+MIGRANTS = "MIGRANTS"
+ISLAND_SELECTION_TYPES = "ISLAND_SELECTION_TYPES"
+ISLAND_REPLACEMENT_TYPES = "ISLAND_REPLACEMENT_TYPES"
+STOP_ON_SUCCESS = "STOP_ON_SUCCESS"
+STAGNATION_GENERATIONS = "STAGNATION_GENERATIONS"
+MAX_EVALUATIONS = "MAX_EVALUATIONS"
+TIME_BUDGET = "TIME_BUDGET"
+HALL_OF_FAME_SIZE = "HALL_OF_FAME_SIZE"
+CHECKPOINT_INTERVAL = "CHECKPOINT_INTERVAL"
+LIBRARY_SIZE = "LIBRARY_SIZE"
+WARM_START_FRACTION = "WARM_START_FRACTION"
 DGG = "DGG"
 FEATURES_X_TOKEN = "FEATURES_X_TOKEN"
 USE_BOOLEAN_FEATURES = "USE_BOOLEAN_FEATURES"
@@ -204,6 +268,8 @@ USE_CUSTOM_ATTRIBUTES = "USE_CUSTOM_ATTRIBUTES"
 IO = "IO"
 REPORT_PATH = "REPORT_PATH"
 REPORT_FORMAT = "REPORT_FORMAT"
+CHECKPOINT_PATH = "CHECKPOINT_PATH"
+LIBRARY_PATH = "LIBRARY_PATH"
 
 
 @unique
@@ -19,11 +19,17 @@ along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
 import os
+import pickle
+import tempfile
 from unittest import TestCase, mock
 
 import spacy
 
-from patternomatic.api import find_patterns
+from patternomatic.api import PatternSearch, find_patterns, generate_grammar
+from patternomatic.ge.library import PatternLibrary
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.ge.records import PatternRecord
+from patternomatic.ge.stats import Stats
 from patternomatic.settings.config import Config
 from patternomatic.settings.log import LOG
 
@@ -34,7 +40,7 @@ class Test(TestCase):
 
     def test_find_patterns_when_only_samples_provided(self):
         """Tests that providing just samples makes the find_pattern keeps working"""
-        patterns, _ = find_patterns(self.my_samples)
+        patterns = find_patterns(self.my_samples)
         super().assertEqual(4, len(patterns))
 
     def test_find_patterns_when_valid_configuration_file_provided(self):
@@ -51,9 +57,141 @@ class Test(TestCase):
         """Checks when setting up a Config instance before find_patterns invocation works"""
         config = Config()
         config.max_runs = 10
-        patterns, _ = find_patterns(self.my_samples)
+        patterns = find_patterns(self.my_samples)
         super().assertEqual(10, len(patterns))
 
+    def test_find_patterns_in_parallel(self):
+        """Seeded runs across worker processes find the same patterns as sequential"""
+        config = Config()
+        config.random_seed = 7
+        sequential = find_patterns(self.my_samples)
+
+        config.num_workers = 2
+        parallel = find_patterns(self.my_samples)
+
+        super().assertEqual(sequential, parallel)
+
+    def test_find_patterns_hall_of_fame(self):
+        """Only the most fitted run records are returned, best first"""
+        config = Config()
+        config.max_runs = 5
+        config.hall_of_fame_size = 2
+        records = find_patterns(self.my_samples)
+
+        super().assertEqual(2, len(records))
+        super().assertTrue(all(isinstance(r, PatternRecord) for r in records))
+        super().assertGreaterEqual(records[0].fitness_value, records[1].fitness_value)
+        super().assertNotEqual(records[0].run, records[1].run)
+        super().assertLess(max(r.run for r in records), config.max_runs)
+
+    def test_find_patterns_resume(self):
+        """Resumed executions skip the runs already completed"""
+        with tempfile.TemporaryDirectory() as directory:
+            config = Config()
+            config.random_seed = 7
+            config.max_runs = 3
+            expected = find_patterns(self.my_samples)
+
+            # Interrupted after the first run
+            config.checkpoint_path = os.path.join(directory, "checkpoint")
+            config.max_runs = 1
+            find_patterns(self.my_samples)
+
+            # Phase times of the interrupted execution are left out
+            with open(config.checkpoint_path, mode="rb") as f:
+                checkpoint = pickle.load(f)
+            super().assertIn("grammar", checkpoint.stats.phase_times)
+            checkpoint.stats.phase_times["grammar"] = 1e6
+            with open(config.checkpoint_path, mode="wb") as f:
+                pickle.dump(checkpoint, f)
+
+            config.max_runs = 3
+            with super().assertLogs(LOG) as cm, mock.patch.object(
+                Stats, "persist", autospec=True
+            ) as persist:
+                resumed = find_patterns(self.my_samples, resume=True)
+
+        super().assertEqual(expected, resumed)
+        super().assertLess(persist.call_args[0][0].phase_times["grammar"], 1e6)
+        super().assertIn(
+            f"INFO:patternomatic:Resuming from checkpoint {config.checkpoint_path}: "
+            f"1 out of 3 runs completed",
+            cm.output,
+        )
+
+    def test_find_patterns_warm_start(self):
+        """Executions store their best patterns at the library, seeding the next ones"""
+        with tempfile.TemporaryDirectory() as directory:
+            config = Config()
+            config.library_path = os.path.join(directory, "library.json")
+            config.max_runs = 2
+            find_patterns(self.my_samples)
+            library = PatternLibrary(config.library_path)
+
+            with super().assertLogs(LOG) as cm:
+                find_patterns(self.my_samples)
+
+        super().assertLess(0, len(library))
+        warm_start = min(
+            len(library), round(config.warm_start_fraction * config.population_size)
+        )
+        super().assertIn(
+            f"INFO:patternomatic:Warm start: {warm_start} individuals seeded from the "
+            f"pattern library {config.library_path}",
+            cm.output,
+        )
+
+    def test_pattern_search(self):
+        """Incremental searches go on evolving the same populations"""
+        config = Config()
+        config.num_workers = 1
+        config.random_seed = 7
+        config.max_runs = 2
+        expected = find_patterns(self.my_samples)
+
+        search = PatternSearch(self.my_samples)
+        super().assertEqual(expected, search.evolve())
+        populations = list(search.populations)
+
+        patterns = search.add_samples(["Hello world!", "Hello there!"])
+        super().assertEqual(2, len(patterns))
+        super().assertListEqual(populations, search.populations)
+        super().assertEqual(3, len(search.samples))
+        super().assertListEqual([2, 1, 1], search.weights)
+
+    def test_generate_grammar(self):
+        """Grammars of streamed samples, parsed across workers or not, are the same"""
+        config = Config()
+        config.use_uniques = False
+        nlp = spacy.load("en_core_web_sm")
+        expected = dgg([nlp(sample) for sample in self.my_samples])
+
+        config.num_workers = 1
+        super().assertDictEqual(
+            expected, generate_grammar(iter(self.my_samples), chunk_size=1)
+        )
+
+        config.num_workers = 2
+        super().assertDictEqual(
+            expected, generate_grammar(iter(self.my_samples), chunk_size=1)
+        )
+
+    def test_find_patterns_within_time_budget(self):
+        """Once the time budget expires no more generations nor runs take place"""
+        config = Config()
+        config.max_runs = 3
+        config.max_generations = 10**6
+
+        with super().assertLogs(LOG) as cm:
+            patterns = find_patterns(self.my_samples, time_budget=1.0)
+
+        super().assertEqual(1, len(patterns))
+        super().assertIn(
+            "WARNING:patternomatic:Time budget expired after 1 out of 3 runs",
+            cm.output,
+        )
+        super().assertEqual(0.0, config.time_budget)
+
     def test_find_patterns_when_bad_language_provided(self):
         """Checks that providing an imaginary language model makes find_patterns use en_core_web_sm"""
         with super().assertLogs(LOG) as cm:
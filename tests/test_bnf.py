@@ -39,6 +39,7 @@ from patternomatic.settings.literals import (
     LOWER,
     LTH,
     NEGATION,
+    NORM,
     NOT_IN,
     ONE_OR_MORE,
     OP,
@@ -47,6 +48,7 @@ from patternomatic.settings.literals import (
     SHAPE,
     TAG,
     TEXT,
+    TEXT_WITH_WS,
     TOKEN_WILDCARD,
     UNDERSCORE,
     XPS,
@@ -77,6 +79,73 @@ class TestDG(unittest.TestCase):
         super().assertEqual(len(grammar[SHAPE]), 7)
         super().assertEqual(len(grammar[F]), 9)
 
+    def test_extend_grammar(self):
+        """Extended grammars append the new productions after the existing ones"""
+        grammar = bnf.dynamic_generator(self.samples[:1])
+        extended_grammar = bnf.extend_grammar(grammar, self.samples[1:])
+        full_grammar = bnf.dynamic_generator(self.samples)
+
+        super().assertListEqual(list(grammar), list(extended_grammar)[: len(grammar)])
+        for symbol, productions in grammar.items():
+            super().assertListEqual(
+                productions, extended_grammar[symbol][: len(productions)]
+            )
+        for symbol, productions in full_grammar.items():
+            super().assertCountEqual(productions, extended_grammar[symbol])
+
+    def test_extend_grammar_without_uniques(self):
+        """Extended grammars keep the repeated feature values when use uniques is false"""
+        self.config.use_uniques = False
+        self.config.use_extended_pattern_syntax = True
+        grammar = bnf.dynamic_generator(self.samples[:1])
+        extended_grammar = bnf.extend_grammar(grammar, self.samples)
+        full_grammar = bnf.dynamic_generator(self.samples[:1] + self.samples)
+
+        for symbol in bnf.REPEATED_FEATURES:
+            super().assertCountEqual(full_grammar[symbol], extended_grammar[symbol])
+
+    def test_stream_generator(self):
+        """Grammars of streams of samples equal the ones of the whole samples"""
+        for use_uniques, use_custom_attributes in ((True, True), (False, False)):
+            self.config.use_uniques = use_uniques
+            self.config.use_custom_attributes = use_custom_attributes
+
+            grammar = bnf.dynamic_generator(self.samples)
+            super().assertDictEqual(
+                grammar, bnf.stream_generator(iter(self.samples), chunk_size=1)
+            )
+
+            accumulator = bnf.FeatureAccumulator()
+            accumulator.add(self.samples[:1])
+            other_accumulator = bnf.FeatureAccumulator()
+            other_accumulator.add(self.samples[1:])
+            accumulator.merge(other_accumulator)
+            super().assertDictEqual(grammar, bnf.accumulated_generator(accumulator))
+
+    def test_features_seen(self):
+        """Token attribute columns resolve to the very values the tokens hold"""
+        self.config.use_custom_attributes = True
+        _, _, features, extended_features = bnf._features_seen(self.samples)
+        tokens = [token for sample in self.samples for token in sample]
+
+        for feature, attribute in ((ORTH, "orth_"), (LEMMA, "lemma_"), (TAG, "tag_")):
+            super().assertListEqual(
+                sorted(set(getattr(token, attribute) for token in tokens)),
+                features[feature],
+            )
+        for feature, attribute in (
+            (NORM, "norm_"),
+            (TEXT_WITH_WS, "text_with_ws"),
+        ):
+            super().assertListEqual(
+                sorted(set(getattr(token, attribute) for token in tokens)),
+                extended_features[UNDERSCORE][feature],
+            )
+
+        self.config.use_uniques = False
+        _, _, features, _ = bnf._features_seen(self.samples)
+        super().assertListEqual([token.lower_ for token in tokens], features[LOWER])
+
     def test_basic_grammar_without_uniques_dg(self):
         """Tests that basic grammar is correctly generated when use uniques is false"""
         self.config.use_uniques = False
@@ -139,6 +208,28 @@ class TestDG(unittest.TestCase):
 
         super().assertIn(TOKEN_WILDCARD, grammar[T])
 
+    def test_terminal_prefixes(self):
+        """Set operator terminals stack every distinct value list prefix just once"""
+        terminals = bnf.TerminalPrefixes([["a", "b"], [1, 2], ["a", "b", "c"], []])
+
+        super().assertEqual(5, len(terminals))
+        super().assertListEqual(
+            [["a"], ["a", "b"], [1], [1, 2], ["a", "b", "c"]], list(terminals)
+        )
+        super().assertListEqual(["a", "b", "c"], terminals[-1])
+        with super().assertRaises(IndexError):
+            _ = terminals[5]
+
+        extended = terminals.extend(bnf.TerminalPrefixes([["a", "c"], [1, 2, 3]]))
+        super().assertListEqual(
+            list(terminals) + [["a", "c"], [1, 2, 3]], list(extended)
+        )
+
+        self.config.use_extended_pattern_syntax = True
+        grammar = bnf.dynamic_generator(self.samples)
+        super().assertIs(grammar[IN], grammar[NOT_IN])
+        super().assertEqual(len(grammar[IN]), len(set(map(repr, grammar[IN]))))
+
     def test_get_features_per_token(self):
         """Tests that the number of features per token is properly set given different configurations"""
         features_dict = {
@@ -0,0 +1,248 @@
+""" Unit testing module for GE fitness cache module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import unittest
+
+import spacy
+
+from patternomatic.ge.cache import DecodeCache, FitnessCache, canonical_fenotype
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.individual import Individual
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.settings.config import Config
+from patternomatic.settings.literals import FitnessType
+
+
+class TestFitnessCache(unittest.TestCase):
+    """Unit Test class for GE FitnessCache object"""
+
+    config = Config()
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("Is she a rabbit?"),
+        nlp("This is a test"),
+    ]
+
+    grammar = dgg(samples)
+
+    def test_canonical_fenotype(self):
+        """Token attribute order does not change the canonical form of a fenotype"""
+        fenotype_1 = [{"ORTH": "a", "POS": "DET"}, {"LENGTH": {"IN": [1, 2]}}]
+        fenotype_2 = [{"POS": "DET", "ORTH": "a"}, {"LENGTH": {"IN": [1, 2]}}]
+        fenotype_3 = [{"LENGTH": {"IN": [1, 2]}}, {"POS": "DET", "ORTH": "a"}]
+
+        super().assertEqual(
+            canonical_fenotype(fenotype_1), canonical_fenotype(fenotype_2)
+        )
+        super().assertNotEqual(
+            canonical_fenotype(fenotype_1), canonical_fenotype(fenotype_3)
+        )
+        super().assertIsInstance(hash(canonical_fenotype(fenotype_1)), int)
+
+    def test_key_depends_on_configuration(self):
+        """Same fenotype under different fitness settings gets a different key"""
+        fenotype = [{"ORTH": "a"}]
+
+        self.config.fitness_function_type = FitnessType.BASIC
+        basic_key = FitnessCache.key(self.config, fenotype)
+        self.config.fitness_function_type = FitnessType.FULL_MATCH
+        full_match_key = FitnessCache.key(self.config, fenotype)
+        self.config.use_token_wildcard = True
+        wildcard_key = FitnessCache.key(self.config, fenotype)
+
+        super().assertEqual(3, len({basic_key, full_match_key, wildcard_key}))
+
+    def test_get_and_put(self):
+        """Hits and misses are accounted at the stats instance"""
+        stats = Stats()
+        cache = FitnessCache(stats, 2)
+
+        super().assertIsNone(cache.get(("a",)))
+        cache.put(("a",), 0.5)
+        super().assertEqual(0.5, cache.get(("a",)))
+        super().assertEqual(1, stats.cache_hits)
+        super().assertEqual(1, stats.cache_misses)
+
+    def test_lru_eviction(self):
+        """Least recently used fitness value is the one evicted"""
+        stats = Stats()
+        cache = FitnessCache(stats, 2)
+
+        cache.put(("a",), 0.1)
+        cache.put(("b",), 0.2)
+        cache.get(("a",))
+        cache.put(("c",), 0.3)
+
+        super().assertIn(("a",), cache)
+        super().assertNotIn(("b",), cache)
+        super().assertIn(("c",), cache)
+        super().assertEqual(2, len(cache))
+        super().assertEqual(1, stats.cache_evictions)
+
+    def test_disabled_cache(self):
+        """A cache with no room never stores anything"""
+        stats = Stats()
+        cache = FitnessCache(stats, 0)
+        cache.put(("a",), 0.1)
+
+        super().assertEqual(0, len(cache))
+        super().assertIsNone(cache.get(("a",)))
+        super().assertEqual((0, 0), (stats.cache_hits, stats.cache_misses))
+
+    def test_individuals_share_fitness(self):
+        """Individuals with the same fenotype are scored once"""
+        self.config.mutation_probability = 0.0
+        self.config.fitness_function_type = FitnessType.BASIC
+        stats = Stats()
+        cache = FitnessCache(stats, 10)
+        dna = "01110101100101100110010110010101"
+
+        context = EvaluationContext(
+            self.samples, self.grammar, stats, fitness_cache=cache
+        )
+
+        i1 = Individual(context, dna)
+        i2 = Individual(context, dna)
+
+        super().assertEqual(i1.fitness_value, i2.fitness_value)
+        super().assertEqual(1, stats.cache_misses)
+        super().assertEqual(1, stats.cache_hits)
+        super().assertEqual(1, len(cache))
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+class TestDecodeCache(unittest.TestCase):
+    """Unit Test class for GE DecodeCache object"""
+
+    config = Config()
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("Is she a rabbit?"),
+        nlp("This is a test"),
+    ]
+
+    grammar = dgg(samples)
+
+    def test_prefix_lookup(self):
+        """Codons beyond the consumed prefix do not matter, the genotype length does"""
+        cache = DecodeCache(Stats(), 10)
+        fenotype = [{"ORTH": "a"}]
+        cache.put([1, 2, 3, 4], 2, fenotype, 0.5)
+
+        super().assertListEqual([fenotype, 2, 0.5], cache.get([1, 2, 9, 9]))
+        super().assertIsNone(cache.get([1, 3, 3, 4]))
+        super().assertIsNone(cache.get([1, 2, 3]))
+
+    def test_wrapping_derivation(self):
+        """Derivations consuming more codons than available need the whole genotype"""
+        cache = DecodeCache(Stats(), 10)
+        cache.put([1, 2], 5, [{"ORTH": "a"}])
+
+        super().assertIsNotNone(cache.get([1, 2]))
+        super().assertIsNone(cache.get([1, 3]))
+
+    def test_lru_eviction(self):
+        """Least recently used derivation is the one evicted"""
+        cache = DecodeCache(Stats(), 2)
+
+        cache.put([1, 1], 1, [{"ORTH": "a"}])
+        cache.put([2, 2], 2, [{"ORTH": "b"}])
+        cache.get([1, 5])
+        cache.put([3, 3], 1, [{"ORTH": "c"}])
+
+        super().assertIsNotNone(cache.get([1, 1]))
+        super().assertIsNone(cache.get([2, 2]))
+        super().assertIsNotNone(cache.get([3, 3]))
+        super().assertEqual(2, len(cache))
+
+    def test_disabled_cache(self):
+        """A cache with no room never stores anything"""
+        cache = DecodeCache(Stats(), 0)
+        cache.put([1, 1], 1, [{"ORTH": "a"}])
+
+        super().assertEqual(0, len(cache))
+        super().assertIsNone(cache.get([1, 1]))
+
+    def test_neutral_mutation_short_circuit(self):
+        """Children differing at unread codons reuse fenotype and fitness value"""
+        self.config.mutation_probability = 0.0
+        stats = Stats()
+        fitness_cache = FitnessCache(stats, 10)
+        decode_cache = DecodeCache(stats, 10)
+
+        context = EvaluationContext(self.samples, self.grammar, stats)
+        parent = Individual(context)
+        while parent.consumed >= len(parent.int_genotype):
+            parent = Individual(context)
+
+        context = EvaluationContext(
+            self.samples,
+            self.grammar,
+            stats,
+            fitness_cache=fitness_cache,
+            decode_cache=decode_cache,
+        )
+        parent = Individual(context, parent.genotype)
+
+        # Flip the last codon, never read by the derivation
+        dna = parent.genotype.copy()
+        dna[-1] ^= 1
+        child = Individual(context, dna)
+
+        super().assertNotEqual(parent.int_genotype, child.int_genotype)
+        super().assertListEqual(parent.fenotype, child.fenotype)
+        super().assertEqual(parent.fitness_value, child.fitness_value)
+        super().assertEqual(1, stats.short_circuits)
+        super().assertEqual(1, stats.cache_misses)
+        super().assertEqual(0, stats.cache_hits)
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+""" Unit testing module for GE checkpoint and resume module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+import spacy
+
+from patternomatic.ge.checkpoint import Checkpointer, fingerprint
+from patternomatic.ge.population import Population
+from patternomatic.ge.records import PatternRecord
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.settings.config import Config
+
+
+class TestCheckpointer(unittest.TestCase):
+    """Unit Test class for GE Checkpointer object"""
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("Is she a rabbit?"),
+        nlp("This is a test"),
+    ]
+
+    grammar = dgg(samples)
+
+    def test_save_and_load(self):
+        """Checkpoints atomically replace the previous ones"""
+        stats = Stats()
+        stats.add_most_fitted(PatternRecord([{"ORTH": "a"}], 0.5, b"\x01"))
+
+        with Checkpointer(self.path, "digest") as checkpointer:
+            checkpointer.save(stats, run=1)
+            checkpointer.save(stats, run=2)
+
+        checkpoint = Checkpointer(self.path, "digest").load()
+        super().assertEqual(2, checkpoint.run)
+        super().assertIsNone(checkpoint.population)
+        super().assertEqual(stats.get_most_fitted(), checkpoint.stats.get_most_fitted())
+        super().assertListEqual(["checkpoint"], os.listdir(self.directory.name))
+
+    def test_load_mismatch(self):
+        """Checkpoints of other executions or broken ones are ignored"""
+        super().assertIsNone(Checkpointer(self.path, "digest").load())
+
+        with Checkpointer(self.path, "digest") as checkpointer:
+            checkpointer.save(Stats(), run=1)
+        super().assertIsNone(Checkpointer(self.path, "other digest").load())
+
+        with open(self.path, mode="wb") as f:
+            f.write(b"broken")
+        super().assertIsNone(Checkpointer(self.path, "digest").load())
+
+    def test_fingerprint(self):
+        """Fingerprints depend on the samples and the grammar shaping parameters"""
+        digest = fingerprint(["Hello"], "en_core_web_sm")
+        super().assertEqual(digest, fingerprint(["Hello"], "en_core_web_sm"))
+        super().assertNotEqual(digest, fingerprint(["Goodbye"], "en_core_web_sm"))
+
+        self.config.max_generations += 1
+        super().assertEqual(digest, fingerprint(["Hello"], "en_core_web_sm"))
+        self.config.use_token_wildcard = not self.config.use_token_wildcard
+        super().assertNotEqual(digest, fingerprint(["Hello"], "en_core_web_sm"))
+
+    def test_resume(self):
+        """A resumed evolution goes on as if it was never interrupted"""
+        self.config.max_generations = 4
+
+        np.random.seed(7)
+        expected = Population(self.samples, self.grammar, Stats())
+        expected.evolve()
+
+        # Interrupted after the checkpoint of the second generation
+        self.config.max_generations = 3
+        np.random.seed(7)
+        with Checkpointer(self.path, "digest", interval=2) as checkpointer:
+            interrupted = Population(
+                self.samples, self.grammar, Stats(), checkpointer=checkpointer
+            )
+            interrupted.evolve()
+
+        self.config.max_generations = 4
+        checkpoint = Checkpointer(self.path, "digest").load()
+        super().assertEqual(2, checkpoint.population["generations"])
+
+        checkpoint.restore_random_state()
+        resumed = Population(
+            self.samples, self.grammar, checkpoint.stats, state=checkpoint.population
+        )
+        resumed.evolve()
+
+        super().assertEqual(4, resumed.generations)
+        super().assertEqual(expected.best_record(), resumed.best_record())
+        super().assertListEqual(
+            [i.bin_genotype for i in expected.generation],
+            [i.bin_genotype for i in resumed.generation],
+        )
+        super().assertEqual(
+            expected.context.stats.evaluations_counter,
+            resumed.context.stats.evaluations_counter,
+        )
+
+    def test_state(self):
+        """Population states are compact and restored with no new evaluation"""
+        p = Population(self.samples, self.grammar, Stats())
+        p.step()
+        state = pickle.loads(pickle.dumps(p.state()))
+        super().assertEqual(
+            (len(p.generation), -(-self.config.dna_length // 8)),
+            state["genotypes"].shape,
+        )
+
+        stats = Stats()
+        restored = Population(self.samples, self.grammar, stats, state=state)
+        super().assertEqual(0, stats.evaluations_counter)
+        super().assertListEqual(
+            [(i.fenotype, i.fitness_value) for i in p.generation],
+            [(i.fenotype, i.fitness_value) for i in restored.generation],
+        )
+        super().assertEqual(p.best_record(), restored.best_record())
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance and checkpoint directory"""
+        self.config = Config()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "checkpoint")
+
+    def tearDown(self) -> None:
+        """Destroy Config instance and checkpoint directory"""
+        Config.clear_instance()
+        self.directory.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
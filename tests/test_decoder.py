@@ -0,0 +1,188 @@
+""" Unit testing module for GE compiled grammar decoder module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import json
+import random
+import re
+import unittest
+from itertools import cycle
+
+import spacy
+
+from patternomatic.ge.decoder import CompiledGrammar, compile_grammar
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.settings.config import Config
+from patternomatic.settings.literals import (
+    EF,
+    EQQ,
+    GEQ,
+    GTH,
+    IN,
+    LEQ,
+    LTH,
+    NOT_IN,
+    ORTH,
+    SLD,
+    SRD,
+    TOKEN_WILDCARD,
+    UNDERSCORE,
+    XPS,
+    XPS_AS,
+    F,
+    P,
+    S,
+    T,
+)
+
+
+def rewrite(grammar: dict, int_genotype: list) -> list:
+    """Reference decoder, the former regex rewriting of a symbolic string"""
+    done = False
+    symbolic_string = grammar[S][0]
+    circular = cycle(int_genotype)
+
+    while done is not True:
+        old_symbolic_string = symbolic_string
+        ci = next(circular)
+
+        for key in grammar.keys():
+            fire = divmod(ci, len(grammar[key]))[1]
+
+            if key in [T, XPS]:
+                if grammar[key][fire] == TOKEN_WILDCARD:
+                    feature = "{}"
+                else:
+                    feature = "{" + str(grammar[key][fire]) + "}"
+            elif key is UNDERSCORE:
+                feature = '"_"' + ": " + "{" + str(grammar[key][fire]) + "}"
+            elif key in [P, T, F, EF]:
+                feature = str(grammar[key][fire])
+            elif key in [IN, NOT_IN]:
+                key_r = key.replace(SLD, "").replace(SRD, "")
+                feature = (
+                    '"' + key_r + '"' + ":" + str(grammar[key][fire]).replace("'", '"')
+                )
+            elif key in [GTH, LTH, GEQ, LEQ, EQQ]:
+                feature = '"' + XPS_AS[key] + '"' + ":" + str(grammar[key][fire])
+            else:
+                key_r = key.replace(SLD, "").replace(SRD, "")
+                fired_rule = str(grammar[key][fire])
+                if fired_rule != XPS:
+                    feature = '"' + key_r + '"' + ":" + '"' + fired_rule + '"'
+                else:
+                    feature = '"' + key_r + '"' + ":" + fired_rule
+
+            symbolic_string = re.sub(key, feature, symbolic_string, 1)
+
+        if old_symbolic_string == symbolic_string:
+            done = True
+
+    return json.loads("[" + symbolic_string + "]")
+
+
+class TestCompiledGrammar(unittest.TestCase):
+    """Unit Test class for GE CompiledGrammar object"""
+
+    config = Config()
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("Is she a rabbit?"),
+        nlp("This is a test"),
+    ]
+
+    def test_compile_grammar(self):
+        """Grammars are compiled just once"""
+        grammar = compile_grammar(dgg(self.samples))
+
+        super().assertIsInstance(grammar, CompiledGrammar)
+        super().assertIs(grammar, compile_grammar(grammar))
+
+    def test_unresolved_symbol(self):
+        """Symbols the grammar does not define make decoding fail"""
+        grammar = CompiledGrammar({S: [P], P: [T], T: [F]})
+
+        with super().assertRaises(ValueError):
+            grammar.decode([0])
+
+    def test_consumed_codons(self):
+        """Derivations count the codons they actually read"""
+        grammar = CompiledGrammar(
+            {S: [P], P: [T + "," + T], T: [F], F: [ORTH], ORTH: ["a", "b"]}
+        )
+
+        super().assertTupleEqual(
+            ([{"ORTH": "a"}, {"ORTH": "b"}], 2), grammar.derive([0, 1, 1, 1])
+        )
+        super().assertTupleEqual(
+            ([{"ORTH": "b"}, {"ORTH": "b"}], 2), grammar.derive([1])
+        )
+
+    def test_same_output_as_rewriting(self):
+        """Property test, decoding equals the former string rewriting"""
+        rnd = random.Random(0)
+        setups = [
+            {},
+            {"use_grammar_operators": True},
+            {"use_extended_pattern_syntax": True},
+            {"use_token_wildcard": True, "features_per_token": 2},
+            {"use_boolean_features": True, "features_per_token": 3},
+            {"use_custom_attributes": True, "features_per_token": 2},
+            {"use_uniques": False},
+        ]
+
+        for setup in setups:
+            Config.clear_instance()
+            self.config = Config()
+            for option, value in setup.items():
+                setattr(self.config, option, value)
+            grammar = dgg(self.samples)
+            compiled = CompiledGrammar(grammar)
+
+            for _ in range(200):
+                int_genotype = [
+                    rnd.randrange(2 ** rnd.randint(1, 15))
+                    for _ in range(rnd.choice((1, 2, 4, 8, 16)))
+                ]
+                try:
+                    expected = rewrite(grammar, int_genotype)
+                except json.JSONDecodeError:
+                    # Terminals the string rewriting could not even parse
+                    continue
+
+                super().assertListEqual(expected, compiled.decode(int_genotype))
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+if __name__ == "__main__":
+    unittest.main()
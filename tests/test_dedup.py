@@ -0,0 +1,115 @@
+""" Unit testing module for NLP sample deduplication module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import unittest
+
+import spacy
+
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.individual import Fitness, Individual
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.nlp.dedup import deduplicate, sample_weights
+from patternomatic.nlp.matrix import SampleIndex, SampleMatrix
+from patternomatic.settings.config import Config
+from patternomatic.settings.literals import FitnessType
+
+
+class TestDeduplicate(unittest.TestCase):
+    """Unit Test class for NLP sample deduplication"""
+
+    config = Config()
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("I am a raccoon!"),
+        nlp("This is a test"),
+        nlp("I am a raccoon!"),
+        nlp("This is a test"),
+    ]
+
+    def test_deduplicate(self):
+        """Samples with the same token attributes collapse into the first one"""
+        unique_samples, sample_ids = deduplicate(self.samples)
+
+        super().assertListEqual(
+            [self.samples[0], self.samples[1], self.samples[3]], unique_samples
+        )
+        super().assertListEqual([0, 1, 0, 2, 0, 2], sample_ids)
+        super().assertListEqual([3, 1, 2], sample_weights(sample_ids))
+
+    def test_weighted_fitness(self):
+        """Weighted unique samples score the same as the duplicated samples"""
+        self.config.mutation_probability = 0.0
+        unique_samples, sample_ids = deduplicate(self.samples)
+        weights = sample_weights(sample_ids)
+        sample_matrix = SampleMatrix(unique_samples)
+        sample_index = SampleIndex(unique_samples)
+        grammar = dgg(self.samples)
+
+        fenotypes = [
+            Individual(EvaluationContext(self.samples, grammar, Stats())).fenotype
+            for _ in range(100)
+        ]
+        fenotypes.extend(
+            [{"LOWER": token.lower_}] + [{}] * (len(sample) - 1)
+            for sample in self.samples
+            for token in sample
+        )
+
+        for fitness_function_type in FitnessType:
+            self.config.fitness_function_type = fitness_function_type
+            for fenotype in fenotypes:
+                expected = Fitness(self.config, self.samples, fenotype).__call__()
+                super().assertAlmostEqual(
+                    expected,
+                    Fitness(
+                        self.config, unique_samples, fenotype, weights=weights
+                    ).__call__(),
+                )
+                super().assertAlmostEqual(
+                    expected,
+                    Fitness(
+                        self.config,
+                        unique_samples,
+                        fenotype,
+                        sample_matrix,
+                        sample_index,
+                        weights,
+                    ).__call__(),
+                )
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+""" Unit testing module for GE parallel fitness evaluation module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import unittest
+
+import spacy
+
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.executor import FitnessExecutor
+from patternomatic.ge.individual import BatchFitness, Individual
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.settings.config import Config
+from patternomatic.settings.literals import FitnessType
+
+
+class TestFitnessExecutor(unittest.TestCase):
+    """Unit Test class for GE FitnessExecutor object"""
+
+    config = Config()
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("Is she a rabbit?"),
+        nlp("This is a test"),
+    ]
+
+    def test_map(self):
+        """Worker processes score like the current one, in the same order"""
+        self.config.fitness_workers = 2
+        self.config.fitness_chunk_size = 3
+        self.config.use_grammar_operators = True
+        weights = [1, 2, 1, 3]
+        grammar = dgg(self.samples)
+
+        fenotypes = [
+            Individual(
+                EvaluationContext(self.samples, grammar, Stats()), evaluate=False
+            ).fenotype
+            for _ in range(20)
+        ]
+
+        for fitness_function_type in FitnessType:
+            self.config.fitness_function_type = fitness_function_type
+            expected = BatchFitness(
+                EvaluationContext(self.samples, weights=weights)
+            ).score(fenotypes)
+            with FitnessExecutor(self.samples, weights) as fitness_executor:
+                super().assertListEqual(expected, fitness_executor.map(fenotypes))
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,18 +18,22 @@ You should have received a copy of the GNU Lesser General Public License
 along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
+import pickle
 import unittest
 
+import numpy as np
 import spacy
 
-from patternomatic.ge.individual import Fitness, Individual
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.decoder import compile_grammar
+from patternomatic.ge.individual import BatchFitness, Fitness, Individual
 from patternomatic.ge.stats import Stats
 from patternomatic.nlp.bnf import dynamic_generator as dgg
 from patternomatic.settings.config import Config
 from patternomatic.settings.literals import (
     GTH,
-    IN,
     IS_CURRENCY,
+    LENGTH,
     NOT_IN,
     OP,
     ORTH,
@@ -65,20 +69,18 @@ class TestIndividual(unittest.TestCase):
 
     def test_init(self):
         """Test that Individual instantiation works"""
-        i = Individual(self.samples, self.grammar, self.stats)
+        i = Individual(self.context())
         super().assertIs(type(i), Individual)
 
     def test_init_with_dna(self):
         """Test that Individual instantiation works when providing dna"""
-        i = Individual(
-            self.samples, self.grammar, self.stats, "10101010101010101010101010101010"
-        )
+        i = Individual(self.context(), "10101010101010101010101010101010")
         super().assertNotEqual(i, None)
 
     def test_transcription(self):
         """Check for transcription idempotency"""
         self.config.mutation_probability = 0.0
-        i = Individual(self.samples, self.grammar, self.stats, "11111111")
+        i = Individual(self.context(), "11111111")
         i._transcription()
         i._transcription()
         i._transcription()
@@ -88,10 +90,11 @@ class TestIndividual(unittest.TestCase):
     def test_translation(self):
         """Check for translation idempotency"""
         self.config.mutation_probability = 0.0
-        i = Individual(self.samples, self.grammar, self.stats, "11111111")
-        i._translation()
-        i._translation()
-        i._translation()
+        i = Individual(self.context(), "11111111")
+        grammar = compile_grammar(self.grammar)
+        grammar.derive(i.int_genotype)[0]
+        grammar.derive(i.int_genotype)[0]
+        grammar.derive(i.int_genotype)[0]
         super().assertListEqual(
             i.fenotype,
             [
@@ -103,19 +106,28 @@ class TestIndividual(unittest.TestCase):
             ],
         )
 
+    def test_genotype(self):
+        """Genotype is an array of bits with a binary string view"""
+        self.config.mutation_probability = 0.0
+        i = Individual(self.context(), "0110")
+        super().assertListEqual([0, 1, 1, 0], i.genotype.tolist())
+        super().assertEqual("0110", i.bin_genotype)
+        super().assertEqual(
+            self.config.dna_length,
+            len(Individual(self.context()).bin_genotype),
+        )
+
     def test_mutation(self):
         """Checks that mutation works"""
         self.config.mutation_probability = 1.0
-        i = Individual(self.samples, self.grammar, self.stats, "11111111")
+        i = Individual(self.context(), "11111111")
         super().assertNotEqual(i.bin_genotype, "11111111")
 
     def test_fitness_basic(self):
         """Fitness "basic" sets fitness"""
         self.config.mutation_probability = 0.0
         self.config.fitness_function_type = FitnessType.BASIC
-        i = Individual(
-            self.samples, self.grammar, self.stats, "01110101100101100110010110010101"
-        )
+        i = Individual(self.context(), "01110101100101100110010110010101")
 
         super().assertEqual(i.fitness_value, 0.25)
 
@@ -123,9 +135,7 @@ class TestIndividual(unittest.TestCase):
         """Fitness "full match" sets fitness"""
         self.config.mutation_probability = 0.0
         self.config.fitness_function_type = FitnessType.FULL_MATCH
-        i = Individual(
-            self.samples, self.grammar, self.stats, "01101010100001101000110111000100"
-        )
+        i = Individual(self.context(), "01101010100001101000110111000100")
 
         super().assertEqual(i.fitness_value, 0.25)
 
@@ -143,75 +153,109 @@ class TestIndividual(unittest.TestCase):
         f.fenotype = 1.0
         super().assertEqual(1.0, f._wildcard_penalty(1.0))
 
+    def test_batch_fitness(self):
+        """Batch evaluation scores individuals as they were scored one by one"""
+        self.config.mutation_probability = 0.0
+        self.config.use_grammar_operators = True
+        grammar = dgg(self.samples)
+
+        for fitness_function_type in FitnessType:
+            self.config.fitness_function_type = fitness_function_type
+            context = self.context(grammar)
+            individuals = [Individual(context, evaluate=False) for _ in range(50)]
+            individuals.append(Individual(context, individuals[0].bin_genotype))
+            super().assertIsNone(individuals[0].fitness_value)
+
+            BatchFitness(context)(individuals[:-1])
+            super().assertEqual(
+                individuals[-1].fitness_value, individuals[0].fitness_value
+            )
+            for i in individuals:
+                super().assertEqual(
+                    Fitness(self.config, self.samples, i.fenotype).__call__(),
+                    i.fitness_value,
+                )
+
     def test_translate(self):
         """Verifies conversions over the BNF are done correctly"""
         i = object.__new__(Individual)
+        i.genotype = np.zeros(self.config.codon_length - 1, dtype=np.uint8)
+        i.codon_length = self.config.codon_length
+        root = {S: [P], P: [T]}
 
-        # Root
-        i.grammar = {S: [P]}
-        super().assertEqual('"S":"<P>"', i._translate(0, S, S))
-
-        # Pattern root symbol to Token symbol
-        i.grammar = {P: [T]}
-        super().assertEqual(T, i._translate(0, P, P))
-
-        # Token symbol to Feature symbol inside Token
-        i.grammar = {T: [F]}
-        super().assertEqual("{<F>}", i._translate(0, T, T))
+        # Token symbol to Feature symbol inside Token, basic terminal conversion
+        grammar = {**root, T: [F], F: [ORTH], ORTH: ["Test"]}
+        super().assertListEqual([{"ORTH": "Test"}], self.translate(i, grammar))
 
         # Token symbol to wildcard
-        i.grammar = {T: [TOKEN_WILDCARD]}
-        super().assertEqual("{}", i._translate(0, T, T))
-
-        # Feature symbol to specific symbol
-        i.grammar = {F: [ORTH]}
-        super().assertEqual("{<ORTH>}", i._translate(0, F, "{<F>}"))
-
-        # Basic Terminal conversion
-        i.grammar = {ORTH: ["Test"]}
-        super().assertEqual('{"ORTH":"Test"}', i._translate(0, ORTH, "{<ORTH>}"))
+        grammar = {**root, T: [TOKEN_WILDCARD]}
+        super().assertListEqual([{}], self.translate(i, grammar))
 
-        # Underscore conversion
-        i.grammar = {UNDERSCORE: [IS_CURRENCY]}
-        super().assertEqual(
-            '{"_": {<CUSTOM_IS_CURRENCY>}}',
-            i._translate(0, UNDERSCORE, "{<UNDERSCORE>}"),
-        )
-
-        # Underscore terminal conversion
-        i.grammar = {IS_CURRENCY: [True]}
-        super().assertEqual(
-            '{"_": {"CUSTOM_IS_CURRENCY":"True"}}',
-            i._translate(0, IS_CURRENCY, '{"_": {<CUSTOM_IS_CURRENCY>}}'),
+        # Underscore conversion, underscore terminal conversion
+        grammar = {**root, T: [UNDERSCORE], UNDERSCORE: [IS_CURRENCY]}
+        grammar[IS_CURRENCY] = [True]
+        super().assertListEqual(
+            [{"_": {"CUSTOM_IS_CURRENCY": "True"}}], self.translate(i, grammar)
         )
 
         # Grammar Operators conversion
-        i.grammar = {OP: ZERO_OR_MORE}
-        super().assertEqual('"OP":"*"', i._translate(0, OP, "<OP>"))
-
-        # Extended Pattern Syntax conversion (base)
-        i.grammar = {XPS: [IN]}
-        super().assertEqual("{<IN>}", i._translate(0, XPS, "<XPS>"))
-
-        i.grammar = {ORTH: [XPS]}
-        super().assertEqual('"ORTH":<XPS>', i._translate(0, ORTH, "<ORTH>"))
+        grammar = {**root, T: [F], F: [ORTH + "," + OP], OP: ZERO_OR_MORE}
+        grammar[ORTH] = ["Test"]
+        super().assertListEqual(
+            [{"ORTH": "Test", "OP": "*"}], self.translate(i, grammar)
+        )
 
         # Extended Pattern Syntax conversion (terminal logical)
-        i.grammar = {NOT_IN: [["Test"]]}
-        super().assertEqual(
-            '{"ORTH": {"NOT_IN":["Test"]}}',
-            i._translate(0, NOT_IN, '{"ORTH": {<NOT_IN>}}'),
+        grammar = {**root, T: [F], F: [ORTH], XPS: [NOT_IN], NOT_IN: [["Test"]]}
+        grammar[ORTH] = [XPS]
+        super().assertListEqual(
+            [{"ORTH": {"NOT_IN": ["Test"]}}], self.translate(i, grammar)
         )
 
         # Extended Pattern Syntax (terminal arithmetical)
-        i.grammar = {GTH: [5]}
-        super().assertEqual(
-            '{"LENGTH": {">":5}}', i._translate(0, GTH, '{"LENGTH": {<GTH>}}')
+        grammar = {**root, T: [F], F: [LENGTH], XPS: [GTH], GTH: [5]}
+        grammar[LENGTH] = [XPS]
+        super().assertListEqual([{"LENGTH": {">": 5}}], self.translate(i, grammar))
+
+    def test_codon_length(self):
+        """Transcription reads the codon length of the context, not the Config"""
+        self.config.mutation_probability = 0.0
+        i = Individual(self.context(), "11111111")
+        self.config.codon_length = 4
+        super().assertListEqual(i.int_genotype, [127, 1])
+
+    def test_context(self):
+        """Individuals share their context, carrying just their own outcome"""
+        self.config.mutation_probability = 0.0
+        context = self.context()
+        i1 = Individual(context, "11111111")
+        i2 = Individual(context, "11111111")
+        super().assertEqual(i1.fenotype, i2.fenotype)
+
+        state = i1.__getstate__()
+        super().assertSetEqual(
+            {"genotype", "codon_length", "fenotype", "consumed", "fitness_value"},
+            set(state),
         )
 
+        i3 = pickle.loads(pickle.dumps(i1))
+        super().assertListEqual(i1.int_genotype, i3.int_genotype)
+        super().assertEqual(i1.fitness_value, i3.fitness_value)
+
     #
     # Helpers
     #
+    def context(self, grammar: dict = None) -> EvaluationContext:
+        """EvaluationContext over the test samples, under the current Config"""
+        return EvaluationContext(
+            self.samples, grammar if grammar is not None else self.grammar, self.stats
+        )
+
+    @staticmethod
+    def translate(individual: Individual, grammar: dict) -> list:
+        """Decodes the integer representation of an individual through a grammar"""
+        return compile_grammar(grammar).derive(individual.int_genotype)[0]
+
     def setUp(self) -> None:
         """Fresh Config instance"""
         self.config = Config()
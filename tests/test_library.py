@@ -0,0 +1,167 @@
+""" Unit testing module for GE pattern library module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import os
+import tempfile
+import unittest
+
+import spacy
+
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.decoder import compile_grammar
+from patternomatic.ge.individual import Individual, transcription
+from patternomatic.ge.library import PatternLibrary, grammar_fingerprint
+from patternomatic.ge.population import Population
+from patternomatic.ge.records import PatternRecord
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.settings.config import Config
+from patternomatic.settings.log import LOG
+
+
+class TestPatternLibrary(unittest.TestCase):
+    """Unit Test class for GE PatternLibrary object"""
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("Is she a rabbit?"),
+        nlp("This is a test"),
+    ]
+
+    other_samples = [nlp("Goodbye world!"), nlp("Hello world!")]
+
+    def test_add_and_persist(self):
+        """Just the most fitted distinct patterns of each grammar are kept"""
+        library = PatternLibrary(self.path, max_size=2)
+        library.add(
+            "grammar",
+            [
+                PatternRecord([{"ORTH": "a"}], 0.25, b"\x00", run=1),
+                PatternRecord([{"ORTH": "b"}], 0.75, b"\x01"),
+                PatternRecord([{"ORTH": "a"}], 0.5, b"\x01\x00"),
+            ],
+        )
+        library.add("other grammar", [PatternRecord([{"ORTH": "c"}], 0.5, b"\x01")])
+        library.add("grammar", [PatternRecord([{"ORTH": "c"}], 0.25, b"\x00")])
+
+        super().assertListEqual(
+            [
+                PatternRecord([{"ORTH": "b"}], 0.75, b"\x01"),
+                PatternRecord([{"ORTH": "a"}], 0.5, b"\x01\x00"),
+            ],
+            library.entries["grammar"],
+        )
+
+        library.persist()
+        super().assertDictEqual(library.entries, PatternLibrary(self.path).entries)
+        super().assertEqual(3, len(PatternLibrary(self.path)))
+
+    def test_unreadable(self):
+        """Broken library files are ignored"""
+        with open(self.path, mode="w") as f:
+            f.write("broken")
+
+        with super().assertLogs(LOG) as cm:
+            library = PatternLibrary(self.path)
+
+        super().assertEqual(0, len(library))
+        super().assertIn("unreadable", cm.output[0])
+
+    def test_seeds(self):
+        """Patterns of the same grammar, or still decoding the same, seed populations"""
+        grammar = compile_grammar(dgg(self.samples))
+        context = EvaluationContext(self.samples, grammar, Stats())
+        records = [
+            PatternRecord.from_individual(Individual(context)) for _ in range(10)
+        ]
+
+        library = PatternLibrary(self.path)
+        library.add(grammar_fingerprint(grammar), records)
+        best = library.entries[grammar_fingerprint(grammar)]
+
+        seeds = library.seeds(grammar_fingerprint(grammar), grammar, 3)
+        super().assertListEqual(
+            [record.genotype for record in best[:3]], [s.tobytes() for s in seeds]
+        )
+        super().assertListEqual(list(), library.seeds("grammar", grammar, 0))
+
+        other_grammar = compile_grammar(dgg(self.other_samples))
+        other_fingerprint = grammar_fingerprint(other_grammar)
+        compatible = [
+            record
+            for record in best
+            if other_grammar.decode(transcription(record.dna, self.config.codon_length))
+            == record.fenotype
+        ]
+        super().assertListEqual(
+            [record.genotype for record in compatible],
+            [
+                s.tobytes()
+                for s in library.seeds(other_fingerprint, other_grammar, len(best))
+            ],
+        )
+
+    def test_grammar_fingerprint(self):
+        """Fingerprints depend on the grammar and the genotype layout"""
+        grammar = compile_grammar(dgg(self.samples))
+        digest = grammar_fingerprint(grammar)
+        super().assertEqual(
+            digest, grammar_fingerprint(compile_grammar(dgg(self.samples)))
+        )
+        super().assertNotEqual(
+            digest, grammar_fingerprint(compile_grammar(dgg(self.other_samples)))
+        )
+
+        self.config.codon_length += 1
+        super().assertNotEqual(digest, grammar_fingerprint(grammar))
+
+    def test_warm_start(self):
+        """Seeded populations start with the seeds as they are"""
+        grammar = compile_grammar(dgg(self.samples))
+        context = EvaluationContext(self.samples, grammar, Stats())
+        seeds = [Individual(context).genotype for _ in range(2)]
+
+        p = Population(self.samples, grammar, Stats(), seeds=seeds)
+        super().assertEqual(self.config.population_size, len(p.generation))
+        super().assertListEqual(
+            [seed.tolist() for seed in seeds],
+            [i.genotype.tolist() for i in p.generation[:2]],
+        )
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance and library directory"""
+        self.config = Config()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "library.json")
+
+    def tearDown(self) -> None:
+        """Destroy Config instance and library directory"""
+        Config.clear_instance()
+        self.directory.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+""" Unit testing module for NLP token attribute matrix module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import unittest
+
+import spacy
+
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.individual import Fitness, Individual
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.nlp.matrix import SampleIndex, SampleMatrix
+from patternomatic.settings.config import Config
+from patternomatic.settings.literals import FitnessType
+
+
+class TestSampleMatrix(unittest.TestCase):
+    """Unit Test class for NLP SampleMatrix object"""
+
+    config = Config()
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [
+        nlp("I am a raccoon!"),
+        nlp("You are a cat!"),
+        nlp("Is she a rabbit?"),
+        nlp("This is a test"),
+        nlp("Hello Mister Puffin"),
+    ]
+
+    sample_matrix = SampleMatrix(samples)
+
+    def test_init(self):
+        """Every token of every sample gets a row"""
+        super().assertEqual(len(self.samples), len(self.sample_matrix))
+        super().assertEqual(
+            sum(len(sample) for sample in self.samples),
+            len(self.sample_matrix.tokens),
+        )
+
+    def test_extend(self):
+        """Extended matrices are the same as the ones encoding every sample at once"""
+        sample_matrix = SampleMatrix(self.samples[:2])
+        sample_matrix.extend(self.samples[2:])
+
+        for attribute in ("tokens", "doc_ids", "remaining", "starts", "lengths"):
+            super().assertListEqual(
+                getattr(self.sample_matrix, attribute).tolist(),
+                getattr(sample_matrix, attribute).tolist(),
+            )
+
+    def test_encode(self):
+        """Patterns beyond plain token attribute values are not encoded"""
+        super().assertIsNotNone(self.sample_matrix.encode([{"ORTH": "a"}, {}]))
+        super().assertIsNone(self.sample_matrix.encode([{"ORTH": "a", "OP": "?"}]))
+        super().assertIsNone(self.sample_matrix.encode([{"ORTH": {"IN": ["a"]}}]))
+        super().assertIsNone(self.sample_matrix.encode([{"_": {"CUSTOM_NORM_": "a"}}]))
+        super().assertIsNone(self.sample_matrix.encode([{"IS_ALPHA": "True"}]))
+
+    def test_match(self):
+        """Partial matches are found at any position of any sample"""
+        matched = self.sample_matrix.match(
+            self.sample_matrix.encode([{"LOWER": "a"}, {}])
+        )
+        super().assertListEqual([True, True, True, True, False], matched.tolist())
+
+    def test_full_match(self):
+        """Full matches need the pattern to span the whole sample"""
+        encoded = self.sample_matrix.encode(
+            [{"ORTH": "Hello"}, {"ORTH": "Mister"}, {"ORTH": "Puffin"}]
+        )
+        super().assertListEqual(
+            [False, False, False, False, True],
+            self.sample_matrix.full_match(encoded).tolist(),
+        )
+        super().assertFalse(self.sample_matrix.full_match(encoded[:2]).any())
+
+    def test_same_fitness_as_matcher(self):
+        """Differential test, matrix and Spacy's Matcher fitness values agree"""
+        self.config.mutation_probability = 0.0
+
+        for fitness_function_type in FitnessType:
+            self.config.fitness_function_type = fitness_function_type
+            for codon_length in (2, 3, 8):
+                self.config.codon_length = codon_length
+                self.config.dna_length = (
+                    codon_length * self.config.num_codons_per_individual
+                )
+                grammar = dgg(self.samples)
+
+                for _ in range(100):
+                    fenotype = Individual(
+                        EvaluationContext(self.samples, grammar, Stats())
+                    ).fenotype
+                    super().assertAlmostEqual(
+                        Fitness(self.config, self.samples, fenotype).__call__(),
+                        Fitness(
+                            self.config, self.samples, fenotype, self.sample_matrix
+                        ).__call__(),
+                    )
+
+                for sample in self.samples:
+                    for start in range(len(sample)):
+                        fenotype = [
+                            {"LOWER": token.lower_, "POS": token.pos_}
+                            for token in sample[start:]
+                        ]
+                        super().assertAlmostEqual(
+                            Fitness(self.config, self.samples, fenotype).__call__(),
+                            Fitness(
+                                self.config,
+                                self.samples,
+                                fenotype,
+                                self.sample_matrix,
+                            ).__call__(),
+                        )
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+class TestSampleIndex(unittest.TestCase):
+    """Unit Test class for NLP SampleIndex object"""
+
+    config = Config()
+
+    samples = TestSampleMatrix.samples
+
+    sample_index = SampleIndex(samples)
+
+    def test_full_match(self):
+        """Full matches are the bits set after intersecting every constraint"""
+        encoded = self.sample_index.encode(
+            [{"ORTH": "Hello"}, {"ORTH": "Mister"}, {"ORTH": "Puffin"}]
+        )
+        super().assertEqual(0b10000, self.sample_index.full_match(encoded))
+        super().assertEqual(0, self.sample_index.full_match(encoded[:2]))
+        super().assertEqual(
+            0b10000, self.sample_index.full_match(self.sample_index.encode([{}] * 3))
+        )
+
+    def test_extend(self):
+        """Extended indexes are the same as the ones indexing every sample at once"""
+        sample_index = SampleIndex(self.samples[:2])
+        sample_index.extend(self.samples[2:])
+
+        super().assertEqual(len(self.sample_index), len(sample_index))
+        super().assertDictEqual(self.sample_index.lengths, sample_index.lengths)
+        super().assertDictEqual(self.sample_index._bitsets, sample_index._bitsets)
+
+    def test_same_fitness_as_matcher(self):
+        """Differential test, index and Spacy's Matcher full match fitness agree"""
+        self.config.mutation_probability = 0.0
+        self.config.fitness_function_type = FitnessType.FULL_MATCH
+        grammar = dgg(self.samples)
+
+        fenotypes = [
+            Individual(EvaluationContext(self.samples, grammar, Stats())).fenotype
+            for _ in range(100)
+        ]
+        fenotypes.extend(
+            [{"LOWER": token.lower_, "POS": token.pos_} for token in sample]
+            for sample in self.samples
+        )
+
+        for fenotype in fenotypes:
+            super().assertAlmostEqual(
+                Fitness(self.config, self.samples, fenotype).__call__(),
+                Fitness(
+                    self.config, self.samples, fenotype, sample_index=self.sample_index
+                ).__call__(),
+            )
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+if __name__ == "__main__":
+    unittest.main()
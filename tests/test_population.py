@@ -19,24 +19,37 @@ along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
 import unittest
+from unittest import mock
 
 import spacy
 
-from patternomatic.ge.individual import Individual
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.decoder import compile_grammar
+from patternomatic.ge.individual import Fitness, Individual, transcription
 from patternomatic.ge.population import (
+    FitnessIndex,
+    IslandModel,
     Population,
+    PopulationStore,
     Recombination,
     Replacement,
     Selection,
+    island_types,
+    migration_sources,
+    migration_targets,
 )
 from patternomatic.ge.stats import Stats
 from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.nlp.bnf import extend_grammar
 from patternomatic.settings.config import Config
 from patternomatic.settings.literals import (
+    FitnessEngine,
     FitnessType,
+    MigrationTopology,
     RecombinationType,
     ReplacementType,
     SelectionType,
+    StopReason,
 )
 
 
@@ -81,6 +94,14 @@ class TestPopulation(BasePopulationTest):
         p = Population(self.samples, self.grammar, self.stats)
 
         super().assertIsInstance(p.generation[0], Individual)
+        super().assertEqual(self.config.population_size, len(p.generation))
+
+        self.config.population_size = 7
+        p = Population(self.samples, self.grammar, self.stats)
+        super().assertEqual(7, len(p.generation))
+
+        p.step()
+        super().assertEqual(7, len(p.generation))
 
     def test_best_challenge(self):
         """Tests that the most fitted individual occupies the population's best_individual slot"""
@@ -88,9 +109,7 @@ class TestPopulation(BasePopulationTest):
         self.config.fitness_function_type = FitnessType.BASIC
         p = Population(self.samples, self.grammar, self.stats)
         self.config.mutation_probability = 0.0
-        p.generation[0] = Individual(
-            self.samples, self.grammar, self.stats, "01110101100101100110010110010101"
-        )
+        p.generation[0] = Individual(p.context, "01110101100101100110010110010101")
         self.config.mutation_probability = 0.5
         p.evolve()
 
@@ -107,11 +126,20 @@ class TestPopulation(BasePopulationTest):
         super().assertNotEqual(p.generation, mating_pool)
 
     def test_k_tournament(self):
-        """Test that k tournament raises error"""
+        """Test that k tournament works as expected"""
         self.config.selection_type = SelectionType.K_TOURNAMENT
         p = Population(self.samples, self.grammar, self.stats)
-        with super().assertRaises(NotImplementedError):
-            _ = p.selection(p.generation)
+        mating_pool = p.selection(p.generation)
+
+        super().assertEqual(len(p.generation) + 1, len(mating_pool))
+        super().assertEqual(2, len(p.selection(p.generation, 2)))
+
+        # Tournaments as big as to take the most fitted individual every time
+        self.config.k_value = 1000
+        best = max(i.fitness_value for i in p.generation)
+        super().assertTrue(
+            all(i.fitness_value == best for i in p.selection(p.generation))
+        )
 
     def test_random_one_point_crossover(self):
         """Test that crossover 'random one point' works as expected"""
@@ -157,31 +185,175 @@ class TestPopulation(BasePopulationTest):
         self.config.fitness_function_type = FitnessType.BASIC
         p = Population(self.samples, self.grammar, self.stats)
         self.config.mutation_probability = 0.0
-        p.generation[0] = Individual(
-            self.samples, self.grammar, self.stats, "01110101100101100110010110010101"
-        )
+        p.generation[0] = Individual(p.context, "01110101100101100110010110010101")
         self.config.mutation_probability = 0.5
         p.evolve()
         super().assertLessEqual(0.25, p.generation[0].fitness_value)
 
+    def test_best_record(self):
+        """The best individual of a run is recorded along with when it was found"""
+        self.config.max_generations = 3
+        stats = Stats()
+        p = Population(self.samples, self.grammar, stats)
+        p.evolve()
+
+        record = stats.get_most_fitted()
+        super().assertListEqual(p.best_individual.fenotype, record.fenotype)
+        super().assertEqual(p.best_individual.fitness_value, record.fitness_value)
+        super().assertEqual(p.best_individual.bin_genotype, record.bin_genotype)
+        super().assertEqual(0, record.run)
+        super().assertIn(record.generation, range(1, p.generations + 1))
+        super().assertLessEqual(record.evaluations, stats.evaluations_counter)
+
+        # Before evolving any generation, the best one is the genesis most fitted
+        p = Population(self.samples, self.grammar, Stats())
+        record = p.best_record()
+        super().assertEqual(
+            max(i.fitness_value for i in p.generation), record.fitness_value
+        )
+        super().assertIs(
+            max(p.generation, key=lambda i: i.fitness_value), p.best_individual
+        )
+
+    def test_stopping_criteria(self):
+        """Runs stop at the first criterion met, recording why and when"""
+        self.config.max_generations = 3
+        for option, value, stop_reason in (
+            (None, None, StopReason.MAX_GENERATIONS),
+            ("stop_on_success", True, StopReason.SUCCESS),
+            ("stagnation_generations", 1, StopReason.STAGNATION),
+            ("max_evaluations", 1, StopReason.MAX_EVALUATIONS),
+        ):
+            Config.clear_instance()
+            self.config = Config()
+            self.config.max_generations = 100 if option is not None else 3
+            self.config.success_threshold = 0.0
+            if option is not None:
+                setattr(self.config, option, value)
+            stats = Stats()
+
+            p = Population(self.samples, self.grammar, stats)
+            p.evolve()
+
+            super().assertListEqual([stop_reason], stats.stop_reason_accumulator)
+            super().assertListEqual([p.generations], stats.generations_accumulator)
+            if stop_reason == StopReason.MAX_GENERATIONS:
+                super().assertEqual(3, p.generations)
+            elif stop_reason != StopReason.STAGNATION:
+                # Genesis already meets the threshold or uses up the budget
+                super().assertEqual(0, p.generations)
+
+        # Runs evolve a generation at least
+        Config.clear_instance()
+        self.config = Config()
+        self.config.max_generations = 0
+        stats = Stats()
+        p = Population(self.samples, self.grammar, stats)
+        p.evolve()
+        super().assertEqual(1, p.generations)
+        super().assertListEqual(
+            [StopReason.MAX_GENERATIONS], stats.stop_reason_accumulator
+        )
+
+    def test_steady_state(self):
+        """Steady state generations keep their size and never lose fitness"""
+        self.config.replacement_type = ReplacementType.STEADY_STATE
+        p = Population(self.samples, self.grammar, self.stats)
+        fitness_values = sorted(i.fitness_value for i in p.generation)
+
+        for _ in range(3):
+            p.step()
+            new_fitness_values = sorted(i.fitness_value for i in p.generation)
+
+            super().assertEqual(len(fitness_values), len(new_fitness_values))
+            super().assertTrue(
+                all(new >= old for new, old in zip(new_fitness_values, fitness_values))
+            )
+            super().assertEqual(new_fitness_values[-1], p.generation[0].fitness_value)
+            super().assertListEqual([], p.offspring)
+            fitness_values = new_fitness_values
+
+    def test_time_budget(self):
+        """Runs stop as soon as their deadline passes, even right after genesis"""
+        self.config.max_generations = 100
+        stats = Stats()
+        p = Population(self.samples, self.grammar, stats, deadline=0.0)
+        p.evolve()
+
+        super().assertEqual(0, p.generations)
+        super().assertListEqual([StopReason.TIME_BUDGET], stats.stop_reason_accumulator)
+
+    def test_matrix_engine(self):
+        """Samples are encoded only when the matrix fitness engine is configured"""
+        p = Population(self.samples, self.grammar, self.stats)
+        super().assertIsNone(p.context.sample_matrix)
+
+        self.config.fitness_engine = FitnessEngine.MATRIX
+        p = Population(self.samples, self.grammar, self.stats)
+        super().assertIs(p.context, p.recombination.context)
+        super().assertEqual(len(self.samples), len(p.context.sample_matrix))
+
+    def test_sample_index(self):
+        """Samples are indexed only when the index engine and the full match fitness
+        are configured"""
+        self.config.fitness_function_type = FitnessType.FULL_MATCH
+        p = Population(self.samples, self.grammar, self.stats)
+        super().assertIsNone(p.context.sample_index)
+
+        self.config.fitness_engine = FitnessEngine.INDEX
+        self.config.fitness_function_type = FitnessType.BASIC
+        p = Population(self.samples, self.grammar, self.stats)
+        super().assertIsNone(p.context.sample_index)
+
+        self.config.fitness_function_type = FitnessType.FULL_MATCH
+        p = Population(self.samples, self.grammar, self.stats)
+        super().assertIs(p.context, p.recombination.context)
+        super().assertEqual(len(self.samples), len(p.context.sample_index))
+
+    def test_carry_over(self):
+        """Carried over generations hold the fitness values against every sample"""
+        new_samples = [self.nlp("We are the dogs!"), self.nlp("You are a cat!")]
+        p = Population(self.samples, self.grammar, Stats())
+        p.step()
+
+        stats = Stats()
+        context = EvaluationContext(
+            self.samples + new_samples,
+            extend_grammar(self.grammar, new_samples),
+            stats,
+        )
+        p.carry_over(context, EvaluationContext(new_samples))
+
+        super().assertIs(context, p.context)
+        super().assertIs(context, p.recombination.context)
+        super().assertEqual(self.config.population_size, len(p.generation))
+        super().assertEqual(0, p.generations)
+        super().assertIs(p.generation[0], p.best_individual)
+        for i in p.generation:
+            super().assertAlmostEqual(
+                Fitness(self.config, context.samples, i.fenotype).__call__(),
+                i.fitness_value,
+            )
+
+    def test_batch_evaluation(self):
+        """Every individual gets its fitness value when evaluated in batches"""
+        self.config.batch_evaluation = True
+        p = Population(self.samples, self.grammar, self.stats)
+        super().assertIsNotNone(p.recombination.batch_fitness)
+
+        mating_pool = p.selection(p.generation)
+        p.offspring = p.recombination(mating_pool, p.generation)
+        for i in p.generation + p.offspring:
+            super().assertIsInstance(i.fitness_value, float)
+
     def test_best_challenge_changes_best_individual(self):
         """Covers best challenge cases"""
         self.config.mutation_probability = 0.0
         self.config.fitness_function_type = FitnessType.BASIC
 
         p = Population(self.samples, self.grammar, self.stats)
-        i1 = Individual(
-            self.samples,
-            self.grammar,
-            self.stats,
-            dna="00000000000000000000000000000000",
-        )
-        i2 = Individual(
-            self.samples,
-            self.grammar,
-            self.stats,
-            dna="01110101100101100110010110010101",
-        )
+        i1 = Individual(p.context, dna="00000000000000000000000000000000")
+        i2 = Individual(p.context, dna="01110101100101100110010110010101")
 
         # When there's no best individual yet, population's best individual is updated
         p.best_individual = None
@@ -215,22 +387,78 @@ class TestPopulation(BasePopulationTest):
 
         self.config.success_threshold = 0.0
         p = Population(self.samples, self.grammar, stats)
-        p.generation[0] = Individual(
-            self.samples, self.grammar, stats, "01110101100101100110010110010101"
-        )
+        p.generation[0] = Individual(p.context, "01110101100101100110010110010101")
         p.evolve()
         super().assertListEqual([True], stats.success_rate_accumulator)
 
         self.config.success_threshold = 1.0
         self.config.population_size = 1
         p = Population(self.samples, self.grammar, stats)
-        p.generation[0] = Individual(
-            self.samples, self.grammar, stats, "00000000000000000000000000000000"
-        )
+        p.generation[0] = Individual(p.context, "00000000000000000000000000000000")
         p.evolve()
         super().assertListEqual([True, False], stats.success_rate_accumulator)
 
 
+class TestPopulationStore(BasePopulationTest):
+    """Unit Test class for GE PopulationStore object"""
+
+    def test_init(self):
+        """Genotypes and fitness values are stacked in individuals order"""
+        p = Population(self.samples, self.grammar, self.stats)
+        store = PopulationStore(p.generation)
+
+        super().assertEqual(len(p.generation), len(store))
+        super().assertEqual(
+            (len(p.generation), self.config.dna_length), store.genotypes.shape
+        )
+        super().assertListEqual(
+            p.generation[3].genotype.tolist(), store.genotypes[3].tolist()
+        )
+        super().assertEqual(p.generation[3].fitness_value, store.fitness_values[3])
+
+    def test_survivors(self):
+        """Survivors are the most fitted individuals, the best one first"""
+        p = Population(self.samples, self.grammar, self.stats)
+        store = PopulationStore(p.generation)
+        survivors = store.take(store.survivors(5))
+        fitness_values = sorted(store.fitness_values.tolist(), reverse=True)
+
+        super().assertEqual(5, len(survivors))
+        super().assertEqual(fitness_values[0], survivors[0].fitness_value)
+        super().assertListEqual(
+            fitness_values[:5],
+            sorted([i.fitness_value for i in survivors], reverse=True),
+        )
+
+
+class TestFitnessIndex(BasePopulationTest):
+    """Unit Test class for GE FitnessIndex object"""
+
+    def test_insert(self):
+        """Insertions replace the least fitted individual, unless fitter"""
+        p = Population(self.samples, self.grammar, self.stats)
+        store = PopulationStore(list(p.generation))
+        index = FitnessIndex(store)
+        worst = min(store.fitness_values)
+
+        super().assertEqual(worst, index.worst().fitness_value)
+
+        unfit = object.__new__(Individual)
+        unfit.fitness_value = worst - 1
+        super().assertFalse(index.insert(unfit))
+        super().assertNotIn(unfit, store.individuals)
+
+        fit = p.generation[0]
+        super().assertTrue(index.insert(fit))
+        super().assertIn(fit, store.individuals)
+        super().assertEqual(len(p.generation), len(store))
+        super().assertListEqual(
+            [i.fitness_value for i in store.individuals],
+            store.fitness_values.tolist(),
+        )
+        super().assertLessEqual(worst, index.worst().fitness_value)
+
+
 class TestSelection(BasePopulationTest):
     """Unit Test class for GE Selection object"""
 
@@ -252,7 +480,9 @@ class TestRecombination(BasePopulationTest):
 
     def test_dispatch(self):
         """Dispatcher method provides the proper recombine method"""
-        recombination = Recombination(self.grammar, self.samples, self.stats)
+        recombination = Recombination(
+            EvaluationContext(self.samples, self.grammar, self.stats)
+        )
         super().assertEqual(
             recombination._recombine, recombination._random_one_point_crossover
         )
@@ -272,10 +502,101 @@ class TestReplacement(BasePopulationTest):
         replacement = Replacement(ReplacementType.MU_LAMBDA_WITHOUT_ELITISM)
         super().assertIs(replacement._replace, Replacement._mu_lambda_no_elite)
 
+        replacement = Replacement(ReplacementType.STEADY_STATE)
+        super().assertIs(replacement._replace, Replacement._steady_state)
+
         # Check unknown ReplacementType
         replacement = Replacement(None)
         super().assertIs(replacement._replace, Replacement._mu_plus_lambda)
 
+    def test_generation_size(self):
+        """Replacements keep the generation size, the most fitted individual first"""
+        p = Population(self.samples, self.grammar, self.stats)
+        mating_pool = p.selection(p.generation)
+        offspring = p.recombination(mating_pool, p.generation)
+
+        for replacement_type in ReplacementType:
+            generation, _ = Replacement(replacement_type)(p.generation, offspring)
+            super().assertEqual(len(p.generation), len(generation))
+            super().assertEqual(
+                max(i.fitness_value for i in generation), generation[0].fitness_value
+            )
+
+
+class TestIslandModel(BasePopulationTest):
+    """Unit Test class for GE IslandModel object"""
+
+    def test_migration(self):
+        """Immigrants replace the least fitted individuals, keeping the size"""
+        source = Population(self.samples, self.grammar, Stats())
+        target = Population(self.samples, self.grammar, Stats())
+        emigrants = source.emigrants(2)
+        best = max(i.fitness_value for i in source.generation)
+        size = len(target.generation)
+
+        target.immigrate(emigrants)
+
+        super().assertEqual((2, self.config.dna_length), emigrants.shape)
+        super().assertEqual(size, len(target.generation))
+        super().assertLessEqual(best, target.generation[0].fitness_value)
+
+    def test_topology(self):
+        """Migrants travel to the next island or to every other island"""
+        self.config.migration_topology = MigrationTopology.RING
+        super().assertListEqual([2], migration_targets(1, 3))
+        super().assertListEqual([0], migration_sources(1, 3))
+
+        self.config.migration_topology = MigrationTopology.ALL_TO_ALL
+        super().assertListEqual([0, 2], migration_targets(1, 3))
+        super().assertListEqual([0, 2], migration_sources(1, 3))
+
+    def test_island_types(self):
+        """Per island selection and replacement types cycle over the islands"""
+        super().assertDictEqual({}, island_types(0))
+
+        self.config.island_replacement_types = "1, 2"
+        super().assertDictEqual(
+            {"replacement_type": ReplacementType.MU_LAMBDA_WITHOUT_ELITISM},
+            island_types(3),
+        )
+
+    def test_evolve(self):
+        """Islands evolve at their own process, accounted as a single run"""
+        self.config.islands = 2
+        self.config.max_generations = 4
+        self.config.migration_interval = 2
+        stats = Stats()
+
+        islands = IslandModel(self.samples, self.grammar, stats)
+        islands.evolve()
+
+        super().assertEqual(1, len(stats.hall_of_fame))
+        super().assertEqual(islands.best_record.fitness_value, stats.mbf_accumulator[0])
+        super().assertListEqual(
+            islands.best_record.fenotype,
+            compile_grammar(self.grammar).decode(
+                transcription(islands.best_record.dna, self.config.codon_length)
+            ),
+        )
+
+    def test_evolve_island_failure(self):
+        """A failing island makes the whole island model fail rather than hang"""
+        self.config.islands = 2
+        self.config.max_generations = 4
+        self.config.migration_interval = 1
+
+        def failing_island_types(island: int) -> dict:
+            if island == 1:
+                raise ValueError("Broken island")
+            return dict()
+
+        with mock.patch(
+            "patternomatic.ge.population.island_types", failing_island_types
+        ):
+            islands = IslandModel(self.samples, self.grammar, Stats())
+            with super().assertRaisesRegex(RuntimeError, "Island 1 failed"):
+                islands.evolve()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,132 @@
+""" Unit testing module for GE result records module
+
+This file is part of patternomatic.
+
+Copyright © 2020  Miguel Revuelta Espinosa
+
+patternomatic is free software: you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public License
+as published by the Free Software Foundation, either version 3 of
+the License, or (at your option) any later version.
+
+patternomatic is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+import pickle
+import unittest
+
+import spacy
+
+from patternomatic.ge.context import EvaluationContext
+from patternomatic.ge.individual import Individual
+from patternomatic.ge.records import HallOfFame, PatternRecord
+from patternomatic.ge.stats import Stats
+from patternomatic.nlp.bnf import dynamic_generator as dgg
+from patternomatic.settings.config import Config
+
+
+class TestPatternRecord(unittest.TestCase):
+    """Unit Test class for GE PatternRecord object"""
+
+    nlp = spacy.load("en_core_web_sm")
+
+    samples = [nlp("I am a raccoon!"), nlp("You are a cat!")]
+
+    def test_from_individual(self):
+        """Records keep the outcome of an individual and nothing else"""
+        self.config.mutation_probability = 0.0
+        context = EvaluationContext(self.samples, dgg(self.samples), Stats())
+        i = Individual(context, "0110")
+
+        record = PatternRecord.from_individual(i, 1, 2, 3)
+        super().assertEqual(i.fenotype, record.fenotype)
+        super().assertEqual(i.fitness_value, record.fitness_value)
+        super().assertEqual(b"\x00\x01\x01\x00", record.genotype)
+        super().assertEqual("0110", record.bin_genotype)
+        super().assertListEqual(i.genotype.tolist(), record.dna.tolist())
+        super().assertEqual(
+            (1, 2, 3), (record.run, record.generation, record.evaluations)
+        )
+
+    def test_immutable(self):
+        """Records can not be changed, just copied with some other field values"""
+        record = PatternRecord([{"ORTH": "a"}], 0.5, b"\x01", run=1)
+
+        with super().assertRaises(AttributeError):
+            record.run = 2
+
+        copy = record.replace(run=2)
+        super().assertEqual(1, record.run)
+        super().assertEqual(2, copy.run)
+        super().assertEqual(record, copy.replace(run=1))
+
+    def test_fenotype_copied(self):
+        """Records do not share their pattern with the list they were built from"""
+        fenotype = [{"ORTH": "a", "_": {"CUSTOM_NORM_": "a"}}, {"LOWER": {"IN": ["b"]}}]
+        record = PatternRecord(fenotype, 0.5, b"\x01")
+
+        fenotype[0]["ORTH"] = "b"
+        fenotype[0]["_"]["CUSTOM_NORM_"] = "b"
+        fenotype[1]["LOWER"]["IN"].append("c")
+        fenotype.append({"ORTH": "c"})
+
+        super().assertListEqual(
+            [{"ORTH": "a", "_": {"CUSTOM_NORM_": "a"}}, {"LOWER": {"IN": ["b"]}}],
+            record.fenotype,
+        )
+
+    def test_pickle(self):
+        """Records travel across processes"""
+        record = PatternRecord([{"ORTH": "a"}], 0.5, b"\x01", 1, 2, 3)
+        super().assertEqual(record, pickle.loads(pickle.dumps(record)))
+
+    #
+    # Helpers
+    #
+    def setUp(self) -> None:
+        """Fresh Config instance"""
+        self.config = Config()
+
+    def tearDown(self) -> None:
+        """Destroy Config instance"""
+        Config.clear_instance()
+
+
+class TestHallOfFame(unittest.TestCase):
+    """Unit Test class for GE HallOfFame object"""
+
+    def test_insert(self):
+        """Only the most fitted records are kept, the earliest ones on ties"""
+        hall_of_fame = HallOfFame(3)
+        for run, fitness_value in enumerate([0.2, 0.5, 0.1, 0.5, 0.9, 0.2]):
+            hall_of_fame.insert(PatternRecord([], fitness_value, b"", run))
+
+        super().assertEqual(3, len(hall_of_fame))
+        super().assertListEqual([4, 1, 3], [r.run for r in hall_of_fame])
+        super().assertEqual(4, hall_of_fame.best().run)
+        super().assertFalse(hall_of_fame.insert(PatternRecord([], 0.5, b"")))
+        super().assertTrue(hall_of_fame.insert(PatternRecord([], 0.6, b"")))
+
+    def test_unbounded(self):
+        """A hall of fame with no size keeps every record"""
+        hall_of_fame = HallOfFame()
+        super().assertIsNone(hall_of_fame.best())
+
+        for fitness_value in range(10):
+            super().assertTrue(
+                hall_of_fame.insert(PatternRecord([], fitness_value, b""))
+            )
+
+        super().assertListEqual(
+            list(range(9, -1, -1)), [r.fitness_value for r in hall_of_fame.records()]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,7 +23,9 @@ from unittest import TestCase, mock
 
 from spacy import load as spacy_load
 
+import scripts.benchmark as bench
 import scripts.patternomatic as pom
+from patternomatic.settings.config import Config
 from patternomatic.settings.log import LOG
 
 
@@ -51,6 +53,8 @@ class TestpatternomaticScript(TestCase):
         "Goodbye",
         "-c",
         config_file_path,
+        "-t",
+        "60",
         "-l",
         "en_core_web_sm",
     ]
@@ -92,6 +96,21 @@ class TestpatternomaticScript(TestCase):
             with super().assertRaises(Exception):
                 pom.main(self.full_args)
 
+    def test_benchmark(self):
+        """Checks that the benchmark measures every population size"""
+        results = bench.benchmark([4, 8], 1, ["Hello", "Goodbye"], "en_core_web_sm")
+
+        super().assertListEqual([4, 8], [r["population_size"] for r in results])
+        super().assertTrue(all(r["generation_peak_mib"] > 0 for r in results))
+        Config.clear_instance()
+
+        with super().assertLogs(LOG) as cm:
+            bench.main(["-p", "4", "-g", "1", "-s", "Hello", "world"])
+            super().assertTrue(
+                any("population_size=4" in output for output in cm.output)
+            )
+        Config.clear_instance()
+
     def test_patternomatic_script(self):
         """Checks that patternomatic can be run as a script properly"""
         script_path = os.path.join(
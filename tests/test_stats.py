@@ -19,12 +19,13 @@ along with patternomatic. If not, see <https://www.gnu.org/licenses/>.
 
 """
 import os
+import pickle
 from unittest import TestCase, mock
 
-from patternomatic.ge.individual import Individual
+from patternomatic.ge.records import PatternRecord
 from patternomatic.ge.stats import Stats
 from patternomatic.settings.config import Config
-from patternomatic.settings.literals import ReportFormat
+from patternomatic.settings.literals import ReportFormat, StopReason
 
 
 class TestStats(TestCase):
@@ -32,7 +33,6 @@ class TestStats(TestCase):
 
     stats = None
     test_report_path_file = "test_report_path_file.txt"
-    fitness_value_literal = "fitness_value"
 
     def test_add_sr(self):
         """SR accumulator works"""
@@ -55,12 +55,33 @@ class TestStats(TestCase):
         super().assertListEqual([0.2222], self.stats.time_accumulator)
 
     def test_add_most_fitted(self):
-        """Most fitted accumulator works"""
-        expected = object.__new__(Individual)
-        expected.__setattr__(self.fitness_value_literal, 0.5)
+        """Hall of fame works, bounded to the configured size"""
+        Config().hall_of_fame_size = 2
+        stats = Stats()
+        expected = PatternRecord([], 0.5, b"")
+
+        stats.add_most_fitted(expected)
+        super().assertListEqual([expected], stats.hall_of_fame.records())
+
+        stats.add_most_fitted(PatternRecord([], 0.1, b""))
+        stats.add_most_fitted(PatternRecord([], 0.9, b""))
+        super().assertListEqual(
+            [0.9, 0.5], [r.fitness_value for r in stats.hall_of_fame]
+        )
+
+    def test_add_stop(self):
+        """Stop reason and generations accumulators work"""
+        self.stats.add_stop(StopReason.STAGNATION, 7)
+        super().assertListEqual(
+            [StopReason.STAGNATION], self.stats.stop_reason_accumulator
+        )
+        super().assertListEqual([7], self.stats.generations_accumulator)
 
-        self.stats.add_most_fitted(expected)
-        super().assertListEqual([expected], self.stats.most_fitted_accumulator)
+    def test_add_phase_time(self):
+        """Phase times accumulator works"""
+        self.stats.add_phase_time("docs", 0.25)
+        self.stats.add_phase_time("docs", 0.5)
+        super().assertDictEqual({"docs": 0.75}, self.stats.phase_times)
 
     def test_sum_aes(self):
         """Time counter works"""
@@ -71,6 +92,21 @@ class TestStats(TestCase):
             self.stats.aes_counter,
         )
 
+    def test_sum_cache_counters(self):
+        """Fitness cache counters work"""
+        self.stats.sum_cache_hits(3)
+        self.stats.sum_cache_misses(2)
+        self.stats.sum_cache_evictions(1)
+        super().assertEqual(3, self.stats.cache_hits)
+        super().assertEqual(2, self.stats.cache_misses)
+        super().assertEqual(1, self.stats.cache_evictions)
+
+    def test_sum_short_circuits(self):
+        """Decode cache short-circuits counter works"""
+        self.stats.sum_short_circuits(2)
+        self.stats.sum_short_circuits(1)
+        super().assertEqual(3, self.stats.short_circuits)
+
     def test_reset(self):
         """Reset stats method works"""
         self.stats.aes_counter = 100
@@ -93,24 +129,50 @@ class TestStats(TestCase):
         super().assertEqual(100, self.stats.aes)
         super().assertEqual(3, self.stats.mean_time)
 
-    def test_get_most_fitted(self):
-        """Most fitted individual is found on most fitted accumulator"""
-        i1 = object.__new__(Individual)
-        i1.__setattr__(self.fitness_value_literal, 0.01)
-        i2 = object.__new__(Individual)
-        i2.__setattr__(self.fitness_value_literal, 0.1)
-        i3 = object.__new__(Individual)
-        i3.__setattr__(self.fitness_value_literal, 0.001)
+    def test_merge(self):
+        """Runs accounted at other Stats instances are gathered and averaged"""
+        self.stats.success_rate_accumulator = [True]
+        self.stats.mbf_accumulator = [0.5]
+        self.stats.aes_accumulator = [10]
+        self.stats.time_accumulator = [1]
+        self.stats.sum_cache_hits(1)
+        self.stats.add_most_fitted(PatternRecord([], 0.5, b""))
+
+        other = Stats()
+        other.success_rate_accumulator = [False]
+        other.mbf_accumulator = [1.0]
+        other.aes_accumulator = [20]
+        other.time_accumulator = [3]
+        other.sum_cache_hits(2)
+        other.sum_short_circuits(4)
+        other.add_most_fitted(PatternRecord([], 1.0, b""))
+
+        self.stats.merge(pickle.loads(pickle.dumps(other)))
+
+        super().assertEqual(0.5, self.stats.success_rate)
+        super().assertEqual(0.75, self.stats.mbf)
+        super().assertEqual(15, self.stats.aes)
+        super().assertEqual(2, self.stats.mean_time)
+        super().assertEqual(3, self.stats.cache_hits)
+        super().assertEqual(4, self.stats.short_circuits)
+        super().assertListEqual([10, 20], self.stats.aes_accumulator)
+        super().assertListEqual(
+            [1, 0], [r.run for r in self.stats.hall_of_fame.records()]
+        )
 
-        mock_individual_list = list()
+    def test_get_most_fitted(self):
+        """Most fitted record is found on the hall of fame"""
+        super().assertIsNone(self.stats.get_most_fitted())
 
-        mock_individual_list.append(i1)
-        mock_individual_list.append(i2)
-        mock_individual_list.append(i3)
+        r1 = PatternRecord([], 0.01, b"")
+        r2 = PatternRecord([], 0.1, b"")
+        r3 = PatternRecord([], 0.001, b"")
 
-        self.stats.most_fitted_accumulator = mock_individual_list
+        self.stats.add_most_fitted(r1)
+        self.stats.add_most_fitted(r2)
+        self.stats.add_most_fitted(r3)
 
-        super().assertEqual(self.stats.get_most_fitted(), i2)
+        super().assertIs(self.stats.get_most_fitted(), r2)
 
     def test_avg(self):
         """Average implementation works"""
@@ -124,6 +186,9 @@ class TestStats(TestCase):
             "mbf": 0.5,
             "aes": 100,
             "mean_time": 4.5,
+            "mean_generations": 20.0,
+            "stop_reasons": ["SUCCESS", "MAX_GENERATIONS"],
+            "phase_times": {"docs": 0.5},
             "most_fitted": None,
         }
 
@@ -133,17 +198,19 @@ class TestStats(TestCase):
         stats.mbf = stats_dict["mbf"]
         stats.aes = stats_dict["aes"]
         stats.mean_time = stats_dict["mean_time"]
+        stats.mean_generations = stats_dict["mean_generations"]
+        stats.stop_reasons = stats_dict["stop_reasons"]
+        stats.add_phase_time("docs", 0.5)
 
         super().assertEqual(stats.__dict__, stats_dict)
         super().assertEqual(dict(stats), stats_dict)
         super().assertEqual(f"Stats({repr(stats_dict)})", repr(stats))
 
         # Check that with most fitted accumulator representation is well formed
-        i = object.__new__(Individual)
-        i.__setattr__(self.fitness_value_literal, 1.0)
+        r = PatternRecord([{"ORTH": "a"}], 1.0, b"\x01\x00", 2, 3, 4)
 
-        stats.most_fitted_accumulator = [i]
-        stats_dict["most_fitted"] = i.__dict__
+        stats.add_most_fitted(r)
+        stats_dict["most_fitted"] = r.__dict__
 
         super().assertDictEqual(stats_dict, stats.__dict__)
         super().assertEqual(stats_dict, dict(stats))
@@ -155,13 +222,11 @@ class TestStats(TestCase):
         config.report_path = self.test_report_path_file
 
         # When a best individual has been found
-        i = object.__new__(Individual)
-        i.__setattr__(self.fitness_value_literal, 1.0)
         self.stats.aes = 100
         self.stats.mbf = 0.9
         self.stats.mean_time = 0.42
         self.stats.success_rate = 1.0
-        self.stats.most_fitted_accumulator = [i]
+        self.stats.add_most_fitted(PatternRecord([], 1.0, b""))
         self.stats.persist()
 
         with open(self.test_report_path_file, "r") as persisted_report:
@@ -170,7 +235,7 @@ class TestStats(TestCase):
         super().assertEqual(str(dict(self.stats)) + "\n", red_report[0])
 
         # When a best individual has not been found
-        self.stats.most_fitted_accumulator = []
+        self.stats = Stats()
         self.stats.persist()
 
         with open(self.test_report_path_file, "r") as persisted_report:
@@ -182,6 +247,9 @@ class TestStats(TestCase):
         """Test stats instance dict to csv conversion"""
         with mock.patch("patternomatic.ge.stats.time") as mock_time:
             mock_time.return_value = 0.123
+            self.stats.add_stop(StopReason.SUCCESS, 10)
+            self.stats.add_stop(StopReason.STAGNATION, 20)
+            self.stats._average_metrics()
             self.stats.aes = 10
             self.stats.mbf = 0.5
             self.stats.mean_time = 0.22
@@ -190,17 +258,17 @@ class TestStats(TestCase):
             # When a best individual has not been found
             csv_stats = (
                 f"{.123}\t{self.stats.mbf}\t{self.stats.success_rate}\t{self.stats.aes}\t{self.stats.mean_time}\t"
-                f"{None}\t"
+                f"{15.0}\t{['SUCCESS', 'STAGNATION']}\t{None}\t"
             )
 
             super().assertEqual(csv_stats, self.stats._to_csv())
 
             # When a best individual has been found
-            i = object.__new__(Individual)
-            i.__setattr__(self.fitness_value_literal, 1.0)
-            self.stats.most_fitted_accumulator = [i]
+            r = PatternRecord([], 1.0, b"\x01")
+            self.stats.add_most_fitted(r)
 
-            csv_stats += f"{None}\t{i.fitness_value}\t"
+            csv_stats = csv_stats[: -len(f"{None}\t")]
+            csv_stats += f"1\t{[]}\t{r.fitness_value}\t0\t0\t0\t"
             super().assertEqual(csv_stats, self.stats._to_csv())
 
             # Also check csv is correctly persisted